@@ -0,0 +1,49 @@
+"""add_event_filter_indexes
+
+Revision ID: 0c6e4d1b9a27
+Revises: f3b9c2a7d164
+Create Date: 2026-03-06 19:02:33.720415
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0c6e4d1b9a27"
+down_revision: str | Sequence[str] | None = "f3b9c2a7d164"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_events_event_time_id", "events", ["event_time", "id"], unique=False
+    )
+    op.create_index(
+        "ix_events_status_event_time",
+        "events",
+        ["status", "event_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_events_place_id_event_time",
+        "events",
+        ["place_id", "event_time"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_places_city"), "places", ["city"], unique=False)
+    op.create_index(
+        op.f("ix_members_event_id"), "members", ["event_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_members_event_id"), table_name="members")
+    op.drop_index(op.f("ix_places_city"), table_name="places")
+    op.drop_index("ix_events_place_id_event_time", table_name="events")
+    op.drop_index("ix_events_status_event_time", table_name="events")
+    op.drop_index("ix_events_event_time_id", table_name="events")
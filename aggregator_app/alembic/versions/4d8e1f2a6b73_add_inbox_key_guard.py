@@ -0,0 +1,48 @@
+"""add_inbox_key_guard
+
+Revision ID: 4d8e1f2a6b73
+Revises: 7a2f5e8c3d91
+Create Date: 2026-03-07 10:41:52.318604
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d8e1f2a6b73"
+down_revision: str | Sequence[str] | None = "7a2f5e8c3d91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Класс блокировки должен совпадать с INBOX_LOCK_CLASS репозитория inbox.
+INBOX_KEY_GUARD = """
+CREATE FUNCTION inbox_key_guard() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(1, hashtext(NEW.key));
+    IF EXISTS (
+        SELECT 1 FROM inbox WHERE key = NEW.key AND expires_at > NOW()
+    ) THEN
+        RAISE EXCEPTION 'duplicate inbox key "%"', NEW.key
+            USING ERRCODE = 'unique_violation';
+    END IF;
+    RETURN NEW;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(INBOX_KEY_GUARD)
+    op.execute(
+        "CREATE TRIGGER inbox_key_guard BEFORE INSERT ON inbox"
+        " FOR EACH ROW EXECUTE FUNCTION inbox_key_guard()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER inbox_key_guard ON inbox")
+    op.execute("DROP FUNCTION inbox_key_guard()")
@@ -0,0 +1,53 @@
+"""add_event_search_vector
+
+Revision ID: 7a2f5e8c3d91
+Revises: 0c6e4d1b9a27
+Create Date: 2026-03-06 20:14:08.935127
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a2f5e8c3d91"
+down_revision: str | Sequence[str] | None = "0c6e4d1b9a27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "events",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.execute(
+        "UPDATE events SET search_vector ="
+        " setweight(to_tsvector('simple', events.name), 'A')"
+        " || setweight(to_tsvector('simple', places.name), 'B')"
+        " || setweight(to_tsvector('simple',"
+        " concat_ws(' ', places.city, places.address)), 'C')"
+        " FROM places WHERE places.id = events.place_id"
+    )
+    op.create_index(
+        "ix_events_search_vector",
+        "events",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_events_search_vector",
+        table_name="events",
+        postgresql_using="gin",
+    )
+    op.drop_column("events", "search_vector")
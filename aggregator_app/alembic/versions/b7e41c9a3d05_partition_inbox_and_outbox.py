@@ -0,0 +1,108 @@
+"""partition_inbox_and_outbox
+
+Revision ID: b7e41c9a3d05
+Revises: 5f0a8e2d7b19
+Create Date: 2026-03-06 09:52:18.604137
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e41c9a3d05"
+down_revision: str | Sequence[str] | None = "5f0a8e2d7b19"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INBOX_COLUMNS = """
+    key VARCHAR(128) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    response JSON,
+    status inboxstatus DEFAULT 'COMPLETED' NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+"""
+INBOX_COLUMN_NAMES = "key, request_hash, response, status, expires_at"
+OUTBOX_COLUMNS = """
+    id INTEGER DEFAULT nextval('outbox_id_seq') NOT NULL,
+    type outboxtype NOT NULL,
+    payload JSON NOT NULL,
+    status outboxstatus NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+"""
+OUTBOX_COLUMN_NAMES = "id, type, payload, status, created_at"
+
+
+def _rename_table(table: str, new_table: str, indexes: Sequence[str]):
+    """Переименовать таблицу вместе с ее первичным ключом и индексами."""
+    op.execute(f"ALTER TABLE {table} RENAME TO {new_table}")
+    op.execute(
+        f"ALTER TABLE {new_table}"
+        f" RENAME CONSTRAINT {table}_pkey TO {new_table}_pkey"
+    )
+    for column in indexes:
+        op.execute(
+            f"ALTER INDEX ix_{table}_{column} RENAME TO ix_{new_table}_{column}"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_table("inbox", "inbox_old", ["expires_at"])
+    op.execute(
+        f"CREATE TABLE inbox ({INBOX_COLUMNS},"
+        " CONSTRAINT inbox_pkey PRIMARY KEY (key, expires_at))"
+        " PARTITION BY RANGE (expires_at)"
+    )
+    op.execute("CREATE INDEX ix_inbox_expires_at ON inbox (expires_at)")
+    op.execute("CREATE TABLE inbox_default PARTITION OF inbox DEFAULT")
+    op.execute(
+        f"INSERT INTO inbox ({INBOX_COLUMN_NAMES})"
+        f" SELECT {INBOX_COLUMN_NAMES} FROM inbox_old"
+    )
+    op.execute("DROP TABLE inbox_old")
+
+    _rename_table("outbox", "outbox_old", ["status"])
+    op.execute(
+        f"CREATE TABLE outbox ({OUTBOX_COLUMNS},"
+        " CONSTRAINT outbox_pkey PRIMARY KEY (id, created_at))"
+        " PARTITION BY RANGE (created_at)"
+    )
+    op.execute("CREATE INDEX ix_outbox_status ON outbox (status)")
+    op.execute("CREATE TABLE outbox_default PARTITION OF outbox DEFAULT")
+    op.execute(
+        f"INSERT INTO outbox ({OUTBOX_COLUMN_NAMES})"
+        f" SELECT {OUTBOX_COLUMN_NAMES} FROM outbox_old"
+    )
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY outbox.id")
+    op.execute("DROP TABLE outbox_old")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_table("outbox", "outbox_partitioned", ["status"])
+    op.execute(
+        f"CREATE TABLE outbox ({OUTBOX_COLUMNS},"
+        " CONSTRAINT outbox_pkey PRIMARY KEY (id))"
+    )
+    op.execute("CREATE INDEX ix_outbox_status ON outbox (status)")
+    op.execute(
+        f"INSERT INTO outbox ({OUTBOX_COLUMN_NAMES})"
+        f" SELECT {OUTBOX_COLUMN_NAMES} FROM outbox_partitioned"
+    )
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY outbox.id")
+    op.execute("DROP TABLE outbox_partitioned")
+
+    _rename_table("inbox", "inbox_partitioned", ["expires_at"])
+    op.execute(
+        f"CREATE TABLE inbox ({INBOX_COLUMNS},"
+        " CONSTRAINT inbox_pkey PRIMARY KEY (key))"
+    )
+    op.execute("CREATE INDEX ix_inbox_expires_at ON inbox (expires_at)")
+    op.execute(
+        f"INSERT INTO inbox ({INBOX_COLUMN_NAMES})"
+        f" SELECT DISTINCT ON (key) {INBOX_COLUMN_NAMES}"
+        " FROM inbox_partitioned ORDER BY key, expires_at DESC"
+    )
+    op.execute("DROP TABLE inbox_partitioned")
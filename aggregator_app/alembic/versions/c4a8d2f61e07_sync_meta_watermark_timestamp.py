@@ -0,0 +1,47 @@
+"""sync_meta_watermark_timestamp
+
+Revision ID: c4a8d2f61e07
+Revises: b7e41c9a3d05
+Create Date: 2026-03-06 14:27:41.318205
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8d2f61e07"
+down_revision: str | Sequence[str] | None = "b7e41c9a3d05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "sync_meta",
+        "last_changed_at",
+        existing_type=sa.Date(),
+        type_=sa.DateTime(timezone=True),
+        existing_nullable=True,
+        postgresql_using="last_changed_at::timestamp AT TIME ZONE 'UTC'",
+    )
+    op.add_column(
+        "sync_meta", sa.Column("last_event_id", sa.UUID(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("sync_meta", "last_event_id")
+    op.alter_column(
+        "sync_meta",
+        "last_changed_at",
+        existing_type=sa.DateTime(timezone=True),
+        type_=sa.Date(),
+        existing_nullable=True,
+        postgresql_using="(last_changed_at AT TIME ZONE 'UTC')::date",
+    )
@@ -0,0 +1,29 @@
+"""add_members_version_seq
+
+Revision ID: f3b9c2a7d164
+Revises: e1d7a9c35b48
+Create Date: 2026-03-06 18:21:40.118562
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b9c2a7d164"
+down_revision: str | Sequence[str] | None = "e1d7a9c35b48"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("members_version_seq")))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence("members_version_seq")))
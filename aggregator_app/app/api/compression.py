@@ -0,0 +1,202 @@
+"""Сжатие ответов API."""
+
+import zlib
+from typing import Literal, Protocol
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Compression = Literal["auto", "br", "gzip", "off"]
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class ICompressor(Protocol):
+    """Интерфейс потокового сжатия тела ответа."""
+
+    content_encoding: str
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        """Сжать часть тела ответа.
+
+        Последняя часть (`more_body` = False) завершает поток сжатия.
+
+        """
+
+
+class GzipCompressor:
+    """Сжатие gzip."""
+
+    content_encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        body = self._compressor.compress(body)
+        if more_body:
+            return body
+        return body + self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Сжатие brotli.
+
+    Каждая часть потокового ответа сжимается и сбрасывается сразу,
+    без накопления всего ответа.
+
+    """
+
+    content_encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        body = self._compressor.process(body)
+        if more_body:
+            return body + self._compressor.flush()
+        return body + self._compressor.finish()
+
+
+class CompressionResponder:
+    """Обертка `send` приложения, сжимающая тело ответа.
+
+    Заголовки ответа отправляются вместе с первой частью тела, когда
+    известно, сжимается ли ответ. Без `compressor` ответ не сжимается,
+    но большие ответы получают `Vary: Accept-Encoding`.
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        compressor: ICompressor | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = compressor
+        self._send: Send | None = None
+        self._start: Message | None = None
+        self._compressing = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self._send = send
+        await self.app(scope, receive, self._send_with_compression)
+
+    async def _send_with_compression(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+        elif self._start is not None:
+            await self._send_start(message)
+        else:
+            if self._compressing and message["type"] == "http.response.body":
+                message["body"] = self.compressor.compress(
+                    message.get("body", b""),
+                    more_body=message.get("more_body", False),
+                )
+            await self._send(message)
+
+    async def _send_start(self, message: Message):
+        """Отправить заголовки ответа с первой частью тела.
+
+        Уже сжатые ответы, потоки событий сервера и ответы меньше
+        `minimum_size` байт отправляются без изменений.
+
+        """
+        start, self._start = self._start, None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            message["type"] == "http.response.body"
+            and "content-encoding" not in headers
+            and not headers.get("content-type", "").startswith(
+                EXCLUDED_CONTENT_TYPES
+            )
+            and (more_body or len(body) >= self.minimum_size)
+        ):
+            headers.add_vary_header("Accept-Encoding")
+            if self.compressor is not None:
+                self._compressing = True
+                message["body"] = self.compressor.compress(
+                    body, more_body=more_body
+                )
+                headers["Content-Encoding"] = self.compressor.content_encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(message["body"]))
+        await self._send(start)
+        await self._send(message)
+
+
+def get_encodings(compression: Compression) -> tuple[str, ...]:
+    """Получить кодировки сжатия в порядке предпочтения."""
+    if compression == "off":
+        return ()
+    if compression == "gzip":
+        return ("gzip",)
+    return ("br", "gzip")
+
+
+def get_accepted_encodings(accept_encoding: str) -> set[str]:
+    """Получить кодировки из заголовка `Accept-Encoding`.
+
+    Кодировки с `q=0` считаются запрещенными.
+
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        if (encoding := encoding.strip().lower()) and not any(
+            param.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00")
+            for param in params.split(";")
+        ):
+            accepted.add(encoding)
+    return accepted
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip или brotli.
+
+    Кодировка выбирается из `encodings` по порядку среди принимаемых
+    клиентом. Ответы меньше `minimum_size` байт, уже сжатые ответы
+    и потоки событий сервера не сжимаются.
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: tuple[str, ...],
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.encodings = encodings
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = get_accepted_encodings(
+            Headers(scope=scope).get("Accept-Encoding", "")
+        )
+        encoding = next((e for e in self.encodings if e in accepted), None)
+        compressor: ICompressor | None = None
+        if encoding == "br":
+            compressor = BrotliCompressor(self.brotli_quality)
+        elif encoding == "gzip":
+            compressor = GzipCompressor(self.gzip_level)
+        responder = CompressionResponder(
+            self.app, self.minimum_size, compressor
+        )
+        await responder(scope, receive, send)
@@ -2,9 +2,11 @@
 
 from typing import Annotated, Any
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, status
 
+from app.api.schemas.members import MemberIn
 from app.orm.db_manager import db_manager
+from app.orm.models import InboxStatus
 from app.orm.uow import IUnitOfWork, SqlAlchemyUnitOfWork
 from app.services.events import EventsService
 from app.services.events_provider import (
@@ -13,6 +15,7 @@ from app.services.events_provider import (
 )
 from app.services.inbox import InboxService, get_inbox_service
 from app.services.tickets import TicketsService
+from app.services.utils import hash_dict
 
 
 def get_uow() -> IUnitOfWork:
@@ -41,19 +44,42 @@ def get_tickets_service(
     return TicketsService(uow, client)
 
 
+def get_member(member: MemberIn) -> MemberIn:
+    """Получить тело запроса регистрации участника.
+
+    Тело валидируется один раз за запрос и переиспользуется
+    эндпоинтом и `get_idempotency_data`.
+
+    """
+    return member
+
+
 async def get_idempotency_data(
-    request: Request,
+    member: Annotated[MemberIn, Depends(get_member)],
     inbox_service: Annotated[InboxService, Depends(get_inbox_service)],
 ) -> dict[str, Any] | None:
-    body = await request.json()
-    if not (idempotency_key := body.get("idempotency_key")):
+    """Получить данные идемпотентности регистрации участника.
+
+    Хэширует канонический вид провалидированной модели без ключа
+    идемпотентности вместо повторного разбора тела запроса. Хэш
+    не совпадает с хэшем сырого тела, если валидация нормализует
+    значения (домен email, формат UUID) или тело содержит лишние поля:
+    повтор запроса с ключом, сохраненным до перехода на хэш модели,
+    получает 409 до истечения срока хранения записи inbox.
+    Новый ключ резервируется до регистрации, поэтому одновременные
+    запросы с тем же ключом ждут результата первого запроса
+    и не регистрируют участника повторно. Если первый запрос
+    зарегистрировал участника во внешнем API, но не сохранил его,
+    возвращается UUID его билета для повторного использования.
+
+    """
+    if not (idempotency_key := member.idempotency_key):
         return None
 
-    body.pop("idempotency_key")
-    inbox = await inbox_service.get_inbox(idempotency_key)
-    hashed, has_conflict = inbox_service.check_conflict(
-        inbox and inbox.request_hash, body
+    hashed = hash_dict(
+        member.model_dump(mode="json", exclude={"idempotency_key"})
     )
+    inbox = await inbox_service.acquire(idempotency_key, hashed)
 
     if inbox is None:
         return {
@@ -61,10 +87,21 @@ async def get_idempotency_data(
             "request_hash": hashed,
         }
 
-    if has_conflict:
+    if inbox.request_hash != hashed:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Idempotency key already exists",
         )
+    if inbox.status != InboxStatus.COMPLETED:
+        if inbox.response is not None:
+            return {
+                "key": idempotency_key,
+                "request_hash": hashed,
+                **inbox.response,
+            }
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request with this idempotency key is in progress",
+        )
 
     return {"response": inbox.response}
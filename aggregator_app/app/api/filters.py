@@ -1,11 +1,14 @@
 """Фильтры API."""
 
-from datetime import date
+from datetime import date, timedelta
+from uuid import UUID
 
 from fastapi_filter.contrib.sqlalchemy import Filter
 from pydantic import ConfigDict, Field, field_validator
+from sqlalchemy import Select, func
 
-from app.orm.models import Event
+from app.orm.models import Event, EventStatus, Place
+from app.orm.repositories.event import get_search_query
 
 
 class EventFilter(Filter):
@@ -14,18 +17,65 @@ class EventFilter(Filter):
     Атрибуты:
     - `event_time__gte`: date | None - Дата начала события в ISO формате;
         может быть пустым; синоним - date_from.
+    - `date_to`: date | None - Последняя дата начала события
+        в ISO формате включительно; может быть пустым.
+    - `status__in`: list[`EventStatus`] | None - Статусы события
+        через запятую; может быть пустым; синоним - status.
+    - `place_id`: UUID | None - UUID места проведения; может быть пустым.
+    - `city`: str | None - Город места проведения; может быть пустым.
+    - `q`: str | None - Поисковый запрос по названиям события и места
+        проведения, городу и адресу в синтаксисе веб-поиска;
+        может быть пустым. Найденные события сортируются по релевантности.
+
+    Каждое сочетание фильтров обслуживается индексами таблиц
+    events и places.
 
     """
 
     event_time__gte: date | None = Field(None, alias="date_from")
+    date_to: date | None = None
+    status__in: list[EventStatus] | None = Field(None, alias="status")
+    place_id: UUID | None = None
+    city: str | None = None
+    q: str | None = Field(None, min_length=1, max_length=256)
 
-    @field_validator("event_time__gte")
+    @field_validator("event_time__gte", "date_to")
     @classmethod
     def string_to_date(cls, v):
         if isinstance(v, str):
             return date.fromisoformat(v)
         return v
 
+    @property
+    def filtering_fields(self):
+        return [
+            (name, value)
+            for name, value in super().filtering_fields
+            if name not in ("date_to", "city", "q")
+        ]
+
+    def filter(self, query: Select) -> Select:
+        query = super().filter(query)
+        if self.date_to is not None:
+            query = query.where(
+                Event.event_time < self.date_to + timedelta(days=1)
+            )
+        if self.city is not None:
+            query = query.where(Event.place.has(Place.city == self.city))
+        if self.q is not None:
+            query = query.where(
+                Event.search_vector.bool_op("@@")(get_search_query(self.q))
+            )
+        return query
+
+    def sort(self, query: Select) -> Select:
+        """Отсортировать найденные по `q` события по релевантности."""
+        if self.q is None:
+            return query
+        return query.order_by(
+            func.ts_rank(Event.search_vector, get_search_query(self.q)).desc()
+        )
+
     class Constants(Filter.Constants):
         model = Event
 
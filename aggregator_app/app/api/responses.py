@@ -0,0 +1,47 @@
+"""Классы ответов API."""
+
+from typing import Any
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.services.json_codec import json_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON-ответ, сериализуемый выбранным в настройках кодеком."""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+
+def get_cache_headers(etag: str) -> dict[str, str]:
+    """Получить заголовки кеширования ответа API событий."""
+    return {"ETag": etag, "Cache-Control": settings.events_cache_control}
+
+
+def get_not_modified_response(request: Request, etag: str) -> Response | None:
+    """Получить ответ 304, если клиенту уже известен `etag`.
+
+    ETag сравниваются слабо: префикс `W/` не учитывается.
+    `If-None-Match: *` не поддерживается: ETag один на все ответы
+    API событий и не говорит, существует ли запрошенное событие.
+
+    Возвращает:
+    - Ответ 304 с заголовками кеширования или None,
+        если `If-None-Match` отсутствует или не совпадает.
+
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.removeprefix("W/") == opaque_tag:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=get_cache_headers(etag),
+            )
+    return None
@@ -0,0 +1,46 @@
+"""API диагностики."""
+
+from fastapi import APIRouter
+
+from app.services.circuit_breaker import circuit_breakers
+from app.services.events_provider import event_quarantine
+from app.services.metrics import metrics
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Получить счетчики метрик процесса.
+
+    Возвращает:
+    - dict[str, int] - Значения счетчиков по имени, например
+        `events_provider.get_seats.deadline_exceeded`.
+
+    """
+    return metrics.snapshot()
+
+
+@router.get("/circuit-breakers")
+async def get_circuit_breakers():
+    """Получить состояния предохранителей внешних API.
+
+    Возвращает:
+    - list[dict] - Для каждой операции: `name`, `state`
+        (closed / open / half_open), `failures`, `failure_threshold`
+        и `retry_in_seconds` - время до пробных запросов.
+
+    """
+    return circuit_breakers.snapshot()
+
+
+@router.get("/quarantine")
+async def get_quarantine():
+    """Получить последние невалидные события EventsProvider API.
+
+    Возвращает:
+    - list[dict] - Для каждого события: `event_id`, `reasons` - ошибки
+        валидации, `data` - исходные данные и `quarantined_at`.
+
+    """
+    return event_quarantine.snapshot()
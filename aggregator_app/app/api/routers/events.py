@@ -1,66 +1,150 @@
 """API событий."""
 
+from collections.abc import AsyncIterator
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from fastapi_filter import FilterDepends
 
 from app.api.dependencies import get_events_service
 from app.api.filters import EventFilter
-from app.api.schemas.events import EventListOutPaginated, EventOutExtendedPlace
+from app.api.responses import get_cache_headers, get_not_modified_response
+from app.api.schemas.events import (
+    EVENT_LIST_ROWS_ADAPTER,
+    EVENT_ROW_ADAPTER,
+    EventListOutPaginated,
+    EventOutExtendedPlace,
+)
+from app.config import settings
 from app.orm.models import EventStatus
+from app.orm.repositories.event import EventLoad
 from app.services.events import EventsService
+from app.services.seats import SeatsIndex
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-@router.get("", response_model=EventListOutPaginated)
+@router.get(
+    "",
+    response_model=EventListOutPaginated,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "Данные не изменились"},
+    },
+)
 async def get_events(
     request: Request,
     events_service: Annotated[EventsService, Depends(get_events_service)],
     filter_: Annotated[EventFilter, FilterDepends(EventFilter)],
     page: Annotated[int, Query(ge=1)] = 1,
-    page_size: Annotated[int | None, Query(ge=1)] = None,
+    page_size: Annotated[
+        int, Query(ge=1, le=settings.events_max_page_size)
+    ] = settings.events_max_page_size,
 ):
     """Получить пагинированный список событий.
 
     Параметры запроса:
     - Параметры фильтрации из `EventFilter`.
     - `page` - Номер страницы; по умолчанию 1.
-    - `page_size` - Размер страницы; по умолчанию None.
+    - `page_size` - Размер страницы, не больше `events_max_page_size`;
+        по умолчанию `events_max_page_size`.
 
     Возвращает:
     - `EventListOutPaginated` - Пагинированный список событий.
 
+    События выбираются без создания объектов ORM и сериализуются
+    в JSON напрямую, минуя проверку моделью `EventListOutPaginated`.
+
+    Ответ содержит слабый `ETag` версии данных событий и `Cache-Control`;
+    при совпадении `If-None-Match` возвращается 304 без запроса событий.
+
     """
-    events, count = await events_service.get_paginated(filter_, page, page_size)
+    etag = await events_service.get_etag()
+    if not_modified := get_not_modified_response(request, etag):
+        return not_modified
+
+    rows, count = await events_service.get_paginated_rows(
+        filter_, page, page_size
+    )
 
     next_url = None
     previous_url = None
-    if page_size:
-        if page * page_size < count:
-            next_url = str(request.url.include_query_params(page=page + 1))
-        if page > 1:
-            previous_url = str(request.url.include_query_params(page=page - 1))
-
-    return EventListOutPaginated(
-        count=count,
-        next=next_url,
-        previous=previous_url,
-        results=events,
+    if page * page_size < count:
+        next_url = str(request.url.include_query_params(page=page + 1))
+    if page > 1:
+        previous_url = str(request.url.include_query_params(page=page - 1))
+
+    content = EVENT_LIST_ROWS_ADAPTER.dump_json(
+        {
+            "count": count,
+            "next": next_url,
+            "previous": previous_url,
+            "results": rows,
+        }
     )
+    return Response(
+        content, media_type="application/json", headers=get_cache_headers(etag)
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}},
+            "description": "События по одному `EventOut` в строке",
+        },
+    },
+)
+async def export_events(
+    events_service: Annotated[EventsService, Depends(get_events_service)],
+    filter_: Annotated[EventFilter, FilterDepends(EventFilter)],
+):
+    """Выгрузить все события в формате NDJSON.
+
+    Параметры запроса:
+    - Параметры фильтрации из `EventFilter`.
+
+    Возвращает:
+    - Поток событий по одному JSON-объекту `EventOut` в строке
+        в том же порядке, что и у списка событий.
+
+    События читаются из базы пачками и отправляются по мере чтения,
+    поэтому память не зависит от количества событий.
+
+    """
+
+    async def generate() -> AsyncIterator[bytes]:
+        async for rows in events_service.export_rows(filter_):
+            yield b"".join(
+                EVENT_ROW_ADAPTER.dump_json(row) + b"\n" for row in rows
+            )
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get(
     "/{event_id}",
     response_model=EventOutExtendedPlace,
     responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "Данные не изменились"},
         status.HTTP_404_NOT_FOUND: {"description": "Событие не найдено"},
     },
 )
 async def get_event(
     event_id: UUID,
+    request: Request,
+    response: Response,
     events_service: Annotated[EventsService, Depends(get_events_service)],
 ):
     """Получить событие по ID.
@@ -71,12 +155,19 @@ async def get_event(
     Возвращает:
     - `EventOutExtendedPlace` - Событие с расширенным местом проведения.
 
+    Кеширование ответа - как у списка событий.
+
     """
+    etag = await events_service.get_etag()
+    if not_modified := get_not_modified_response(request, etag):
+        return not_modified
+
     event = await events_service.get_by_id(event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
         )
+    response.headers.update(get_cache_headers(etag))
     return event
 
 
@@ -86,6 +177,9 @@ async def get_event(
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
             "description": "Ошибка на внешнем API"
         },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Внешний API временно недоступен"
+        },
         status.HTTP_404_NOT_FOUND: {"description": "Событие не найдено"},
         status.HTTP_400_BAD_REQUEST: {"description": "Событие не опубликовано"},
     },
@@ -93,17 +187,25 @@ async def get_event(
 async def get_event_seats(
     event_id: UUID,
     events_service: Annotated[EventsService, Depends(get_events_service)],
+    diff: bool = False,
 ):
     """Получить свободные места на событии.
 
     Параметры пути:
     - `event_id` - UUID события.
 
+    Параметры запроса:
+    - `diff` - Вернуть занятые места вместо свободных; по умолчанию False.
+        Занятые места считаются относительно всех мест из `seats_pattern`
+        и обычно занимают намного меньше места в ответе.
+
     Возвращает:
     - {"event_id": UUID, "available_seats": list[str]} - Свободные места.
+    - {"event_id": UUID, "seats_pattern": str, "unavailable_seats": list[str]}
+        - Занятые места, если передан `diff` и шаблон мест разбирается.
 
     """
-    event = await events_service.get_by_id(event_id)
+    event = await events_service.get_by_id(event_id, load=EventLoad.VALIDATION)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
@@ -114,4 +216,11 @@ async def get_event_seats(
             detail="Event is not published",
         )
     seats = await events_service.get_seats(event_id)
+    seats_index = SeatsIndex.from_place(event.place) if diff else None
+    if seats_index is not None:
+        return {
+            "event_id": event_id,
+            "seats_pattern": event.place.seats_pattern,
+            "unavailable_seats": seats_index.difference(seats),
+        }
     return {"event_id": event_id, "available_seats": seats}
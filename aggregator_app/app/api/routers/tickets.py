@@ -9,11 +9,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.api.dependencies import (
     get_events_service,
     get_idempotency_data,
+    get_member,
     get_tickets_service,
 )
-from app.api.schemas.members import MemberIn
+from app.api.schemas.members import MemberIn, MembersBatchIn, TicketsBatchOut
 from app.orm.models import EventStatus
-from app.services.events import EventsService
+from app.services.events import EventsService, EventValidationData
+from app.services.inbox import InboxService, get_inbox_service
 from app.services.tickets import TicketsService
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
@@ -22,10 +24,51 @@ router = APIRouter(prefix="/tickets", tags=["tickets"])
 EXTERNAL_API_ERROR_RESPONSE = {
     status.HTTP_500_INTERNAL_SERVER_ERROR: {
         "description": "Ошибка на внешнем API"
-    }
+    },
+    status.HTTP_503_SERVICE_UNAVAILABLE: {
+        "description": "Внешний API временно недоступен"
+    },
 }
 
 
+async def _get_registrable_event(
+    events_service: EventsService, event_id: UUID
+) -> EventValidationData:
+    """Получить событие, открытое для регистрации, или вызвать ошибку."""
+    event = await events_service.get_validation_data(event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+        )
+    if event.status != EventStatus.PUBLISHED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event is not published",
+        )
+    if datetime.now(UTC) >= event.registration_deadline:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The registration time has expired",
+        )
+    return event
+
+
+async def _check_registration(events_service: EventsService, member: MemberIn):
+    """Проверить, что участника можно зарегистрировать на место."""
+    event = await _get_registrable_event(events_service, member.event_id)
+    if event.seats_index is not None and member.seat not in event.seats_index:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Seat does not exist",
+        )
+    seats = await events_service.get_seats(member.event_id)
+    if member.seat not in seats:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Seat is not available",
+        )
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
@@ -33,24 +76,29 @@ EXTERNAL_API_ERROR_RESPONSE = {
         **EXTERNAL_API_ERROR_RESPONSE,
         status.HTTP_404_NOT_FOUND: {"description": "Событие не найдено"},
         status.HTTP_409_CONFLICT: {
-            "description": "Ключ идемпотентности уже существует"
+            "description": (
+                "Ключ идемпотентности уже существует"
+                " / запрос с ключом еще обрабатывается"
+            )
         },
         status.HTTP_400_BAD_REQUEST: {
             "description": (
                 "Событие не опубликовано"
                 " / время регистрации истекло"
+                " / место не существует"
                 " / место недоступно"
             )
         },
     },
 )
 async def register(
-    member: MemberIn,
+    member: Annotated[MemberIn, Depends(get_member)],
     events_service: Annotated[EventsService, Depends(get_events_service)],
     tickets_service: Annotated[TicketsService, Depends(get_tickets_service)],
     idempotency_data: Annotated[
         dict[str, Any] | None, Depends(get_idempotency_data)
     ],
+    inbox_service: Annotated[InboxService, Depends(get_inbox_service)],
 ):
     """Зарегистрировать участника на событие.
 
@@ -64,35 +112,61 @@ async def register(
     if idempotency_data and (response := idempotency_data.get("response")):
         return response
 
-    event = await events_service.get_by_id(member.event_id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
-        )
-    if event.status != EventStatus.PUBLISHED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Event is not published",
-        )
-    if datetime.now(UTC) >= event.registration_deadline:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="The registration time has expired",
-        )
-    seats = await events_service.get_seats(member.event_id)
-    if member.seat not in seats:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Seat is not available",
-        )
+    if not (idempotency_data and "ticket_id" in idempotency_data):
+        async with inbox_service.release_on_error(idempotency_data):
+            await _check_registration(events_service, member)
 
-    member_data = member.model_dump()
+    member_data = member.model_dump(exclude={"idempotency_key"})
     ticket_id = await tickets_service.register(
         member_data.pop("event_id"), member_data, idempotency_data
     )
     return {"ticket_id": ticket_id}
 
 
+@router.post(
+    "/batch",
+    response_model=TicketsBatchOut,
+    responses={
+        **EXTERNAL_API_ERROR_RESPONSE,
+        status.HTTP_404_NOT_FOUND: {"description": "Событие не найдено"},
+        status.HTTP_400_BAD_REQUEST: {
+            "description": (
+                "Событие не опубликовано / время регистрации истекло"
+            )
+        },
+    },
+)
+async def register_batch(
+    batch: MembersBatchIn,
+    events_service: Annotated[EventsService, Depends(get_events_service)],
+    tickets_service: Annotated[TicketsService, Depends(get_tickets_service)],
+):
+    """Зарегистрировать группу участников на одно событие.
+
+    Событие проверяется и свободные места запрашиваются один раз
+    на всю группу. Ошибки отдельных участников (место недоступно,
+    конфликт ключа идемпотентности, ошибка внешнего API) не прерывают
+    регистрацию остальных и возвращаются в результатах.
+
+    Параметры тела запроса:
+    - `batch`: `MembersBatchIn` - Регистрируемые участники.
+
+    Возвращает:
+    - `TicketsBatchOut` - Результаты в порядке участников запроса.
+
+    """
+    event = await _get_registrable_event(events_service, batch.event_id)
+    seats = await events_service.get_seats(batch.event_id)
+
+    results = await tickets_service.register_batch(
+        batch.event_id,
+        [member.model_dump(mode="json") for member in batch.members],
+        set(seats),
+        event.seats_index,
+    )
+    return {"results": results}
+
+
 @router.delete(
     "/{ticket_id}",
     responses={
@@ -1,11 +1,12 @@
 """Схемы событий."""
 
 from datetime import datetime
+from typing import TypedDict
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl, TypeAdapter
 
-from app.api.schemas.places import PlaceOut, PlaceOutExtended
+from app.api.schemas.places import PlaceOut, PlaceOutExtended, PlaceOutRow
 from app.orm.models.event import EventStatus
 
 
@@ -62,3 +63,36 @@ class EventListOutPaginated(BaseModel):
     next: HttpUrl | None
     previous: HttpUrl | None
     results: list[EventOut]
+
+
+class EventOutRow(TypedDict):
+    """Событие в строке списка событий.
+
+    Повторяет поля `EventOut` для сериализации без создания моделей.
+
+    """
+
+    id: UUID
+    name: str
+    place: PlaceOutRow
+    event_time: datetime
+    registration_deadline: datetime
+    status: EventStatus
+    number_of_visitors: int
+
+
+class EventListOutPaginatedRows(TypedDict):
+    """Пагинированный список событий из строк.
+
+    Сериализуется в тот же JSON, что и `EventListOutPaginated`.
+
+    """
+
+    count: int
+    next: str | None
+    previous: str | None
+    results: list[EventOutRow]
+
+
+EVENT_ROW_ADAPTER = TypeAdapter(EventOutRow)
+EVENT_LIST_ROWS_ADAPTER = TypeAdapter(EventListOutPaginatedRows)
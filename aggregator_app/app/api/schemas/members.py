@@ -4,12 +4,13 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.config import settings
 
-class MemberIn(BaseModel):
-    """Схема регистрации участника.
+
+class MemberBaseIn(BaseModel):
+    """Базовая схема данных участника.
 
     Атрибуты:
-    - `event_id` - UUID события для регистрации.
     - `first_name` - Имя участника.
     - `last_name` - Фамилия участника.
     - `email` - Email участника.
@@ -17,7 +18,6 @@ class MemberIn(BaseModel):
 
     """
 
-    event_id: UUID
     first_name: str = Field(
         min_length=2, max_length=32, pattern=r"^[A-ZА-Я][a-zа-я]+$"
     )
@@ -26,3 +26,74 @@ class MemberIn(BaseModel):
     )
     email: EmailStr
     seat: str = Field(pattern=r"^[A-Z][1-9][0-9]{0,6}$")
+
+
+class MemberIn(MemberBaseIn):
+    """Схема регистрации участника.
+
+    Наследуется от `MemberBaseIn`.
+
+    Атрибуты:
+    - `event_id` - UUID события для регистрации.
+    - `idempotency_key` - Ключ идемпотентности; может быть пустым.
+
+    """
+
+    event_id: UUID
+    idempotency_key: str | None = None
+
+
+class MemberBatchItemIn(MemberBaseIn):
+    """Схема участника в групповой регистрации.
+
+    Наследуется от `MemberBaseIn`.
+
+    Атрибуты:
+    - `idempotency_key` - Ключ идемпотентности участника; может быть пустым.
+
+    """
+
+    idempotency_key: str | None = None
+
+
+class MembersBatchIn(BaseModel):
+    """Схема групповой регистрации участников на одно событие.
+
+    Атрибуты:
+    - `event_id` - UUID события для регистрации.
+    - `members`: list[`MemberBatchItemIn`] - Регистрируемые участники;
+        не более `tickets_batch_max_size`.
+
+    """
+
+    event_id: UUID
+    members: list[MemberBatchItemIn] = Field(
+        min_length=1, max_length=settings.tickets_batch_max_size
+    )
+
+
+class TicketBatchItemOut(BaseModel):
+    """Результат регистрации участника в групповой регистрации.
+
+    Атрибуты:
+    - `status_code` - HTTP-статус регистрации участника.
+    - `ticket_id` - UUID билета; пустой при ошибке.
+    - `detail` - Описание ошибки; пустое при успехе.
+
+    """
+
+    status_code: int
+    ticket_id: UUID | None = None
+    detail: str | None = None
+
+
+class TicketsBatchOut(BaseModel):
+    """Результаты групповой регистрации.
+
+    Атрибуты:
+    - `results`: list[`TicketBatchItemOut`] - Результаты в порядке
+        участников запроса.
+
+    """
+
+    results: list[TicketBatchItemOut]
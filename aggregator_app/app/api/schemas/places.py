@@ -1,5 +1,6 @@
 """Схемы мест проведения."""
 
+from typing import TypedDict
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -24,6 +25,19 @@ class PlaceOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PlaceOutRow(TypedDict):
+    """Место проведения в строке списка событий.
+
+    Повторяет поля `PlaceOut` для сериализации без создания моделей.
+
+    """
+
+    id: UUID
+    name: str
+    city: str
+    address: str
+
+
 class PlaceOutExtended(PlaceOut):
     """Расширенная схема возвращаемого места проведения.
 
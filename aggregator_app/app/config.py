@@ -1,6 +1,8 @@
 """Конфигурация приложения."""
 
-from pydantic import SecretStr
+from typing import Literal
+
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings
 
 
@@ -19,6 +21,96 @@ class Settings(BaseSettings):
     - `outbox_seconds_interval` - Интервал запуска воркера outbox в секундах.
     - `inbox_seconds_ttl` - Время жизни inbox в секундах.
     - `inbox_seconds_interval` - Интервал запуска воркера inbox в секундах.
+    - `inbox_expire_batch_size` - Количество истекших ключей секции inbox
+        по умолчанию, удаляемых одной транзакцией.
+    - `inbox_expire_batch_seconds_pause` - Пауза между транзакциями
+        удаления истекших ключей секции inbox по умолчанию в секундах.
+    - `partition_seconds_interval` - Интервал запуска обслуживания
+        секций inbox и outbox в секундах.
+    - `partition_premake_days` - Количество дней, на которые секции
+        создаются заранее.
+    - `outbox_retention_days` - Количество дней, после которых секция
+        outbox без ожидающих событий удаляется.
+    - `inbox_reservation_seconds_ttl` - Время в секундах, через которое
+        резервирование ключа идемпотентности незавершенным запросом
+        перестает блокировать повторные запросы.
+    - `inbox_wait_seconds_timeout` - Максимальное время ожидания
+        результата запроса с тем же ключом идемпотентности в секундах.
+    - `inbox_wait_seconds_interval` - Интервал проверки результата
+        запроса с тем же ключом идемпотентности в секундах.
+    - `inbox_cache_size` - Максимальное количество записей inbox
+        в локальном кэше.
+    - `inbox_bloom_filter_enabled` - Включить фильтр Блума ключей inbox;
+        допустимо только при одной реплике приложения.
+    - `inbox_bloom_filter_capacity` - Ожидаемое количество ключей inbox
+        для расчета размера фильтра Блума.
+    - `inbox_bloom_filter_error_rate` - Допустимая доля ложных
+        срабатываний фильтра Блума.
+    - `sync_seconds_interval` - Интервал синхронизации в секундах.
+    - `sync_adaptive` - Подбирать интервал синхронизации по количеству
+        изменений, найденных последней синхронизацией.
+    - `sync_min_seconds_interval` - Минимальный интервал адаптивной
+        синхронизации в секундах.
+    - `sync_max_seconds_interval` - Максимальный интервал адаптивной
+        синхронизации в секундах.
+    - `sync_adaptive_changes_threshold` - Количество вставленных
+        и обновленных событий, при котором интервал сокращается вдвое;
+        без изменений интервал удваивается.
+    - `sync_checkpoint_size` - Количество событий, после сохранения которых
+        синхронизация запоминает курсор пагинации для продолжения
+        после сбоя.
+    - `sync_backfill_concurrency` - Количество окон дат изменения,
+        загружаемых одновременно при первой синхронизации; при 1 загрузка
+        идет одной цепочкой страниц. Параллельная загрузка предполагает,
+        что EventsProvider API отдает события по возрастанию `changed_at`.
+    - `sync_backfill_window_days` - Размер окна дат изменения
+        первой синхронизации в днях.
+    - `events_provider_sync_requests_per_second` - Максимальная частота
+        запросов страниц событий при параллельной загрузке.
+    - `events_quarantine_size` - Количество последних невалидных событий
+        EventsProvider API, хранимых для диагностики.
+    - `event_cache_size` - Максимальное количество событий в локальном
+        кэше данных для проверки регистрации.
+    - `events_cache_control` - Значение заголовка `Cache-Control`
+        ответов API событий.
+    - `events_data_version_seconds_ttl` - Время в секундах, в течение
+        которого версия данных событий для ETag берется из кэша процесса;
+        изменения других реплик становятся видны не позже этого времени.
+    - `events_max_page_size` - Максимальный размер страницы списка событий
+        от 1 до 10000; используется и как размер страницы по умолчанию.
+    - `events_export_batch_size` - Количество событий, читаемых из базы
+        за раз при выгрузке всех событий.
+    - `response_compression` - Сжатие ответов приложения: `br` или `auto` -
+        brotli, если клиент его принимает, иначе gzip; `gzip` или `off`.
+    - `response_compression_minimum_size` - Минимальный размер ответа
+        в байтах, при котором он сжимается.
+    - `response_gzip_level` - Уровень сжатия gzip от 1 до 9.
+    - `response_brotli_quality` - Качество сжатия brotli от 0 до 11.
+    - `tickets_batch_max_size` - Максимальное количество участников
+        в групповой регистрации.
+    - `tickets_batch_concurrency` - Максимальное количество одновременных
+        запросов регистрации к EventsProvider API в групповой регистрации.
+    - `events_provider_seats_seconds_timeout` - Время одной попытки
+        получения свободных мест в секундах.
+    - `events_provider_register_seconds_timeout` - Время одной попытки
+        регистрации и отмены регистрации в секундах.
+    - `events_provider_sync_page_seconds_timeout` - Время одной попытки
+        получения страницы событий при синхронизации в секундах.
+    - `events_provider_sync_page_seconds_deadline` - Время получения
+        страницы событий вместе с повторами в секундах.
+    - `notification_seconds_timeout` - Время одной попытки отправки
+        уведомления в секундах.
+    - `external_request_seconds_deadline` - Время запроса к внешнему API
+        вместе с повторами в секундах для запросов, выполняемых
+        при обработке запросов пользователей и отправке уведомлений.
+    - `json_codec` - Реализация JSON для ответов внешних API и ответов
+        приложения: `orjson`, `stdlib` или `auto` - самая быстрая.
+    - `circuit_breaker_failure_threshold` - Количество ошибок подряд,
+        после которого предохранитель внешнего API открывается.
+    - `circuit_breaker_recovery_seconds` - Время в секундах, через которое
+        открытый предохранитель пропускает пробные запросы.
+    - `circuit_breaker_half_open_max_calls` - Максимальное количество
+        одновременных пробных запросов.
 
     Свойства:
     - `database_url` - URL для подключения к базе данных.
@@ -36,6 +128,49 @@ class Settings(BaseSettings):
     outbox_seconds_interval: int
     inbox_seconds_ttl: int
     inbox_seconds_interval: int
+    inbox_expire_batch_size: int = 1000
+    inbox_expire_batch_seconds_pause: float = 0.05
+    partition_seconds_interval: int = 3600
+    partition_premake_days: int = 3
+    outbox_retention_days: int = 7
+    inbox_reservation_seconds_ttl: int = 60
+    inbox_wait_seconds_timeout: float = 20
+    inbox_wait_seconds_interval: float = 0.2
+    inbox_cache_size: int = 10000
+    inbox_bloom_filter_enabled: bool = False
+    inbox_bloom_filter_capacity: int = 1_000_000
+    inbox_bloom_filter_error_rate: float = 0.01
+    sync_seconds_interval: int = 86400
+    sync_adaptive: bool = False
+    sync_min_seconds_interval: int = 300
+    sync_max_seconds_interval: int = 86400
+    sync_adaptive_changes_threshold: int = 100
+    sync_checkpoint_size: int = 1000
+    sync_backfill_concurrency: int = 1
+    sync_backfill_window_days: int = 30
+    events_provider_sync_requests_per_second: float = 10
+    events_quarantine_size: int = 100
+    event_cache_size: int = 10000
+    events_cache_control: str = "public, max-age=5"
+    events_data_version_seconds_ttl: float = 1
+    events_max_page_size: int = Field(1000, ge=1, le=10000)
+    events_export_batch_size: int = 1000
+    response_compression: Literal["auto", "br", "gzip", "off"] = "auto"
+    response_compression_minimum_size: int = 1000
+    response_gzip_level: int = Field(6, ge=1, le=9)
+    response_brotli_quality: int = Field(4, ge=0, le=11)
+    tickets_batch_max_size: int = 100
+    tickets_batch_concurrency: int = 10
+    events_provider_seats_seconds_timeout: float = 5
+    events_provider_register_seconds_timeout: float = 10
+    events_provider_sync_page_seconds_timeout: float = 30
+    events_provider_sync_page_seconds_deadline: float = 90
+    notification_seconds_timeout: float = 10
+    external_request_seconds_deadline: float = 20
+    json_codec: Literal["auto", "orjson", "stdlib"] = "auto"
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_recovery_seconds: float = 30
+    circuit_breaker_half_open_max_calls: int = 1
 
     @property
     def database_url(self) -> str:
@@ -6,11 +6,16 @@ from cashews import cache
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 
-from app.api.routers import events, healthcheck, sync, tickets
+from app.api.compression import CompressionMiddleware, get_encodings
+from app.api.responses import CodecJSONResponse
+from app.api.routers import diagnostics, events, healthcheck, sync, tickets
+from app.config import settings
 from app.error_handlers import validation_exception_handler
 from app.orm.db_manager import db_manager
+from app.services.events import EVENT_VALIDATION_CACHE_PREFIX
 from app.services.inbox import get_inbox_service
 from app.services.outbox import get_outbox_service
+from app.services.partitions import get_partition_service
 from app.services.sync import get_sync_service
 from app.services.utils import scheduler
 
@@ -30,12 +35,18 @@ async def lifespan(app: FastAPI):
         get_sync_service(),
         get_outbox_service(),
         get_inbox_service(),
+        get_partition_service(),
     )
     for initable in scheduler_initable:
         await initable.init_jobs()
     scheduler.start()
 
     cache.setup("mem://")
+    cache.setup(
+        "mem://",
+        prefix=EVENT_VALIDATION_CACHE_PREFIX,
+        size=settings.event_cache_size,
+    )
     yield
     scheduler.shutdown()
     await db_manager.close()
@@ -47,11 +58,21 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
     root_path="/api",
+    default_response_class=CodecJSONResponse,
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=get_encodings(settings.response_compression),
+    minimum_size=settings.response_compression_minimum_size,
+    gzip_level=settings.response_gzip_level,
+    brotli_quality=settings.response_brotli_quality,
 )
 
 app.include_router(healthcheck.router)
 app.include_router(sync.router)
 app.include_router(events.router)
 app.include_router(tickets.router)
+app.include_router(diagnostics.router)
 
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
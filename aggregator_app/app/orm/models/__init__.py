@@ -2,8 +2,8 @@
 
 from app.orm.models.base import Base
 from app.orm.models.event import Event, EventStatus
-from app.orm.models.inbox import Inbox
-from app.orm.models.member import Member
+from app.orm.models.inbox import Inbox, InboxStatus
+from app.orm.models.member import MEMBERS_VERSION_SEQ, Member
 from app.orm.models.outbox import Outbox, OutboxStatus, OutboxType
 from app.orm.models.place import Place
 from app.orm.models.sync_meta import SyncMeta, SyncStatus
@@ -13,6 +13,8 @@ __all__ = [
     "Event",
     "EventStatus",
     "Inbox",
+    "InboxStatus",
+    "MEMBERS_VERSION_SEQ",
     "Member",
     "Outbox",
     "OutboxStatus",
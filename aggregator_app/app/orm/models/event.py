@@ -4,7 +4,17 @@ import uuid as uuid_pkg
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import UUID, DateTime, Enum, ForeignKey, String, func, select
+from sqlalchemy import (
+    UUID,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.orm.models.base import Base
@@ -38,6 +48,8 @@ class Event(Base):
     - `created_at`: datetime - время создания; не может быть пустым.
     - `status_changed_at`: datetime - время последнего изменения статуса;
         не может быть пустым.
+    - `search_vector` - вектор полнотекстового поиска по названиям события
+        и места проведения, городу и адресу; заполняется при синхронизации.
 
     Свойства:
     - `number_of_visitors` - количество зарегистрированных участников `Member`.
@@ -45,6 +57,16 @@ class Event(Base):
     """
 
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_event_time_id", "event_time", "id"),
+        Index("ix_events_status_event_time", "status", "event_time"),
+        Index("ix_events_place_id_event_time", "place_id", "event_time"),
+        Index(
+            "ix_events_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[uuid_pkg.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, nullable=False
@@ -72,6 +94,7 @@ class Event(Base):
     status_changed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True)
     number_of_visitors = column_property(
         select(func.count(Member.ticket_id))
         .where(Member.event_id == id)
@@ -1,38 +1,60 @@
 """Модель идемпотентности."""
 
 from datetime import UTC, datetime, timedelta
+from enum import Enum as PyEnum
 
-from sqlalchemy import JSON, DateTime, String
+from sqlalchemy import JSON, DateTime, Enum, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.config import settings
 from app.orm.models.base import Base
 
 
+class InboxStatus(PyEnum):
+    """Статус обработки запроса."""
+
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
 class Inbox(Base):
     """Модель идемпотентности.
 
-    Таблица: inbox.
+    Таблица: inbox; секционирована по диапазонам `expires_at`,
+    истекшие секции удаляются целиком.
 
     Атрибуты:
-    - `key` - ключ идемпотентности; первичный ключ.
+    - `key` - ключ идемпотентности; первичный ключ вместе с `expires_at`;
+        неистекший ключ уникален - это проверяет триггер `inbox_key_guard`.
     - `request_hash` - хэш запроса; не может быть пустым.
-    - `response` - JSON-данные ответа; не может быть пустым.
+    - `response` - JSON-данные ответа; пустой, пока запрос
+        обрабатывается.
+    - `status`: `InboxStatus` - статус обработки запроса;
+        не может быть пустым; по умолчанию 'completed'.
     - `expires_at`: datetime - время истечения срока действия;
-        не может быть пустым.
+        часть первичного ключа; индексируется.
 
     """
 
     __tablename__ = "inbox"
+    __table_args__ = {"postgresql_partition_by": "RANGE (expires_at)"}
 
     key: Mapped[str] = mapped_column(
         String(128), primary_key=True, nullable=False
     )
     request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
-    response: Mapped[dict] = mapped_column(JSON, nullable=False)
+    response: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    status: Mapped[InboxStatus] = mapped_column(
+        Enum(InboxStatus),
+        nullable=False,
+        default=InboxStatus.COMPLETED,
+        server_default=InboxStatus.COMPLETED.name,
+    )
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
+        index=True,
         default=lambda: (
             datetime.now(UTC) + timedelta(seconds=settings.inbox_seconds_ttl)
         ),
@@ -2,7 +2,7 @@
 
 import uuid as uuid_pkg
 
-from sqlalchemy import UUID, ForeignKey, String
+from sqlalchemy import UUID, ForeignKey, Sequence, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.orm.models.base import Base
@@ -34,6 +34,12 @@ class Member(Base):
     seat: Mapped[str] = mapped_column(String(16), nullable=False)
     email: Mapped[str] = mapped_column(String(128), nullable=False)
     event_id: Mapped[uuid_pkg.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("events.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("events.id"),
+        nullable=False,
+        index=True,
     )
     event = relationship("Event")
+
+
+MEMBERS_VERSION_SEQ = Sequence("members_version_seq", metadata=Base.metadata)
@@ -25,20 +25,22 @@ class OutboxStatus(PyEnum):
 class Outbox(Base):
     """Модель очереди событий.
 
-    Таблица: outbox.
+    Таблица: outbox; секционирована по диапазонам `created_at`,
+    старые секции без ожидающих событий удаляются целиком.
 
     Атрибуты:
-    - `id` - идентификатор; первичный ключ.
+    - `id` - идентификатор; первичный ключ вместе с `created_at`.
     - `type`: `OutboxType` - тип события; не может быть пустым.
     - `payload` - JSON-данные; не может быть пустым.
     - `status`: `OutboxStatus` - статус отправки; не может быть пустым;
         по умолчанию 'waiting'.
-    - `created_at`: datetime - время создания; не может быть пустым;
+    - `created_at`: datetime - время создания; часть первичного ключа;
         по умолчанию 'NOW()'.
 
     """
 
     __tablename__ = "outbox"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, nullable=False
@@ -52,5 +54,8 @@ class Outbox(Base):
         default=OutboxStatus.WAITING,
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default="NOW()"
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default="NOW()",
     )
@@ -3,7 +3,7 @@
 import uuid as uuid_pkg
 from datetime import datetime
 
-from sqlalchemy import UUID, DateTime, String
+from sqlalchemy import JSON, UUID, DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.orm.models.base import Base
@@ -20,6 +20,8 @@ class Place(Base):
     - `city` - Город места проведения; не может быть пустым.
     - `address` - Адрес места проведения; не может быть пустым.
     - `seats_pattern` - Формат посадочных мест; не может быть пустым.
+    - `seats_index` - Индекс посадочных мест, построенный по `seats_pattern`
+        при синхронизации; может быть пустым.
     - `changed_at`: datetime - время последнего изменения;
         не может быть пустым.
     - `created_at`: datetime - время создания; не может быть пустым.
@@ -32,9 +34,10 @@ class Place(Base):
         UUID(as_uuid=True), primary_key=True, nullable=False
     )
     name: Mapped[str] = mapped_column(String(128), nullable=False)
-    city: Mapped[str] = mapped_column(String(128), nullable=False)
+    city: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     address: Mapped[str] = mapped_column(String(128), nullable=False)
     seats_pattern: Mapped[str] = mapped_column(String(128), nullable=False)
+    seats_index: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     changed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
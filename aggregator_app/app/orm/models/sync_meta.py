@@ -1,9 +1,17 @@
 """Модель метаданных синхронизации."""
 
-from datetime import date, datetime
+import uuid as uuid_pkg
+from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import CheckConstraint, Date, DateTime, Enum, Integer
+from sqlalchemy import (
+    UUID,
+    CheckConstraint,
+    DateTime,
+    Enum,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.orm.models.base import Base
@@ -26,10 +34,20 @@ class SyncMeta(Base):
     - `id` - Идентификатор; первичный ключ; может быть только = 1.
     - `last_sync_time`: datetime | None - Время последней синхронизации;
         может быть пустым.
-    - `last_changed_at`: date | None - Последняя запрашиваемая дата
-        изменения данных; может быть пустым.
+    - `last_changed_at`: datetime | None - Время изменения последнего
+        синхронизированного события (водяной знак); может быть пустым.
+    - `last_event_id`: UUID | None - ID последнего синхронизированного
+        события среди событий с временем `last_changed_at`;
+        может быть пустым.
     - `sync_status`: `SyncStatus` - Последний статус синхронизации;
         по умолчанию 'never'; не может быть пустым.
+    - `checkpoint_cursor`: str | None - Курсор следующей страницы
+        незавершенной синхронизации; может быть пустым.
+    - `checkpoint_changed_at`: datetime | None - Время изменения
+        последнего сохраненного события незавершенной синхронизации;
+        может быть пустым.
+    - `checkpoint_event_id`: UUID | None - ID последнего сохраненного
+        события незавершенной синхронизации; может быть пустым.
 
     """
 
@@ -46,14 +64,30 @@ class SyncMeta(Base):
     last_sync_time: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
-    last_changed_at: Mapped[date | None] = mapped_column(Date, nullable=True)
+    last_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_event_id: Mapped[uuid_pkg.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
     sync_status: Mapped[SyncStatus] = mapped_column(
         Enum(SyncStatus), default=SyncStatus.NEVER, nullable=False
     )
+    checkpoint_cursor: Mapped[str | None] = mapped_column(
+        String(512), nullable=True
+    )
+    checkpoint_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    checkpoint_event_id: Mapped[uuid_pkg.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
 
     def __str__(self) -> str:
         return (
             f"SyncMeta(id={self.id}, last_sync_time={self.last_sync_time}, "
             f"last_changed_at={self.last_changed_at}, "
-            f"sync_status='{self.sync_status.value}')"
+            f"last_event_id={self.last_event_id}, "
+            f"sync_status='{self.sync_status.value}', "
+            f"checkpoint_cursor={self.checkpoint_cursor})"
         )
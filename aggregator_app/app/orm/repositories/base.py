@@ -1,11 +1,51 @@
 """Базовый репозиторий."""
 
+from typing import Any, NamedTuple
+
+from sqlalchemy import ColumnElement, Insert, column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+class UpsertStats(NamedTuple):
+    """Результат upsert.
+
+    Атрибуты:
+    - `inserted` - Количество вставленных записей.
+    - `updated` - Количество обновленных записей.
+    - `unchanged` - Количество записей, обновление которых пропущено.
+    - `ids` - ID вставленных и обновленных записей.
+
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    ids: tuple[Any, ...] = ()
+
+
 class BaseRepository:
     """Базовый репозиторий."""
 
     def __init__(self, session: AsyncSession):
         """Инициализировать репозиторий с сессией базы данных."""
         self._session = session
+
+    async def _execute_upsert(
+        self, stmt: Insert, total: int, id_column: ColumnElement
+    ) -> UpsertStats:
+        """Выполнить upsert и посчитать вставленные и обновленные записи.
+
+        Возвращаются только затронутые записи; у вставленных системный
+        столбец `xmax` равен 0. Остальные `total` записей не изменились.
+
+        """
+        stmt = stmt.returning(column("xmax") == 0, id_column)
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        inserted = sum(row[0] for row in rows)
+        return UpsertStats(
+            inserted=inserted,
+            updated=len(rows) - inserted,
+            unchanged=total - len(rows),
+            ids=tuple(row[1] for row in rows),
+        )
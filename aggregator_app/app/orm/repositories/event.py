@@ -1,14 +1,122 @@
 """Репозиторий событий."""
 
+from collections.abc import AsyncIterator, Sequence
+from enum import Enum as PyEnum
 from typing import Any, Protocol
 from uuid import UUID
 
 from fastapi_filter.contrib.sqlalchemy import Filter
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    case,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.sql.base import ExecutableOption
 
-from app.orm.models import Event
-from app.orm.repositories.base import BaseRepository
+from app.orm.models import MEMBERS_VERSION_SEQ, Event, Place, SyncMeta
+from app.orm.repositories.base import BaseRepository, UpsertStats
+
+
+class EventLoad(PyEnum):
+    """Набор загружаемых полей события.
+
+    - `LISTING` - Поля `EventOut`: место проведения без шаблона мест.
+    - `DETAIL` - Поля `EventOutExtendedPlace`: `LISTING`
+        и шаблон мест места проведения.
+    - `VALIDATION` - Только поля для проверки регистрации: статус, время,
+        шаблон и индекс мест; без подсчета участников.
+
+    Незагруженные поля при обращении вызывают ошибку,
+    а не отложенный запрос к базе.
+
+    """
+
+    LISTING = "listing"
+    DETAIL = "detail"
+    VALIDATION = "validation"
+
+
+SEARCH_CONFIG = literal_column("'simple'")
+
+
+def _get_weighted_vector(text: ColumnElement, weight: str) -> ColumnElement:
+    return func.setweight(
+        func.to_tsvector(SEARCH_CONFIG, text), literal_column(f"'{weight}'")
+    )
+
+
+def get_search_vector(event_name: ColumnElement) -> ColumnElement:
+    """Получить выражение вектора поиска события.
+
+    Название события имеет вес A, название места проведения - B,
+    город и адрес - C. Конфигурация `simple` не зависит от языка
+    и не отбрасывает стоп-слова.
+
+    """
+    return (
+        _get_weighted_vector(event_name, "A")
+        .op("||")(_get_weighted_vector(Place.name, "B"))
+        .op("||")(
+            _get_weighted_vector(
+                func.concat_ws(" ", Place.city, Place.address), "C"
+            )
+        )
+    )
+
+
+def get_search_query(q: str) -> ColumnElement:
+    """Получить поисковый запрос из строки в синтаксисе веб-поиска.
+
+    Поддерживаются фразы в кавычках, `or` и исключение слов через `-`.
+
+    """
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+_OUT_EVENT_COLUMNS = (
+    Event.name,
+    Event.event_time,
+    Event.registration_deadline,
+    Event.status,
+    Event.number_of_visitors,
+)
+_OUT_PLACE_COLUMNS = (Place.name, Place.city, Place.address)
+
+EVENT_LOAD_OPTIONS: dict[EventLoad, tuple[ExecutableOption, ...]] = {
+    EventLoad.LISTING: (
+        load_only(*_OUT_EVENT_COLUMNS, raiseload=True),
+        joinedload(Event.place, innerjoin=True).load_only(
+            *_OUT_PLACE_COLUMNS, raiseload=True
+        ),
+    ),
+    EventLoad.DETAIL: (
+        load_only(*_OUT_EVENT_COLUMNS, raiseload=True),
+        joinedload(Event.place, innerjoin=True).load_only(
+            *_OUT_PLACE_COLUMNS, Place.seats_pattern, raiseload=True
+        ),
+    ),
+    EventLoad.VALIDATION: (
+        load_only(
+            Event.event_time,
+            Event.registration_deadline,
+            Event.status,
+            raiseload=True,
+        ),
+        joinedload(Event.place, innerjoin=True).load_only(
+            Place.seats_pattern, Place.seats_index, raiseload=True
+        ),
+    ),
+}
 
 
 class IEventRepository(Protocol):
@@ -26,23 +134,94 @@ class IEventRepository(Protocol):
         - `filter_` - Фильтр событий; по умолчанию None.
 
         Возвращает:
-        - list[Event] - Список событий.
+        - list[Event] - Список событий с полями `EventLoad.LISTING`.
 
         """
 
-    async def get_by_id(self, event_id: UUID) -> Event | None:
-        """Получить событие по ID."""
+    async def get_paginated_rows(
+        self, page: int, page_size: int | None, filter_: Filter | None = None
+    ) -> list[dict[str, Any]]:
+        """Получить пагинированные события в виде словарей.
+
+        В отличие от `get_paginated` выбирает только поля списка событий
+        и не создает объекты ORM. Аргументы те же.
+
+        Возвращает:
+        - list[dict[str, Any]] - Словари с ключами `id`, `name`, `place`
+            (`id`, `name`, `city`, `address`), `event_time`,
+            `registration_deadline`, `status`, `number_of_visitors`.
+
+        """
+
+    def stream_rows(
+        self, batch_size: int, filter_: Filter | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Получить все события в виде словарей пачками.
+
+        Строки читаются курсором на стороне сервера по `batch_size`
+        за раз, поэтому память не зависит от количества событий.
+        Словари такие же, как в `get_paginated_rows`, порядок - тот же.
+
+        Аргументы:
+        - `batch_size` - Количество событий в пачке.
+        - `filter_` - Фильтр событий; по умолчанию None.
+
+        """
+
+    async def get_by_id(
+        self, event_id: UUID, *, load: EventLoad = EventLoad.DETAIL
+    ) -> Event | None:
+        """Получить событие по ID.
+
+        Аргументы:
+        - `event_id` - UUID события.
+        - `load` - Набор загружаемых полей; по умолчанию `EventLoad.DETAIL`.
+
+        Возвращает:
+        - Событие или None, если не найдено.
+
+        """
 
     async def get_count(self, filter_: Filter | None = None) -> int:
         """Получить количество событий."""
 
-    async def upsert(self, json_data_list: list[dict[str, Any]]):
+    async def get_data_version(self) -> str:
+        """Получить версию данных событий.
+
+        Версия складывается из водяного знака и контрольной точки
+        синхронизации, которые меняются в одной транзакции с событиями,
+        и версии состава участников. Одинаковые версии означают
+        одинаковые ответы API событий.
+
+        """
+
+    async def upsert(self, json_data_list: list[dict[str, Any]]) -> UpsertStats:
         """Вставить или обновить записи при конфликте.
 
         Данные должны быть в виде словаря с ключами,
         соответсвующими полям модели `Event`, и приведенными
         к требуемым типам данных значениями.
 
+        Существующая запись обновляется, только если
+        изменилось значение `changed_at`.
+
+        Вектор поиска не меняется, см. `update_search_vectors`.
+
+        """
+
+    async def update_search_vectors(
+        self, place_ids: Sequence[UUID], event_ids: Sequence[UUID] = ()
+    ) -> int:
+        """Обновить векторы поиска событий мест проведения и событий.
+
+        Вызывается после upsert мест проведения и событий с ID
+        вставленных и обновленных записей (`UpsertStats.ids`), поэтому
+        учитывает и новые события, и изменения названий и адресов мест.
+        Записываются только строки, вектор которых изменился.
+
+        Возвращает:
+        - Количество обновленных событий.
+
         """
 
 
@@ -56,17 +235,78 @@ class EventRepository(BaseRepository, IEventRepository):
     async def get_paginated(
         self, page: int, page_size: int | None, filter_: Filter | None = None
     ) -> list[Event]:
-        stmt = select(Event)
+        stmt = select(Event).options(*EVENT_LOAD_OPTIONS[EventLoad.LISTING])
         if filter_:
-            stmt = filter_.filter(stmt)
+            stmt = filter_.sort(filter_.filter(stmt))
         stmt = stmt.order_by(Event.event_time, Event.id)
         if page_size:
             stmt = stmt.offset((page - 1) * page_size).limit(page_size)
         result = await self._session.execute(stmt)
         return result.scalars().all()
 
-    async def get_by_id(self, event_id: UUID) -> Event | None:
-        stmt = select(Event).where(Event.id == event_id)
+    async def get_paginated_rows(
+        self, page: int, page_size: int | None, filter_: Filter | None = None
+    ) -> list[dict[str, Any]]:
+        stmt = self._select_rows(filter_)
+        if page_size:
+            stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+        result = await self._session.execute(stmt)
+        return [self._row_to_dict(row) for row in result]
+
+    async def stream_rows(
+        self, batch_size: int, filter_: Filter | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        stmt = self._select_rows(filter_).execution_options(
+            yield_per=batch_size
+        )
+        result = await self._session.stream(stmt)
+        async for rows in result.partitions():
+            yield [self._row_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _select_rows(filter_: Filter | None) -> Select:
+        """Получить запрос полей списка событий по порядку времени начала."""
+        stmt = select(
+            Event.id,
+            Event.name,
+            Place.id.label("place_id"),
+            Place.name.label("place_name"),
+            Place.city,
+            Place.address,
+            Event.event_time,
+            Event.registration_deadline,
+            Event.status,
+            Event.number_of_visitors,
+        ).join(Place, Event.place_id == Place.id)
+        if filter_:
+            stmt = filter_.sort(filter_.filter(stmt))
+        return stmt.order_by(Event.event_time, Event.id)
+
+    @staticmethod
+    def _row_to_dict(row: Row) -> dict[str, Any]:
+        return {
+            "id": row.id,
+            "name": row.name,
+            "place": {
+                "id": row.place_id,
+                "name": row.place_name,
+                "city": row.city,
+                "address": row.address,
+            },
+            "event_time": row.event_time,
+            "registration_deadline": row.registration_deadline,
+            "status": row.status,
+            "number_of_visitors": row.number_of_visitors,
+        }
+
+    async def get_by_id(
+        self, event_id: UUID, *, load: EventLoad = EventLoad.DETAIL
+    ) -> Event | None:
+        stmt = (
+            select(Event)
+            .options(*EVENT_LOAD_OPTIONS[load])
+            .where(Event.id == event_id)
+        )
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -77,10 +317,66 @@ class EventRepository(BaseRepository, IEventRepository):
         result = await self._session.execute(stmt)
         return result.scalar_one()
 
-    async def upsert(self, json_data_list: list[dict[str, Any]]):
+    async def get_data_version(self) -> str:
+        members_version = (
+            select(
+                case(
+                    (column("is_called"), column("last_value")),
+                    else_=0,
+                )
+            )
+            .select_from(table(MEMBERS_VERSION_SEQ.name))
+            .scalar_subquery()
+        )
+        stmt = select(
+            select(
+                func.concat_ws(
+                    ":",
+                    SyncMeta.last_changed_at,
+                    SyncMeta.last_event_id,
+                    SyncMeta.checkpoint_changed_at,
+                    SyncMeta.checkpoint_event_id,
+                )
+            )
+            .where(SyncMeta.id == 1)
+            .scalar_subquery(),
+            members_version,
+        )
+        sync_version, members_version = (
+            await self._session.execute(stmt)
+        ).one()
+        return f"{sync_version or ''}/{members_version}"
+
+    async def upsert(self, json_data_list: list[dict[str, Any]]) -> UpsertStats:
+        if not json_data_list:
+            return UpsertStats()
         stmt = insert(Event).values(json_data_list)
         stmt = stmt.on_conflict_do_update(
             index_elements=[Event.id],
-            set_={c.key: c for c in stmt.excluded if not c.primary_key},
+            set_={
+                c.key: c
+                for c in stmt.excluded
+                if not c.primary_key and c.key != Event.search_vector.key
+            },
+            where=Event.changed_at.is_distinct_from(stmt.excluded.changed_at),
+        )
+        return await self._execute_upsert(stmt, len(json_data_list), Event.id)
+
+    async def update_search_vectors(
+        self, place_ids: Sequence[UUID], event_ids: Sequence[UUID] = ()
+    ) -> int:
+        if not place_ids and not event_ids:
+            return 0
+        search_vector = get_search_vector(Event.name)
+        stmt = (
+            update(Event)
+            .values(search_vector=search_vector)
+            .where(
+                Event.place_id == Place.id,
+                or_(Place.id.in_(place_ids), Event.id.in_(event_ids)),
+                Event.search_vector.is_distinct_from(search_vector),
+            )
+            .execution_options(synchronize_session=False)
         )
-        await self._session.execute(stmt)
+        result = await self._session.execute(stmt)
+        return result.rowcount
@@ -1,34 +1,159 @@
 """Репозиторий идемпотентности."""
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any, Protocol
 
-from sqlalchemy import delete
+from sqlalchemy import (
+    DateTime,
+    String,
+    column,
+    delete,
+    insert,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
 
-from app.orm.models import Inbox
+from app.config import settings
+from app.orm.models import Inbox, InboxStatus
 from app.orm.repositories.base import BaseRepository
 
+INBOX_LOCK_CLASS = 1
+INBOX_DEFAULT = table(
+    "inbox_default",
+    column("key", String),
+    column("expires_at", DateTime(timezone=True)),
+)
+LOCK_KEYS = text(
+    "SELECT pg_advisory_xact_lock(:lock_class, hashtext(key))"
+    " FROM unnest(CAST(:keys AS text[])) AS key"
+)
+
 
 class IInboxRepository(Protocol):
     """Интерфейс репозитория идемпотентности."""
 
     async def get(self, key: str) -> Inbox | None:
-        """Получить идемпотентность по ключу."""
+        """Получить неистекшую идемпотентность по ключу."""
+
+    async def get_many(self, keys: list[str]) -> dict[str, Inbox]:
+        """Получить неистекшие идемпотентности по ключам.
+
+        Возвращает:
+        - Словарь найденных записей по ключу.
+
+        """
+
+    async def get_keys(self) -> list[str]:
+        """Получить ключи неистекших идемпотентностей."""
 
     def create(
         self, key: str, request_hash: str, response: dict[str, Any]
     ) -> Inbox:
-        """Создать идемпотентность."""
+        """Создать идемпотентность.
+
+        Если ключ уже есть и не истек, запись отклоняется базой данных
+        при сохранении с `IntegrityError`.
+
+        """
+
+    async def reserve(self, reservations: dict[str, str]) -> set[str]:
+        """Зарезервировать ключи для обработки запросов.
+
+        Создает записи в статусе `IN_PROGRESS`; существующие ключи
+        не изменяются, если их запись не истекла. Таблица секционирована,
+        поэтому уникальность ключа обеспечивается не индексом,
+        а блокировками ключей до конца транзакции: их берет этот метод
+        и триггер `inbox_key_guard` при любой вставке в таблицу.
+
+        Аргументы:
+        - `reservations` - Хэши запросов по ключам.
+
+        Возвращает:
+        - Множество зарезервированных ключей.
+
+        """
+
+    async def complete(
+        self, key: str, response: dict[str, Any]
+    ) -> Inbox | None:
+        """Сохранить ответ зарезервированного ключа."""
+
+    async def hold(self, responses: dict[str, dict[str, Any]]) -> int:
+        """Сохранить ответы внешнего API до сохранения результата запроса.
+
+        Записи зарезервированных ключей остаются в статусе `IN_PROGRESS`,
+        но получают ответ и срок действия `inbox_seconds_ttl`. Такие
+        резервирования не снимаются `release`, а повторный запрос
+        с тем же ключом завершает сохранение с этим ответом вместо
+        повторного вызова внешнего API.
+
+        Аргументы:
+        - `responses` - Ответы внешнего API по ключам.
+
+        Возвращает:
+        - Количество записей, получивших ответ.
+
+        """
+
+    async def release(self, keys: list[str]) -> int:
+        """Снять резервирование ключей, запросы которых не выполнены.
+
+        Резервирования с ответом внешнего API, сохраненным `hold`,
+        не снимаются.
+
+        """
+
+    async def delete_expired(self, limit: int | None = None) -> int:
+        """Удалить истекшие ключи из секции по умолчанию.
+
+        В секцию по умолчанию попадают ключи, для срока истечения
+        которых не создана секция. Истекшие ключи остальных секций
+        удаляются вместе с секцией.
+
+        Аргументы:
+        - `limit` - Максимальное количество удаляемых ключей;
+            по умолчанию без ограничения. Строки, заблокированные
+            другими транзакциями, пропускаются.
 
-    async def delete_expired(self) -> int:
-        """Удалить истекшие ключи."""
+        Возвращает:
+        - Количество удаленных ключей.
+
+        """
 
 
 class InboxRepository(BaseRepository, IInboxRepository):
     """Репозиторий идемпотентности."""
 
     async def get(self, key: str) -> Inbox | None:
-        return await self._session.get(Inbox, key)
+        stmt = (
+            select(Inbox)
+            .where(Inbox.key == key, Inbox.expires_at > datetime.now(UTC))
+            .order_by(Inbox.expires_at.desc())
+            .limit(1)
+        )
+        result = await self._session.scalars(stmt)
+        return result.first()
+
+    async def get_many(self, keys: list[str]) -> dict[str, Inbox]:
+        stmt = (
+            select(Inbox)
+            .where(Inbox.key.in_(keys), Inbox.expires_at > datetime.now(UTC))
+            .order_by(Inbox.expires_at)
+        )
+        result = await self._session.execute(stmt)
+        return {inbox.key: inbox for inbox in result.scalars()}
+
+    async def get_keys(self) -> list[str]:
+        stmt = (
+            select(Inbox.key)
+            .where(Inbox.expires_at > datetime.now(UTC))
+            .distinct()
+        )
+        result = await self._session.scalars(stmt)
+        return list(result)
 
     def create(
         self, key: str, request_hash: str, response: dict[str, Any]
@@ -41,7 +166,103 @@ class InboxRepository(BaseRepository, IInboxRepository):
         self._session.add(inbox)
         return inbox
 
-    async def delete_expired(self) -> int:
-        stmt = delete(Inbox).where(Inbox.expires_at <= datetime.now(UTC))
+    async def reserve(self, reservations: dict[str, str]) -> set[str]:
+        keys = sorted(reservations)
+        await self._session.execute(
+            LOCK_KEYS, {"lock_class": INBOX_LOCK_CLASS, "keys": keys}
+        )
+
+        now = datetime.now(UTC)
+        await self._session.execute(
+            delete(Inbox).where(Inbox.key.in_(keys), Inbox.expires_at <= now)
+        )
+        existing = set(
+            await self._session.scalars(
+                select(Inbox.key).where(Inbox.key.in_(keys))
+            )
+        )
+        if not (new_keys := [key for key in keys if key not in existing]):
+            return set()
+
+        expires_at = now + timedelta(
+            seconds=settings.inbox_reservation_seconds_ttl
+        )
+        await self._session.execute(
+            insert(Inbox).values(
+                [
+                    {
+                        "key": key,
+                        "request_hash": reservations[key],
+                        "status": InboxStatus.IN_PROGRESS,
+                        "expires_at": expires_at,
+                    }
+                    for key in new_keys
+                ]
+            )
+        )
+        return set(new_keys)
+
+    async def complete(
+        self, key: str, response: dict[str, Any]
+    ) -> Inbox | None:
+        stmt = (
+            update(Inbox)
+            .where(Inbox.key == key)
+            .values(
+                response=response,
+                status=InboxStatus.COMPLETED,
+                expires_at=(
+                    datetime.now(UTC)
+                    + timedelta(seconds=settings.inbox_seconds_ttl)
+                ),
+            )
+            .returning(Inbox)
+        )
+        result = await self._session.scalars(stmt)
+        return result.one_or_none()
+
+    async def hold(self, responses: dict[str, dict[str, Any]]) -> int:
+        expires_at = datetime.now(UTC) + timedelta(
+            seconds=settings.inbox_seconds_ttl
+        )
+        held = 0
+        for key, response in responses.items():
+            result = await self._session.execute(
+                update(Inbox)
+                .where(
+                    Inbox.key == key,
+                    Inbox.status == InboxStatus.IN_PROGRESS,
+                )
+                .values(response=response, expires_at=expires_at)
+            )
+            held += result.rowcount
+        return held
+
+    async def release(self, keys: list[str]) -> int:
+        stmt = delete(Inbox).where(
+            Inbox.key.in_(keys),
+            Inbox.status == InboxStatus.IN_PROGRESS,
+            Inbox.response.is_(None),
+        )
+        result = await self._session.execute(stmt)
+        return result.rowcount
+
+    async def delete_expired(self, limit: int | None = None) -> int:
+        expired = INBOX_DEFAULT.c.expires_at <= datetime.now(UTC)
+        if limit is None:
+            stmt = delete(INBOX_DEFAULT).where(expired)
+        else:
+            batch = (
+                select(INBOX_DEFAULT.c.key, INBOX_DEFAULT.c.expires_at)
+                .where(expired)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .cte("batch")
+            )
+            stmt = delete(INBOX_DEFAULT).where(
+                tuple_(INBOX_DEFAULT.c.key, INBOX_DEFAULT.c.expires_at).in_(
+                    select(batch.c.key, batch.c.expires_at)
+                )
+            )
         result = await self._session.execute(stmt)
         return result.rowcount
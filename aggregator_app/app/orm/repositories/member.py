@@ -4,9 +4,9 @@ from typing import Any, Protocol
 from uuid import UUID
 
 from sqlalchemy import delete, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, raiseload
 
-from app.orm.models import Member
+from app.orm.models import MEMBERS_VERSION_SEQ, Event, Member
 from app.orm.repositories.base import BaseRepository
 
 
@@ -28,7 +28,8 @@ class IMemberRepository(Protocol):
 
         Аргументы:
         - `ticket_id` - UUID билета.
-        - `load_event` - Флаг подгрузки связанного события.
+        - `load_event` - Флаг подгрузки связанного события;
+            у события загружается только `event_time`.
 
         Возвращает:
         - Участник или None, если не найден.
@@ -38,6 +39,14 @@ class IMemberRepository(Protocol):
     async def delete(self, ticket_id: UUID) -> bool:
         """Удалить участника по ID билета."""
 
+    async def increment_version(self):
+        """Увеличить версию состава участников.
+
+        Вызывается после фиксации изменений участников: значение
+        последовательности меняется сразу, независимо от транзакции.
+
+        """
+
 
 class MemberRepository(BaseRepository, IMemberRepository):
     """Репозиторий участника события.
@@ -56,7 +65,12 @@ class MemberRepository(BaseRepository, IMemberRepository):
     ) -> Member | None:
         stmt = select(Member)
         if load_event:
-            stmt = stmt.options(joinedload(Member.event))
+            stmt = stmt.options(
+                joinedload(Member.event, innerjoin=True).options(
+                    load_only(Event.event_time, raiseload=True),
+                    raiseload(Event.place),
+                )
+            )
         stmt = stmt.where(Member.ticket_id == ticket_id)
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
@@ -65,3 +79,6 @@ class MemberRepository(BaseRepository, IMemberRepository):
         stmt = delete(Member).where(Member.ticket_id == ticket_id)
         result = await self._session.execute(stmt)
         return bool(result.rowcount)
+
+    async def increment_version(self):
+        await self._session.execute(select(MEMBERS_VERSION_SEQ.next_value()))
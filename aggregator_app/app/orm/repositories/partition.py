@@ -0,0 +1,119 @@
+"""Репозиторий секций таблиц."""
+
+import re
+from datetime import datetime
+from typing import Protocol
+
+from sqlalchemy import text
+
+from app.orm.repositories.base import BaseRepository
+
+IDENTIFIER_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+class IPartitionRepository(Protocol):
+    """Интерфейс репозитория секций таблиц.
+
+    Таблица секционирована по диапазонам столбца и имеет секцию
+    по умолчанию `<table>_default` для строк вне созданных секций.
+
+    """
+
+    async def get_partitions(self, table: str) -> list[str]:
+        """Получить имена секций таблицы без секции по умолчанию."""
+
+    async def create_partition(
+        self,
+        table: str,
+        column: str,
+        name: str,
+        start: datetime,
+        end: datetime,
+    ):
+        """Создать секцию для диапазона [`start`, `end`) столбца `column`.
+
+        Строки диапазона, уже попавшие в секцию по умолчанию,
+        переносятся в новую секцию.
+
+        """
+
+    async def is_empty(self, name: str, where: str | None = None) -> bool:
+        """Проверить, что в секции нет строк, подходящих под условие."""
+
+    async def drop_partition(self, name: str):
+        """Удалить секцию вместе с данными."""
+
+
+class PartitionRepository(BaseRepository, IPartitionRepository):
+    """Репозиторий секций таблиц."""
+
+    async def get_partitions(self, table: str) -> list[str]:
+        stmt = text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " WHERE parent.relname = :table"
+            " AND pg_table_is_visible(parent.oid)"
+            " AND child.relname <> :default"
+            " ORDER BY child.relname"
+        )
+        result = await self._session.scalars(
+            stmt, {"table": table, "default": f"{table}_default"}
+        )
+        return list(result)
+
+    async def create_partition(
+        self,
+        table: str,
+        column: str,
+        name: str,
+        start: datetime,
+        end: datetime,
+    ):
+        table, column, name = _identifiers(table, column, name)
+        await self._session.execute(
+            text(
+                f"CREATE TABLE {name}"
+                f" (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await self._session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {table}_default"
+                f" WHERE {column} >= :start AND {column} < :end"
+                " RETURNING *)"
+                f" INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        await self._session.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name}"
+                f" FOR VALUES FROM ('{start.isoformat()}')"
+                f" TO ('{end.isoformat()}')"
+            )
+        )
+
+    async def is_empty(self, name: str, where: str | None = None) -> bool:
+        (name,) = _identifiers(name)
+        stmt = f"SELECT NOT EXISTS (SELECT 1 FROM {name}"
+        if where:
+            stmt += f" WHERE {where}"
+        return await self._session.scalar(text(stmt + ")"))
+
+    async def drop_partition(self, name: str):
+        (name,) = _identifiers(name)
+        await self._session.execute(text(f"DROP TABLE {name}"))
+
+
+def _identifiers(*names: str) -> tuple[str, ...]:
+    """Проверить имена, подставляемые в DDL.
+
+    Исключения:
+    - `ValueError` - если имя не является простым идентификатором.
+
+    """
+    for name in names:
+        if not IDENTIFIER_RE.match(name):
+            raise ValueError(f"Invalid identifier: {name!r}")
+    return names
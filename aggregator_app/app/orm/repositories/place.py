@@ -2,22 +2,27 @@
 
 from typing import Any, Protocol
 
+from sqlalchemy import func, or_
 from sqlalchemy.dialects.postgresql import insert
 
 from app.orm.models import Place
-from app.orm.repositories.base import BaseRepository
+from app.orm.repositories.base import BaseRepository, UpsertStats
 
 
 class IPlaceRepository(Protocol):
     """Интерфейс репозитория мест проведения."""
 
-    async def upsert(self, json_data_list: list[dict[str, Any]]):
+    async def upsert(self, json_data_list: list[dict[str, Any]]) -> UpsertStats:
         """Вставить или обновить записи при конфликте.
 
         Данные должны быть в виде словаря с ключами,
         соответсвующими полям модели `Place`, и приведенными
         к требуемым типам данных значениями.
 
+        Существующая запись обновляется, только если изменилось
+        значение `changed_at` или у нее еще не построен индекс мест
+        (пустое значение или JSON null), а в новых данных он есть.
+
         """
 
 
@@ -28,10 +33,17 @@ class PlaceRepository(BaseRepository, IPlaceRepository):
 
     """
 
-    async def upsert(self, json_data_list: list[dict[str, Any]]):
+    async def upsert(self, json_data_list: list[dict[str, Any]]) -> UpsertStats:
+        if not json_data_list:
+            return UpsertStats()
         stmt = insert(Place).values(json_data_list)
         stmt = stmt.on_conflict_do_update(
             index_elements=[Place.id],
             set_={c.key: c for c in stmt.excluded if not c.primary_key},
+            where=or_(
+                Place.changed_at.is_distinct_from(stmt.excluded.changed_at),
+                func.json_typeof(Place.seats_index).is_distinct_from("object")
+                & (func.json_typeof(stmt.excluded.seats_index) == "object"),
+            ),
         )
-        await self._session.execute(stmt)
+        return await self._execute_upsert(stmt, len(json_data_list), Place.id)
@@ -11,6 +11,10 @@ from app.orm.repositories.event import EventRepository, IEventRepository
 from app.orm.repositories.inbox import IInboxRepository, InboxRepository
 from app.orm.repositories.member import IMemberRepository, MemberRepository
 from app.orm.repositories.outbox import IOutboxRepository, OutboxRepository
+from app.orm.repositories.partition import (
+    IPartitionRepository,
+    PartitionRepository,
+)
 from app.orm.repositories.place import IPlaceRepository, PlaceRepository
 from app.orm.repositories.sync_meta import (
     ISyncMetaRepository,
@@ -27,6 +31,7 @@ class IUnitOfWork(AbstractAsyncContextManager[Self], Protocol):
     sync_meta: ISyncMetaRepository
     outbox: IOutboxRepository
     inbox: IInboxRepository
+    partitions: IPartitionRepository
 
     @asynccontextmanager
     async def begin(self) -> AsyncGenerator[Self, None]:
@@ -61,6 +66,7 @@ class SqlAlchemyUnitOfWork(IUnitOfWork):
         self.sync_meta = SyncMetaRepository(self._session)
         self.outbox = OutboxRepository(self._session)
         self.inbox = InboxRepository(self._session)
+        self.partitions = PartitionRepository(self._session)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -0,0 +1,211 @@
+"""Предохранитель запросов к внешним API."""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum as PyEnum
+from typing import Any
+
+from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
+
+from app.config import settings
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(PyEnum):
+    """Состояние предохранителя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerOpenError(Exception):
+    """Запрос отклонен открытым предохранителем."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit breaker {name!r} is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Предохранитель запросов к одной операции внешнего API.
+
+    В состоянии `CLOSED` пропускает запросы и считает подряд идущие ошибки;
+    после `failure_threshold` ошибок переходит в `OPEN` и сразу отклоняет
+    запросы с `CircuitBreakerOpenError`. Через `recovery_seconds` переходит
+    в `HALF_OPEN` и пропускает не более `half_open_max_calls` пробных
+    запросов одновременно: успех закрывает предохранитель, ошибка снова
+    открывает его.
+
+    Ошибкой считаются таймауты, ошибки соединения и ответы с кодом 5xx;
+    ответы 4xx означают, что внешний API работает. Прочие исключения
+    (отмена, ошибки разбора ответа или базы данных) не говорят
+    о состоянии внешнего API: они лишь освобождают пробный запрос.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_seconds: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_seconds = recovery_seconds
+        self._half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Текущее состояние с учетом истечения времени восстановления."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Выполнить запрос под защитой предохранителя.
+
+        Исключения:
+        - `CircuitBreakerOpenError` - если запрос отклонен.
+
+        """
+        probe = self._acquire()
+        try:
+            yield
+        except BaseException as e:
+            self._release(probe, failed=self._get_failed(e))
+            raise
+        self._release(probe, failed=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Получить состояние для диагностики."""
+        state = self.state
+        retry_in = None
+        if state == CircuitState.OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            retry_in = round(max(self._recovery_seconds - elapsed, 0), 3)
+        return {
+            "name": self.name,
+            "state": state.value,
+            "failures": self._failures,
+            "failure_threshold": self._failure_threshold,
+            "retry_in_seconds": retry_in,
+        }
+
+    def _acquire(self) -> bool:
+        """Проверить, можно ли выполнить запрос.
+
+        Возвращает:
+        - Является ли запрос пробным в состоянии `HALF_OPEN`.
+
+        """
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN
+            and self._half_open_calls >= self._half_open_max_calls
+        ):
+            metrics.increment(f"{self.name}.circuit_rejected")
+            raise CircuitBreakerOpenError(self.name)
+        if state == CircuitState.HALF_OPEN:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def _release(self, probe: bool, *, failed: bool | None):
+        """Учесть результат запроса.
+
+        При `failed=None` результат неизвестен: освобождается только
+        место пробного запроса, состояние и счетчик ошибок не меняются.
+
+        """
+        if probe:
+            self._half_open_calls = max(self._half_open_calls - 1, 0)
+        if failed is None:
+            return
+        if not failed:
+            if self._state != CircuitState.CLOSED:
+                logger.info("Предохранитель %s закрыт", self.name)
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            return
+
+        self._failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                metrics.increment(f"{self.name}.circuit_opened")
+                logger.warning(
+                    "Предохранитель %s открыт после %d ошибок",
+                    self.name,
+                    self._failures,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    @staticmethod
+    def _get_failed(e: BaseException) -> bool | None:
+        """Проверить, говорит ли ошибка о неработоспособности внешнего API.
+
+        Возвращает:
+        - None, если ошибка не связана с ответом внешнего API.
+
+        """
+        if isinstance(e, ClientResponseError):
+            return e.status >= 500
+        if isinstance(e, TimeoutError | ClientConnectionError):
+            return True
+        return None
+
+
+class CircuitBreakerRegistry:
+    """Реестр предохранителей по имени операции.
+
+    Предохранители создаются при первом обращении с порогами из настроек.
+
+    """
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Получить предохранитель операции, например `notification.notify`."""
+        if (breaker := self._breakers.get(name)) is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=settings.circuit_breaker_failure_threshold,
+                recovery_seconds=settings.circuit_breaker_recovery_seconds,
+                half_open_max_calls=(
+                    settings.circuit_breaker_half_open_max_calls
+                ),
+            )
+        return breaker
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Получить состояния всех предохранителей."""
+        return [
+            self._breakers[name].to_dict() for name in sorted(self._breakers)
+        ]
+
+    def reset(self):
+        """Удалить все предохранители."""
+        self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -1,16 +1,61 @@
 """Сервис событий."""
 
+import hashlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Self
 from uuid import UUID
 
-from cashews import cache
+from cashews import NOT_NONE, cache
 from fastapi import HTTPException, status
 from fastapi_filter.contrib.sqlalchemy import Filter
 
-from app.orm.models import Event
+from app.config import settings
+from app.orm.models import Event, EventStatus
+from app.orm.repositories.event import EventLoad
 from app.orm.uow import IUnitOfWork
+from app.services.circuit_breaker import (
+    CircuitBreakerOpenError,
+    circuit_breakers,
+)
 from app.services.events_provider import IEventsProviderClient
+from app.services.seats import SeatsIndex
 from app.services.utils import with_external_client
 
+EVENT_VALIDATION_CACHE_PREFIX = "event_validation"
+EVENTS_DATA_VERSION_CACHE_KEY = "events_data_version"
+
+
+@dataclass(frozen=True, slots=True)
+class EventValidationData:
+    """Данные события для проверки регистрации.
+
+    Содержит только поля, которые меняются исключительно при синхронизации,
+    поэтому может храниться в локальном кэше до следующей синхронизации.
+
+    Атрибуты:
+    - `status`: `EventStatus` - Статус события.
+    - `event_time`: datetime - Время начала события.
+    - `registration_deadline`: datetime - Время окончания регистрации.
+    - `seats_index`: `SeatsIndex` | None - Индекс посадочных мест.
+
+    """
+
+    status: EventStatus
+    event_time: datetime
+    registration_deadline: datetime
+    seats_index: SeatsIndex | None
+
+    @classmethod
+    def from_event(cls, event: Event) -> Self:
+        return cls(
+            status=event.status,
+            event_time=event.event_time,
+            registration_deadline=event.registration_deadline,
+            seats_index=SeatsIndex.from_place(event.place),
+        )
+
 
 class EventsService:
     """Сервис событий."""
@@ -42,10 +87,96 @@ class EventsService:
             count = await uow.events.get_count(filter_)
         return events, count
 
-    async def get_by_id(self, event_id: UUID) -> Event | None:
-        """Получить событие по ID."""
+    async def get_paginated_rows(
+        self, filter_: Filter, page: int, page_size: int | None
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Получить пагинированные события в виде словарей и общее количество.
+
+        Аргументы те же, что у `get_paginated`.
+
+        """
+        async with self._uow as uow:
+            rows = await uow.events.get_paginated_rows(page, page_size, filter_)
+            count = await uow.events.get_count(filter_)
+        return rows, count
+
+    async def export_rows(
+        self, filter_: Filter
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Выгрузить все события в виде словарей пачками.
+
+        Сессия базы данных открыта, пока выгрузка не закончится.
+        Размер пачки задается настройкой `events_export_batch_size`.
+
+        """
         async with self._uow as uow:
-            return await uow.events.get_by_id(event_id)
+            async for rows in uow.events.stream_rows(
+                settings.events_export_batch_size, filter_
+            ):
+                yield rows
+
+    async def get_by_id(
+        self, event_id: UUID, *, load: EventLoad = EventLoad.DETAIL
+    ) -> Event | None:
+        """Получить событие по ID.
+
+        Аргументы:
+        - `event_id` - UUID события.
+        - `load` - Набор загружаемых полей; по умолчанию `EventLoad.DETAIL`.
+
+        """
+        async with self._uow as uow:
+            return await uow.events.get_by_id(event_id, load=load)
+
+    @cache(
+        ttl="1h",
+        key=EVENT_VALIDATION_CACHE_PREFIX + ":{event_id}",
+        condition=NOT_NONE,
+    )
+    async def get_validation_data(
+        self, event_id: UUID
+    ) -> EventValidationData | None:
+        """Получить данные события для проверки регистрации.
+
+        Ответ кешируется в памяти процесса по ключу
+        `event_validation:{event_id}` до следующей синхронизации
+        (см. `invalidate_validation_cache`), но не дольше часа.
+        Отсутствующие события не кешируются.
+
+        """
+        event = await self.get_by_id(event_id, load=EventLoad.VALIDATION)
+        if event is None:
+            return None
+        return EventValidationData.from_event(event)
+
+    @staticmethod
+    async def invalidate_validation_cache():
+        """Сбросить кэш данных событий для проверки регистрации."""
+        await cache.delete_match(EVENT_VALIDATION_CACHE_PREFIX + ":*")
+
+    @cache(
+        ttl=settings.events_data_version_seconds_ttl,
+        key=EVENTS_DATA_VERSION_CACHE_KEY,
+    )
+    async def get_etag(self) -> str:
+        """Получить слабый ETag ответов API событий.
+
+        ETag строится по версии данных событий и одинаков для списка
+        и отдельных событий. Версия кешируется в памяти процесса
+        на `events_data_version_seconds_ttl` секунд и сбрасывается
+        после изменений этого процесса (см. `invalidate_etag`),
+        поэтому повторные запросы проверяются без обращения к базе.
+
+        """
+        async with self._uow as uow:
+            version = await uow.events.get_data_version()
+        digest = hashlib.blake2b(version.encode(), digest_size=8).hexdigest()
+        return f'W/"{digest}"'
+
+    @staticmethod
+    async def invalidate_etag():
+        """Сбросить кэш версии данных событий."""
+        await cache.delete(EVENTS_DATA_VERSION_CACHE_KEY)
 
     @cache(ttl="30s", key="event_seats:{event_id}")
     async def get_seats(self, event_id: UUID) -> list[str]:
@@ -59,6 +190,7 @@ class EventsService:
             self._fetch_seats,
             func_kwargs={"event_id": event_id},
             on_error=self._raise_server_error,
+            circuit_breaker=circuit_breakers.get("events_provider.get_seats"),
         )
 
     async def _fetch_seats(
@@ -68,6 +200,16 @@ class EventsService:
         result = await client.get_seats(event_id)
         return result["seats"]
 
-    async def _raise_server_error(self, _: Exception):
-        """Вызвать ошибку сервера."""
+    async def _raise_server_error(self, e: Exception):
+        """Вызвать ошибку сервера.
+
+        Пока предохранитель внешнего API открыт - HTTP 503,
+        в остальных случаях - HTTP 500.
+
+        """
+        if isinstance(e, CircuitBreakerOpenError):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="External API is unavailable",
+            )
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
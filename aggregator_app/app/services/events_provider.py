@@ -1,17 +1,29 @@
 """Модуль взаимодействия с EventsProviderAPI."""
 
+import functools
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import UTC, date, datetime
-from typing import Any, Protocol
+from typing import Annotated, Any, Protocol, TypedDict
 from uuid import UUID
 
-import backoff
 from aiohttp import ClientSession, ClientTimeout
-from aiohttp.client_exceptions import ClientConnectionError
-from sqlalchemy import DateTime
+from pydantic import (
+    AwareDatetime,
+    StringConstraints,
+    TypeAdapter,
+    ValidationError,
+)
 
 from app.config import settings
-from app.orm.models import Base, Event, EventStatus, Place
-from app.services.utils import IExternalClient
+from app.orm.models import EventStatus
+from app.services.json_codec import json_codec
+from app.services.metrics import metrics
+from app.services.seats import SeatsIndex
+from app.services.utils import IExternalClient, RateLimiter, with_budget
+
+logger = logging.getLogger(__name__)
 
 
 class IEventsProviderClient(IExternalClient, Protocol):
@@ -20,7 +32,7 @@ class IEventsProviderClient(IExternalClient, Protocol):
     async def get_events(
         self, changed_at: date, cursor: str | None = None
     ) -> dict[str, Any]:
-        """Получить события.
+        """Получить страницу событий, провалидированную `validate_events_page`.
 
         Аргументы:
         - `changed_at` - Дата последнего изменения в ISO формате.
@@ -59,15 +71,12 @@ class EventsProviderClient(IEventsProviderClient):
 
     """
 
-    _BACKOFF_ON_EXCEPTION = backoff.on_exception(
-        backoff.expo,
-        (TimeoutError, ClientConnectionError),
-        max_tries=3,
-    )
-
     def __init__(self, total_timeout: int = 60, connect_timeout: int = 15):
         """Инициализировать клиент.
 
+        Время отдельных операций дополнительно ограничено бюджетами
+        из настроек (см. `with_budget`).
+
         Аргументы:
         - `total_timeout` - Максимальное время ожидания всего запроса;
             по умолчанию 60 секунд.
@@ -80,7 +89,11 @@ class EventsProviderClient(IEventsProviderClient):
         )
         self._session: ClientSession | None = None
 
-    @_BACKOFF_ON_EXCEPTION
+    @with_budget(
+        "events_provider.get_events",
+        timeout=settings.events_provider_sync_page_seconds_timeout,
+        deadline=settings.events_provider_sync_page_seconds_deadline,
+    )
     async def get_events(
         self, changed_at: date, cursor: str | None = None
     ) -> dict[str, Any]:
@@ -88,23 +101,35 @@ class EventsProviderClient(IEventsProviderClient):
         if cursor:
             url += f"&cursor={cursor}"
         async with self._session.get(url) as response:
-            return await response.json()
+            return validate_events_page(await response.read())
 
-    @_BACKOFF_ON_EXCEPTION
+    @with_budget(
+        "events_provider.get_seats",
+        timeout=settings.events_provider_seats_seconds_timeout,
+        deadline=settings.external_request_seconds_deadline,
+    )
     async def get_seats(self, event_id: UUID) -> dict[str, Any]:
         url = f"/api/events/{event_id}/seats/"
         async with self._session.get(url) as response:
-            return await response.json()
+            return await response.json(loads=json_codec.loads)
 
-    @_BACKOFF_ON_EXCEPTION
+    @with_budget(
+        "events_provider.register_member",
+        timeout=settings.events_provider_register_seconds_timeout,
+        deadline=settings.external_request_seconds_deadline,
+    )
     async def register_member(
         self, event_id: UUID, member_data: dict[str, Any]
     ) -> dict[str, Any]:
         url = f"/api/events/{event_id}/register/"
         async with self._session.post(url, json=member_data) as response:
-            return await response.json()
+            return await response.json(loads=json_codec.loads)
 
-    @_BACKOFF_ON_EXCEPTION
+    @with_budget(
+        "events_provider.unregister_member",
+        timeout=settings.events_provider_register_seconds_timeout,
+        deadline=settings.external_request_seconds_deadline,
+    )
     async def unregister_member(
         self, event_id: UUID, ticket_id: UUID
     ) -> dict[str, Any]:
@@ -112,13 +137,14 @@ class EventsProviderClient(IEventsProviderClient):
         async with self._session.delete(
             url, json={"ticket_id": str(ticket_id)}
         ) as response:
-            return await response.json()
+            return await response.json(loads=json_codec.loads)
 
     async def __aenter__(self):
         self._session = ClientSession(
             settings.events_provider_base_url,
             headers={"x-api-key": settings.lms_api_key.get_secret_value()},
             timeout=self._timeout,
+            json_serialize=json_codec.dumps_str,
             raise_for_status=True,
         )
         return self
@@ -142,38 +168,75 @@ class EventsPaginator:
     """
 
     def __call__(
-        self, client: IEventsProviderClient, changed_at: date
+        self,
+        client: IEventsProviderClient,
+        changed_at: date,
+        cursor: str | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> "EventsPaginator":
         """Установить параметры пагинатора.
 
         Аргументы:
         - `client`: `IEventsProviderClient` - Клиент для взаимодействия.
         - `changed_at` - Дата последнего изменения в ISO формате.
+        - `cursor` - Курсор страницы, с которой начать; по умолчанию None.
+        - `rate_limiter` - Ограничитель частоты запросов страниц,
+            общий для нескольких пагинаторов; по умолчанию None.
 
         """
         self._client = client
         self._changed_at = changed_at
-        self._cursor = None
+        self._cursor = cursor
+        self._rate_limiter = rate_limiter
         self._events = []
         self._current = 0
+        self._quarantined_changed_at = None
 
         return self
 
+    @property
+    def cursor(self) -> str | None:
+        """Курсор следующей страницы."""
+        return self._cursor
+
+    @property
+    def quarantined_changed_at(self) -> datetime | None:
+        """Самое раннее время изменения событий в карантине.
+
+        Учитываются события всех полученных страниц.
+
+        """
+        return self._quarantined_changed_at
+
+    @property
+    def page_consumed(self) -> bool:
+        """Получены ли все события текущей страницы."""
+        return self._current >= len(self._events)
+
     def __aiter__(self):
         """Получить итератор событий."""
         return self
 
     async def __anext__(self) -> dict[str, Any]:
         """Получить следующее событие."""
-        end_status = self._current >= len(self._events)
+        end_status = self.page_consumed
         if self._cursor is None and end_status and self._current:
             raise StopAsyncIteration
         if end_status:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.wait()
             response = await self._client.get_events(
                 self._changed_at, self._cursor
             )
             self._cursor = self._client.extract_cursor(response)
             self._events = response["results"]
+            if (
+                changed_at := response.get("quarantined_changed_at")
+            ) is not None and (
+                self._quarantined_changed_at is None
+                or changed_at < self._quarantined_changed_at
+            ):
+                self._quarantined_changed_at = changed_at
             if not self._events:
                 raise StopAsyncIteration
             self._current = 0
@@ -182,14 +245,197 @@ class EventsPaginator:
         return event
 
 
+UUID_PATTERN = (
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}"
+    r"-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+ProviderId = Annotated[str, StringConstraints(pattern=UUID_PATTERN)]
+ProviderString = Annotated[str, StringConstraints(max_length=128)]
+
+
+class ProviderPlace(TypedDict):
+    """Место проведения в ответе EventsProvider API."""
+
+    id: ProviderId
+    name: ProviderString
+    city: ProviderString
+    address: ProviderString
+    seats_pattern: ProviderString
+    changed_at: AwareDatetime
+    created_at: AwareDatetime
+
+
+class ProviderEvent(TypedDict):
+    """Событие в ответе EventsProvider API.
+
+    Поля, которых нет в схеме, например `number_of_visitors`,
+    при валидации отбрасываются.
+
+    """
+
+    id: ProviderId
+    name: ProviderString
+    place: ProviderPlace
+    status: str
+    event_time: AwareDatetime
+    registration_deadline: AwareDatetime
+    changed_at: AwareDatetime
+    created_at: AwareDatetime
+    status_changed_at: AwareDatetime
+
+
+class ProviderEventsPage(TypedDict):
+    """Страница событий EventsProvider API."""
+
+    next: str | None
+    results: list[ProviderEvent]
+
+
+EVENT_ADAPTER = TypeAdapter(ProviderEvent)
+EVENTS_PAGE_ADAPTER = TypeAdapter(ProviderEventsPage)
+EVENT_STATUSES = {status.value: status for status in EventStatus}
+
+
+@dataclass(frozen=True, slots=True)
+class QuarantinedEvent:
+    """Событие, не прошедшее валидацию.
+
+    Атрибуты:
+    - `event_id` - ID события, если его удалось извлечь.
+    - `reasons` - Ошибки валидации в виде `<поле>: <сообщение>`.
+    - `data` - Исходные данные события.
+    - `quarantined_at` - Время помещения в карантин.
+
+    """
+
+    event_id: Any
+    reasons: list[str]
+    data: Any
+    quarantined_at: datetime
+
+
+class EventQuarantine:
+    """Карантин невалидных событий EventsProvider API.
+
+    Хранит последние `size` невалидных событий для диагностики,
+    вместо того чтобы прерывать синхронизацию.
+
+    """
+
+    def __init__(self, size: int):
+        self._events: deque[QuarantinedEvent] = deque(maxlen=size)
+
+    def add(self, data: Any, error: ValidationError):
+        """Поместить событие в карантин."""
+        event_id = data.get("id") if isinstance(data, dict) else None
+        reasons = [
+            f"{'.'.join(map(str, e['loc'])) or '<root>'}: {e['msg']}"
+            for e in error.errors(include_url=False)
+        ]
+        self._events.append(
+            QuarantinedEvent(event_id, reasons, data, datetime.now(UTC))
+        )
+        metrics.increment("events_provider.get_events.quarantined")
+        logger.warning(
+            "Событие %s помещено в карантин: %s", event_id, "; ".join(reasons)
+        )
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Получить события в карантине, начиная с последнего."""
+        return [asdict(event) for event in reversed(self._events)]
+
+    def reset(self):
+        """Очистить карантин."""
+        self._events.clear()
+
+
+event_quarantine = EventQuarantine(settings.events_quarantine_size)
+
+
+def validate_events_page(page: bytes | dict[str, Any]) -> dict[str, Any]:
+    """Провалидировать страницу событий.
+
+    Ответ в байтах разбирается и валидируется схемой
+    `ProviderEventsPage` за один проход. Если в странице есть
+    невалидные события, она проверяется по событиям: невалидные
+    помещаются в `event_quarantine` и исключаются из результатов,
+    а самое раннее время их изменения возвращается
+    в `quarantined_changed_at`, чтобы синхронизация не сдвигала
+    водяной знак дальше него.
+
+    Исключения:
+    - `KeyError` - если в странице нет `next` или `results`.
+
+    """
+    if isinstance(page, bytes):
+        try:
+            return EVENTS_PAGE_ADAPTER.validate_json(page)
+        except ValidationError:
+            page = json_codec.loads(page)
+
+    results = []
+    quarantined_changed_at = None
+    for data in page["results"]:
+        try:
+            results.append(EVENT_ADAPTER.validate_python(data))
+        except ValidationError as e:
+            event_quarantine.add(data, e)
+            changed_at = _get_raw_changed_at(data)
+            if changed_at is not None and (
+                quarantined_changed_at is None
+                or changed_at < quarantined_changed_at
+            ):
+                quarantined_changed_at = changed_at
+    return {
+        "next": page["next"],
+        "results": results,
+        "quarantined_changed_at": quarantined_changed_at,
+    }
+
+
+def _get_raw_changed_at(data: Any) -> datetime | None:
+    """Получить время изменения невалидного события, если оно разбирается.
+
+    Время без часового пояса считается временем в UTC.
+
+    """
+    try:
+        changed_at = datetime.fromisoformat(data["changed_at"])
+    except (TypeError, KeyError, ValueError):
+        return None
+    if changed_at.tzinfo is None:
+        return changed_at.replace(tzinfo=UTC)
+    return changed_at
+
+
+@functools.lru_cache(maxsize=1024)
+def build_seats_index(pattern: str) -> dict[str, list[list[int]]] | None:
+    """Построить JSON-представление индекса мест по шаблону.
+
+    Одни и те же места проведения повторяются во многих событиях,
+    поэтому индексы кэшируются по шаблону. Возвращает None,
+    если шаблон не разбирается.
+
+    """
+    try:
+        return SeatsIndex.from_pattern(pattern).to_json()
+    except ValueError:
+        return None
+
+
 class EventsProviderParser:
     """Парсер данных EventsProviderAPI."""
 
     def parse_event_dict(
-        self, data: dict[str, Any]
+        self, data: ProviderEvent
     ) -> tuple[dict[str, Any], dict[str, Any]]:
         """Разобрать событие и вернуть словари с преобразованными данными.
 
+        Событие должно быть провалидировано `validate_events_page`,
+        поэтому даты уже разобраны. Словарь события изменяется на месте
+        и возвращается без места проведения, но с `place_id`.
+
         Аргументы:
         - `data` - Словарь с данными события и места проведения.
 
@@ -199,26 +445,23 @@ class EventsProviderParser:
         """
         place_data = data.pop("place")
         self._prepare_place(place_data)
-        self._prepare_event(data)
-        return data | {"place_id": place_data["id"]}, place_data
-
-    def _prepare_event(self, event_data: dict[str, Any]):
-        """Подготовить данные события."""
-        del event_data["number_of_visitors"]
-        try:
-            event_data["status"] = EventStatus(event_data["status"])
-        except ValueError:
-            event_data["status"] = EventStatus.OTHER
-        self._convert_datetime(event_data, Event)
+        data["status"] = EVENT_STATUSES.get(data["status"], EventStatus.OTHER)
+        data["place_id"] = place_data["id"]
+        return data, place_data
 
     def _prepare_place(self, place_data: dict[str, Any]):
-        """Подготовить данные места проведения."""
-        self._convert_datetime(place_data, Place)
-
-    def _convert_datetime(self, data: dict[str, Any], cls_: type[Base]):
-        """Конвертировать даты в UTC."""
-        for c in cls_.__table__.c:
-            if isinstance(c.type, DateTime) and c.key in data:
-                data[c.key] = datetime.fromisoformat(data[c.key]).astimezone(
-                    UTC
-                )
+        """Подготовить данные места проведения.
+
+        Строит индекс посадочных мест по `seats_pattern`; если шаблон
+        не разбирается, индекс не сохраняется и места проверяются
+        только через внешний API.
+
+        """
+        seats_index = build_seats_index(place_data["seats_pattern"])
+        if seats_index is None:
+            logger.warning(
+                "Не удалось разобрать шаблон мест %r места проведения %s",
+                place_data["seats_pattern"],
+                place_data["id"],
+            )
+        place_data["seats_index"] = seats_index
@@ -1,17 +1,22 @@
 """Сервис идемпотентности."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from fastapi import HTTPException, status
 
 from app.config import settings
 from app.orm.db_manager import db_manager
-from app.orm.models import Inbox
+from app.orm.models import Inbox, InboxStatus
 from app.orm.uow import IUnitOfWork, SqlAlchemyUnitOfWork
-from app.services.utils import hash_dict, scheduler
+from app.services.inbox_cache import inbox_cache
+from app.services.utils import scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +36,12 @@ class InboxService:
         self._scheduler = scheduler
 
     async def init_jobs(self):
-        """Инициализировать задачу идемпотентности."""
+        """Инициализировать задачу идемпотентности.
+
+        Если включен фильтр Блума ключей, заполняет его из базы данных.
+
+        """
+        await self.rebuild_bloom_filter()
         logger.info("Инициализация задачи обработки истекших ключей")
 
         self._scheduler.add_job(
@@ -45,26 +55,157 @@ class InboxService:
         logger.info("Задача обработки истекших ключей добавлена в планировщик")
 
     async def process_expired(self):
-        """Обработать истекшие ключи."""
+        """Обработать истекшие ключи секции inbox по умолчанию.
+
+        Ключи остальных секций удаляются вместе с секцией сервисом
+        обслуживания секций; в секцию по умолчанию попадают только ключи,
+        для срока истечения которых секция еще не создана.
+
+        Удаляет ключи пачками по `inbox_expire_batch_size`, фиксируя
+        каждую пачку отдельной транзакцией и делая паузу
+        `inbox_expire_batch_seconds_pause` между пачками, чтобы
+        не держать долгих блокировок. Если ключи удалены, перестраивает
+        фильтр Блума ключей, чтобы удаленные ключи не давали
+        ложных срабатываний.
+
+        """
         logger.info("Обработка истекших ключей")
 
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deleted_count = 0
+        while True:
+            async with self._uow as uow:
+                deleted = await uow.inbox.delete_expired(
+                    limit=settings.inbox_expire_batch_size
+                )
+                await uow.commit()
+            deleted_count += deleted
+            if deleted < settings.inbox_expire_batch_size:
+                break
+            await asyncio.sleep(settings.inbox_expire_batch_seconds_pause)
+
+        elapsed = loop.time() - started
+        logger.info(
+            "Удалено %d ключей за %.2f с (%.0f ключей/с)",
+            deleted_count,
+            elapsed,
+            deleted_count / elapsed if elapsed else 0,
+        )
+        if deleted_count:
+            await self.rebuild_bloom_filter()
+
+    async def rebuild_bloom_filter(self):
+        """Заполнить фильтр Блума ключами inbox из базы данных."""
+        if not inbox_cache.bloom_filter_enabled:
+            return
+
+        inbox_cache.start_rebuild()
+        try:
+            async with self._uow as uow:
+                keys = await uow.inbox.get_keys()
+        except Exception:
+            inbox_cache.cancel_rebuild()
+            raise
+        inbox_cache.finish_rebuild(keys)
+        logger.info("Фильтр Блума заполнен %d ключами", len(keys))
+
+    async def get_inbox(self, key: str) -> Inbox | None:
+        """Получить запись inbox по ключу.
+
+        Сначала проверяет кэш в памяти, затем фильтр Блума ключей:
+        база данных запрашивается, только если ключ может в ней быть.
+
+        """
+        if (inbox := inbox_cache.get(key)) is not None:
+            return inbox
+        if not inbox_cache.might_exist(key):
+            return None
+
+        async with self._uow as uow:
+            inbox = await uow.inbox.get(key)
+        if inbox is not None and inbox.status == InboxStatus.COMPLETED:
+            inbox_cache.add(inbox)
+        return inbox
+
+    async def acquire(self, key: str, request_hash: str) -> Inbox | None:
+        """Зарезервировать ключ или получить результат запроса с этим ключом.
+
+        Если ключ уже зарезервирован запросом с тем же хэшем, ждет
+        его завершения не дольше `inbox_wait_seconds_timeout`,
+        проверяя запись каждые `inbox_wait_seconds_interval` секунд.
+        Запись читается из базы данных в обход фильтра Блума: ключ
+        мог зарезервировать другой экземпляр приложения. Если первый
+        запрос снял резервирование, пробует зарезервировать ключ снова.
+
+        Возвращает:
+        - None, если ключ зарезервирован для текущего запроса.
+        - Запись inbox: завершенную, с другим хэшем запроса,
+            с сохраненным билетом или все еще обрабатываемую
+            после истечения ожидания.
+
+        Исключения:
+        - `HTTPException` - 409, если за время ожидания не удалось
+            ни зарезервировать ключ, ни прочитать его запись.
+
+        """
+        if (inbox := inbox_cache.get(key)) is not None:
+            return inbox
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.inbox_wait_seconds_timeout
+        while not await self._reserve(key, request_hash):
+            async with self._uow as uow:
+                inbox = await uow.inbox.get(key)
+            if inbox is not None and (
+                inbox.status == InboxStatus.COMPLETED
+                or inbox.request_hash != request_hash
+                or inbox.response is not None
+            ):
+                if inbox.status == InboxStatus.COMPLETED:
+                    inbox_cache.add(inbox)
+                return inbox
+            if loop.time() >= deadline:
+                if inbox is not None:
+                    return inbox
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Request with this idempotency key is in progress",
+                )
+            await asyncio.sleep(settings.inbox_wait_seconds_interval)
+        return None
+
+    async def _reserve(self, key: str, request_hash: str) -> bool:
+        """Зарезервировать ключ отдельной транзакцией."""
         async with self._uow as uow:
-            deleted_count = await uow.inbox.delete_expired()
+            reserved = await uow.inbox.reserve({key: request_hash})
             await uow.commit()
+        if reserved:
+            inbox_cache.add_key(key)
+        return bool(reserved)
 
-        logger.info("Удалено %d ключей", deleted_count)
-
-    async def get_inbox(self, key: str) -> Inbox | None:
-        """Получить запись inbox по ключу."""
+    async def release(self, keys: list[str]):
+        """Снять резервирование ключей."""
         async with self._uow as uow:
-            return await uow.inbox.get(key)
-
-    def check_conflict(
-        self, request_hash: str | None, data: dict[str, Any]
-    ) -> tuple[str, bool]:
-        """Проверить конфликт request_hash и хэша данных data."""
-        hashed = hash_dict(data)
-        return hashed, hashed != request_hash
+            await uow.inbox.release(keys)
+            await uow.commit()
+
+    @asynccontextmanager
+    async def release_on_error(
+        self, idempotency_data: dict[str, Any] | None
+    ) -> AsyncIterator[None]:
+        """Снять резервирование ключа, если проверка запроса не удалась.
+
+        Оборачивает только проверки до обращения к внешнему API:
+        повторный запрос с тем же ключом сможет выполниться заново.
+
+        """
+        try:
+            yield
+        except BaseException:
+            if idempotency_data and "key" in idempotency_data:
+                await self.release([idempotency_data["key"]])
+            raise
 
 
 def get_inbox_service() -> InboxService:
@@ -0,0 +1,163 @@
+"""Кэш ключей идемпотентности в памяти процесса."""
+
+import hashlib
+import math
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from app.config import settings
+from app.orm.models import Inbox
+from app.services.metrics import metrics
+
+
+class BloomFilter:
+    """Фильтр Блума для строковых ключей.
+
+    Может ошибочно сообщить, что ключ есть (с вероятностью около
+    `error_rate` при `capacity` ключах), но никогда не ошибается
+    в обратную сторону. Удаление ключей не поддерживается.
+
+    """
+
+    __slots__ = ("_bits", "_size", "_hashes")
+
+    def __init__(self, capacity: int, error_rate: float):
+        self._size = max(
+            int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self._hashes = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, key: str):
+        """Добавить ключ."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def _positions(self, key: str) -> Iterable[int]:
+        """Получить номера битов ключа двойным хэшированием."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hashes))
+
+
+class InboxCache:
+    """Кэш записей inbox перед базой данных.
+
+    Хранит не более `size` последних записей (LRU) до их `expires_at`,
+    поэтому повторные запросы клиента отвечаются без обращения к базе.
+
+    Если включен фильтр Блума, он содержит все ключи таблицы inbox:
+    заполняется из базы методами `start_rebuild` / `finish_rebuild`
+    и пополняется при каждом создании записи. До первого заполнения
+    фильтр не используется. Ключ, которого нет в фильтре, гарантированно
+    новый, и запрос в базу не нужен. Фильтр знает только о записях,
+    созданных этим процессом, поэтому предполагает одну реплику приложения.
+
+    """
+
+    def __init__(
+        self,
+        size: int,
+        bloom_filter_capacity: int | None = None,
+        bloom_filter_error_rate: float = 0.01,
+    ):
+        self._size = size
+        self._entries: OrderedDict[str, tuple[Inbox, datetime]] = OrderedDict()
+        self._bloom_filter_capacity = bloom_filter_capacity
+        self._bloom_filter_error_rate = bloom_filter_error_rate
+        self._bloom_filter: BloomFilter | None = None
+        self._next_bloom_filter: BloomFilter | None = None
+
+    @property
+    def bloom_filter_enabled(self) -> bool:
+        return self._bloom_filter_capacity is not None
+
+    def get(self, key: str) -> Inbox | None:
+        """Получить неистекшую запись из кэша."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        inbox, expires_at = entry
+        if expires_at <= datetime.now(UTC):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        metrics.increment("inbox.get.cache_hit")
+        return inbox
+
+    def might_exist(self, key: str) -> bool:
+        """Проверить, может ли ключ быть в базе данных."""
+        if self._bloom_filter is None or key in self._bloom_filter:
+            return True
+        metrics.increment("inbox.get.bloom_filter_miss")
+        return False
+
+    def add(self, inbox: Inbox):
+        """Добавить завершенную запись, найденную в базе или сохраненную."""
+        expires_at = inbox.expires_at or datetime.now(UTC) + timedelta(
+            seconds=settings.inbox_seconds_ttl
+        )
+        self._entries[inbox.key] = (inbox, expires_at)
+        self._entries.move_to_end(inbox.key)
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+        self.add_key(inbox.key)
+
+    def add_key(self, key: str):
+        """Добавить в фильтр Блума ключ, записанный в базу данных."""
+        for bloom_filter in (self._bloom_filter, self._next_bloom_filter):
+            if bloom_filter is not None:
+                bloom_filter.add(key)
+
+    def start_rebuild(self):
+        """Начать заполнение нового фильтра Блума.
+
+        Вызывается до чтения ключей из базы: записи, созданные
+        во время чтения, попадут в новый фильтр через `add`.
+
+        """
+        if self.bloom_filter_enabled:
+            self._next_bloom_filter = BloomFilter(
+                self._bloom_filter_capacity, self._bloom_filter_error_rate
+            )
+
+    def finish_rebuild(self, keys: Iterable[str]):
+        """Заполнить новый фильтр Блума ключами из базы и заменить им старый.
+
+        Удаленные из базы ключи при этом уходят из фильтра.
+
+        """
+        if (bloom_filter := self._next_bloom_filter) is None:
+            return
+        for key in keys:
+            bloom_filter.add(key)
+        self._bloom_filter = bloom_filter
+        self._next_bloom_filter = None
+
+    def cancel_rebuild(self):
+        """Отменить заполнение нового фильтра Блума."""
+        self._next_bloom_filter = None
+
+    def reset(self):
+        """Очистить кэш и отключить фильтр Блума до следующего заполнения."""
+        self._entries.clear()
+        self._bloom_filter = None
+        self._next_bloom_filter = None
+
+
+inbox_cache = InboxCache(
+    settings.inbox_cache_size,
+    bloom_filter_capacity=(
+        settings.inbox_bloom_filter_capacity
+        if settings.inbox_bloom_filter_enabled
+        else None
+    ),
+    bloom_filter_error_rate=settings.inbox_bloom_filter_error_rate,
+)
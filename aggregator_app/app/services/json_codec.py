@@ -0,0 +1,64 @@
+"""JSON-кодек внешних API и ответов приложения."""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+from app.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class JsonCodec:
+    """Реализация разбора и сериализации JSON.
+
+    Атрибуты:
+    - `name` - Имя реализации.
+    - `loads` - Разбор JSON из строки или байтов.
+    - `dumps` - Компактная сериализация в UTF-8 байты.
+
+    """
+
+    name: str
+    loads: Callable[[str | bytes], Any]
+    dumps: Callable[[Any], bytes]
+
+    def dumps_str(self, obj: Any) -> str:
+        """Сериализовать в строку, например для тела запроса aiohttp."""
+        return self.dumps(obj).decode()
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def get_json_codecs() -> dict[str, JsonCodec]:
+    """Получить реализации по убыванию скорости."""
+    return {
+        "orjson": JsonCodec("orjson", orjson.loads, orjson.dumps),
+        "stdlib": JsonCodec("stdlib", json.loads, _stdlib_dumps),
+    }
+
+
+def get_json_codec(name: str) -> JsonCodec:
+    """Получить реализацию по имени.
+
+    При `auto` выбирается самая быстрая - orjson.
+
+    Исключения:
+    - `ValueError` - если реализация неизвестна.
+
+    """
+    codecs = get_json_codecs()
+    if name == "auto":
+        return next(iter(codecs.values()))
+    if (codec := codecs.get(name)) is None:
+        raise ValueError(f"JSON codec {name!r} is not available")
+    return codec
+
+
+json_codec = get_json_codec(settings.json_codec)
@@ -0,0 +1,34 @@
+"""Метрики сервисов."""
+
+from collections import defaultdict
+
+
+class Metrics:
+    """Счетчики событий в памяти процесса.
+
+    Имена счетчиков строятся как `<клиент>.<операция>.<событие>`,
+    например `events_provider.get_seats.deadline_exceeded`.
+
+    """
+
+    def __init__(self):
+        self._counters: defaultdict[str, int] = defaultdict(int)
+
+    def increment(self, name: str, value: int = 1):
+        """Увеличить счетчик."""
+        self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        """Получить значение счетчика."""
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, int]:
+        """Получить значения всех счетчиков."""
+        return dict(sorted(self._counters.items()))
+
+    def reset(self):
+        """Сбросить все счетчики."""
+        self._counters.clear()
+
+
+metrics = Metrics()
@@ -2,13 +2,12 @@
 
 from typing import Any, Protocol
 
-import backoff
 from aiohttp import ClientSession, ClientTimeout
-from aiohttp.client_exceptions import ClientConnectionError
 
 from app.config import settings
 from app.orm.models.outbox import Outbox
-from app.services.utils import IExternalClient
+from app.services.json_codec import json_codec
+from app.services.utils import IExternalClient, with_budget
 
 
 class INotificationClient(IExternalClient, Protocol):
@@ -28,15 +27,12 @@ class CapashinoNotificationClient(INotificationClient):
 
     """
 
-    _BACKOFF_ON_EXCEPTION = backoff.on_exception(
-        backoff.expo,
-        (TimeoutError, ClientConnectionError),
-        max_tries=3,
-    )
-
     def __init__(self, total_timeout: int = 60, connect_timeout: int = 15):
         """Инициализировать клиент.
 
+        Время отправки уведомления дополнительно ограничено бюджетами
+        из настроек (см. `with_budget`).
+
         Аргументы:
         - `total_timeout` - Максимальное время ожидания всего запроса;
             по умолчанию 60 секунд.
@@ -49,12 +45,16 @@ class CapashinoNotificationClient(INotificationClient):
         )
         self._session: ClientSession | None = None
 
-    @_BACKOFF_ON_EXCEPTION
+    @with_budget(
+        "notification.notify",
+        timeout=settings.notification_seconds_timeout,
+        deadline=settings.external_request_seconds_deadline,
+    )
     async def notify(self, item: Outbox) -> dict[str, Any]:
         url = "/api/notifications"
         body = self.get_body_from_outbox(item)
         async with self._session.post(url, json=body) as response:
-            return await response.json()
+            return await response.json(loads=json_codec.loads)
 
     def get_body_from_outbox(self, item: Outbox) -> dict[str, Any]:
         payload = item.payload
@@ -75,6 +75,7 @@ class CapashinoNotificationClient(INotificationClient):
                 "X-API-key": settings.lms_api_key.get_secret_value(),
             },
             timeout=self._timeout,
+            json_serialize=json_codec.dumps_str,
             raise_for_status=True,
         )
         return self
@@ -11,6 +11,7 @@ from app.config import settings
 from app.orm.db_manager import db_manager
 from app.orm.models import Outbox, OutboxStatus
 from app.orm.uow import IUnitOfWork, SqlAlchemyUnitOfWork
+from app.services.circuit_breaker import circuit_breakers
 from app.services.notification import (
     CapashinoNotificationClient,
     INotificationClient,
@@ -68,6 +69,7 @@ class OutboxService:
                     on_success=self._update_status,
                     on_success_kwargs={"uow": uow, "item": item},
                     on_error=self._handle_error,
+                    circuit_breaker=circuit_breakers.get("notification.notify"),
                 )
 
         logger.info(
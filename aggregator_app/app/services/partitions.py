@@ -0,0 +1,197 @@
+"""Сервис обслуживания секций таблиц."""
+
+import logging
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.config import settings
+from app.orm.db_manager import db_manager
+from app.orm.uow import IUnitOfWork, SqlAlchemyUnitOfWork
+from app.services.inbox import get_inbox_service
+from app.services.utils import scheduler
+
+logger = logging.getLogger(__name__)
+
+PARTITION_INTERVAL = timedelta(days=1)
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionedTable:
+    """Таблица, секционированная по дням.
+
+    Атрибуты:
+    - `name` - Имя таблицы.
+    - `column` - Столбец секционирования.
+    - `premake_days` - Количество дней после текущего,
+        для которых секции создаются заранее.
+    - `retention` - Время после конца диапазона секции,
+        через которое секция удаляется.
+    - `keep_where` - SQL-условие строк, при наличии которых
+        секция не удаляется; может быть пустым.
+
+    """
+
+    name: str
+    column: str
+    premake_days: int
+    retention: timedelta
+    keep_where: str | None = None
+
+    def partition_name(self, start: datetime) -> str:
+        return f"{self.name}_p{start:%Y%m%d}"
+
+    def partition_start(self, name: str) -> datetime | None:
+        """Получить начало диапазона секции по ее имени."""
+        try:
+            start = datetime.strptime(
+                name.removeprefix(f"{self.name}_p"), "%Y%m%d"
+            )
+        except ValueError:
+            return None
+        return start.replace(tzinfo=UTC)
+
+
+def get_partitioned_tables() -> tuple[PartitionedTable, ...]:
+    """Получить секционированные таблицы.
+
+    Inbox секционирован по `expires_at`: секции создаются на время
+    жизни ключей вперед и удаляются, как только все ключи истекли.
+    Outbox секционирован по `created_at`: секции удаляются через
+    `outbox_retention_days`, если в них нет ожидающих событий.
+
+    """
+    inbox_days = math.ceil(
+        settings.inbox_seconds_ttl / PARTITION_INTERVAL.total_seconds()
+    )
+    return (
+        PartitionedTable(
+            "inbox",
+            "expires_at",
+            premake_days=inbox_days + settings.partition_premake_days,
+            retention=timedelta(0),
+        ),
+        PartitionedTable(
+            "outbox",
+            "created_at",
+            premake_days=settings.partition_premake_days,
+            retention=timedelta(days=settings.outbox_retention_days),
+            keep_where="status = 'WAITING'",
+        ),
+    )
+
+
+class PartitionService:
+    """Сервис обслуживания секций таблиц inbox и outbox.
+
+    Заранее создает секции на ближайшие дни и удаляет устаревшие
+    секции целиком вместо построчного удаления. После удаления секций
+    таблицы вызывает ее обработчик из `on_drop`, если он задан.
+
+    """
+
+    PARTITION_JOB_ID = "partition-job"
+    PARTITION_JOB_TRIGGER = IntervalTrigger(
+        seconds=settings.partition_seconds_interval
+    )
+
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        scheduler: AsyncIOScheduler,
+        on_drop: dict[str, Callable[[], Awaitable[None]]] | None = None,
+    ):
+        self._uow = uow
+        self._scheduler = scheduler
+        self._on_drop = on_drop or {}
+
+    async def init_jobs(self):
+        """Инициализировать задачу обслуживания секций."""
+        logger.info("Инициализация задачи обслуживания секций")
+
+        self._scheduler.add_job(
+            self.maintain,
+            trigger=self.PARTITION_JOB_TRIGGER,
+            id=self.PARTITION_JOB_ID,
+            max_instances=1,
+            next_run_time=datetime.now(UTC),
+        )
+
+        logger.info("Задача обслуживания секций добавлена в планировщик")
+
+    async def maintain(self):
+        """Создать недостающие и удалить устаревшие секции."""
+        now = datetime.now(UTC)
+        for table in get_partitioned_tables():
+            async with self._uow as uow:
+                existing = await uow.partitions.get_partitions(table.name)
+            created = await self._create_partitions(table, now, set(existing))
+            dropped = await self._drop_partitions(table, now, existing)
+            logger.info(
+                "Секции %s: создано %d, удалено %d",
+                table.name,
+                created,
+                dropped,
+            )
+            if dropped and (on_drop := self._on_drop.get(table.name)):
+                await on_drop()
+
+    async def _create_partitions(
+        self, table: PartitionedTable, now: datetime, existing: set[str]
+    ) -> int:
+        """Создать секции с текущего дня на `premake_days` вперед."""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        created = 0
+        for day in range(table.premake_days + 1):
+            start = today + day * PARTITION_INTERVAL
+            if (name := table.partition_name(start)) in existing:
+                continue
+            async with self._uow as uow:
+                await uow.partitions.create_partition(
+                    table.name,
+                    table.column,
+                    name,
+                    start,
+                    start + PARTITION_INTERVAL,
+                )
+                await uow.commit()
+            created += 1
+        return created
+
+    async def _drop_partitions(
+        self, table: PartitionedTable, now: datetime, existing: list[str]
+    ) -> int:
+        """Удалить секции, диапазон которых закончился `retention` назад."""
+        dropped = 0
+        for name in existing:
+            start = table.partition_start(name)
+            if start is None or (
+                start + PARTITION_INTERVAL + table.retention > now
+            ):
+                continue
+            async with self._uow as uow:
+                if table.keep_where and not await uow.partitions.is_empty(
+                    name, table.keep_where
+                ):
+                    logger.warning(
+                        "Секция %s не удалена: есть строки, где %s",
+                        name,
+                        table.keep_where,
+                    )
+                    continue
+                await uow.partitions.drop_partition(name)
+                await uow.commit()
+            dropped += 1
+        return dropped
+
+
+def get_partition_service() -> PartitionService:
+    return PartitionService(
+        SqlAlchemyUnitOfWork(db_manager),
+        scheduler,
+        on_drop={"inbox": get_inbox_service().rebuild_bloom_filter},
+    )
@@ -0,0 +1,129 @@
+"""Модуль посадочных мест."""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from typing import Any, Self
+
+from app.orm.models import Place
+
+SEAT_RE = re.compile(r"^([A-Z])([1-9][0-9]{0,6})$")
+PATTERN_PART_RE = re.compile(r"^([A-Z])(\d+)(?:-([A-Z])?(\d+))?$")
+
+
+class SeatsIndex:
+    """Индекс посадочных мест места проведения.
+
+    Хранит для каждого ряда отсортированный список непересекающихся
+    диапазонов номеров мест, поэтому занимает O(число диапазонов)
+    памяти вне зависимости от количества мест.
+
+    Формат шаблона: части через запятую, каждая часть - одно место
+    (`A5`) или диапазон мест одного ряда (`A1-1000` или `A1-A10`).
+
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows: dict[str, list[tuple[int, int]]]):
+        self._rows = rows
+
+    @classmethod
+    def from_pattern(cls, pattern: str) -> Self:
+        """Построить индекс по шаблону посадочных мест.
+
+        Исключения:
+        - `ValueError` - если шаблон не удалось разобрать.
+
+        """
+        ranges: dict[str, list[tuple[int, int]]] = {}
+        for part in pattern.replace(" ", "").split(","):
+            if not (match := PATTERN_PART_RE.match(part)):
+                raise ValueError(f"Invalid seats pattern part: {part!r}")
+            row, start, end_row, end = match.groups()
+            if end_row is not None and end_row != row:
+                raise ValueError(f"Seats range spans rows: {part!r}")
+            start = int(start)
+            end = start if end is None else int(end)
+            if start < 1 or end < start:
+                raise ValueError(f"Invalid seats range: {part!r}")
+            ranges.setdefault(row, []).append((start, end))
+        return cls(
+            {row: _merge(row_ranges) for row, row_ranges in ranges.items()}
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Self:
+        """Восстановить индекс из JSON-представления."""
+        return cls(
+            {
+                row: [tuple(r) for r in row_ranges]
+                for row, row_ranges in data.items()
+            }
+        )
+
+    @classmethod
+    def from_place(cls, place: Place) -> Self | None:
+        """Получить индекс места проведения.
+
+        Использует сохраненный при синхронизации индекс, а если его нет -
+        строит по шаблону. Возвращает None, если шаблон не разбирается.
+
+        """
+        if place.seats_index is not None:
+            return cls.from_json(place.seats_index)
+        try:
+            return cls.from_pattern(place.seats_pattern)
+        except ValueError:
+            return None
+
+    def to_json(self) -> dict[str, list[list[int]]]:
+        """Получить JSON-представление индекса."""
+        return {
+            row: [list(r) for r in row_ranges]
+            for row, row_ranges in self._rows.items()
+        }
+
+    def __contains__(self, seat: object) -> bool:
+        if not isinstance(seat, str) or not (match := SEAT_RE.match(seat)):
+            return False
+        row_ranges = self._rows.get(match.group(1))
+        if not row_ranges:
+            return False
+        number = int(match.group(2))
+        i = bisect_right(row_ranges, (number, float("inf"))) - 1
+        return i >= 0 and row_ranges[i][1] >= number
+
+    def __iter__(self) -> Iterator[str]:
+        for row in sorted(self._rows):
+            for start, end in self._rows[row]:
+                for number in range(start, end + 1):
+                    yield f"{row}{number}"
+
+    def __len__(self) -> int:
+        return sum(
+            end - start + 1
+            for row_ranges in self._rows.values()
+            for start, end in row_ranges
+        )
+
+    def difference(self, seats: Iterable[str]) -> list[str]:
+        """Получить места индекса, отсутствующие в `seats`.
+
+        Используется для кодирования свободных мест разницей
+        относительно всех мест площадки.
+
+        """
+        seats = set(seats)
+        return [seat for seat in self if seat not in seats]
+
+
+def _merge(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Объединить пересекающиеся и смежные диапазоны."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
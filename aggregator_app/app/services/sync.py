@@ -1,21 +1,33 @@
 """Сервис синхронизации данных."""
 
+import asyncio
 import logging
-from datetime import UTC, date, datetime
+import math
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+from uuid import UUID
 
+from aiohttp import ClientResponseError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from app.config import settings
 from app.orm.db_manager import db_manager
 from app.orm.models import Event, Place, SyncMeta, SyncStatus
 from app.orm.uow import IUnitOfWork, SqlAlchemyUnitOfWork
+from app.services.circuit_breaker import circuit_breakers
+from app.services.events import EventsService
 from app.services.events_provider import (
     EventsPaginator,
     EventsProviderClient,
     EventsProviderParser,
     IEventsProviderClient,
 )
-from app.services.utils import scheduler, with_external_client
+from app.services.utils import (
+    RateLimiter,
+    scheduler,
+    with_external_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +35,9 @@ logger = logging.getLogger(__name__)
 class SyncService:
     """Сервис синхронизации данных."""
 
-    DEFAULT_CHANGED_AT = date(2000, 1, 1)
+    DEFAULT_CHANGED_AT = datetime(2000, 1, 1, tzinfo=UTC)
 
     SYNC_JOB_ID = "sync-events"
-    SYNC_JOB_TRIGGER = IntervalTrigger(days=1)
 
     def __init__(
         self,
@@ -41,6 +52,8 @@ class SyncService:
         self._client = client
         self._paginator = paginator
         self._parser = parser
+        self._seconds_interval = settings.sync_seconds_interval
+        self._changes = 0
 
     async def init_jobs(self):
         """Инициализировать задачу синхронизации.
@@ -71,7 +84,7 @@ class SyncService:
 
         self._scheduler.add_job(
             self.sync,
-            trigger=self.SYNC_JOB_TRIGGER,
+            trigger=IntervalTrigger(seconds=self._seconds_interval),
             id=self.SYNC_JOB_ID,
             max_instances=1,
             next_run_time=self._get_next_run_time(sync_meta.last_sync_time),
@@ -82,7 +95,7 @@ class SyncService:
         """Получить следующее время запуска по предыдущему."""
         if last_sync_time is None:
             return datetime.now(UTC)
-        return last_sync_time + self.SYNC_JOB_TRIGGER.interval
+        return last_sync_time + timedelta(seconds=self._seconds_interval)
 
     def trigger_job(self):
         """Задать внеплановый запуск задачи синхронизации.
@@ -106,9 +119,11 @@ class SyncService:
         Если статус уже в этом состоянии, то функция не выполняется.
         Это необходимо, если было бы несколько реплик.
 
-        Затем вызывается получение данных из внешнего API.
-        При успехе в новой сессии одной транзакцией данные
-        добавляются/обновляются, при ошибке - откатываются метаданные.
+        Затем вызывается получение данных из внешнего API; большие объемы
+        сохраняются по ходу загрузки вместе с контрольными точками.
+        При успехе в новой сессии одной транзакцией оставшиеся данные
+        добавляются/обновляются, при ошибке - откатывается статус,
+        а контрольная точка остается для продолжения в следующий запуск.
 
         """
         logger.info("Начало синхронизации")
@@ -123,6 +138,8 @@ class SyncService:
             sync_meta.sync_status = SyncStatus.PENDING
             await uow.commit()
 
+        self._changes = 0
+
         logger.info(
             "Статус синхронизации установлен в '%s'",
             sync_meta.sync_status.value,
@@ -135,6 +152,7 @@ class SyncService:
             on_success=self._update_db,
             on_error=self._rollback_sync_meta,
             on_error_kwargs={"prev_sync_status": sync_status},
+            circuit_breaker=circuit_breakers.get("events_provider.get_events"),
         )
 
     async def _get_sync_meta(self, uow: IUnitOfWork) -> SyncMeta:
@@ -148,53 +166,382 @@ class SyncService:
 
     async def _run_fetch(
         self, client: IEventsProviderClient, sync_meta: SyncMeta
-    ) -> tuple[list[Event], list[Place], date]:
+    ) -> tuple[list[Event], list[Place], tuple[datetime, UUID | None]]:
         """Загрузить данные из API.
 
+        Водяной знак - пара (`changed_at`, `id`) последнего
+        синхронизированного события. API фильтрует события только по дате,
+        поэтому события, не новее водяного знака, уже синхронизированы
+        и пропускаются. ID различает события с одинаковым `changed_at`.
+
+        Если предыдущая синхронизация прервалась после контрольной точки,
+        загрузка продолжается с сохраненного курсора. Если API отклоняет
+        курсор ответом 4xx, загрузка начинается заново.
+
+        Первая синхронизация при `sync_backfill_concurrency` > 1
+        выполняется параллельной загрузкой окнами дат (`_backfill`).
+
+        """
+        watermark = (
+            sync_meta.last_changed_at or self.DEFAULT_CHANGED_AT,
+            sync_meta.last_event_id,
+        )
+        if sync_meta.checkpoint_cursor is not None:
+            logger.info(
+                "Продолжение синхронизации с контрольной точки: cursor=%s",
+                sync_meta.checkpoint_cursor,
+            )
+            try:
+                return await self._fetch(
+                    client,
+                    watermark,
+                    cursor=sync_meta.checkpoint_cursor,
+                    latest=(
+                        sync_meta.checkpoint_changed_at,
+                        sync_meta.checkpoint_event_id,
+                    ),
+                )
+            except ClientResponseError as e:
+                if not 400 <= e.status < 500:
+                    raise
+                logger.warning(
+                    "API отклонил курсор контрольной точки (%d), "
+                    "начинаем заново",
+                    e.status,
+                )
+        elif (
+            sync_meta.last_changed_at is None
+            and settings.sync_backfill_concurrency > 1
+        ):
+            return await self._backfill(client)
+        return await self._fetch(client, watermark)
+
+    async def _backfill(
+        self, client: IEventsProviderClient
+    ) -> tuple[list[Event], list[Place], tuple[datetime, UUID | None]]:
+        """Загрузить все события параллельно окнами дат изменения.
+
+        Диапазон от `DEFAULT_CHANGED_AT` до текущей даты делится на окна
+        по `sync_backfill_window_days` дней, одновременно загружается
+        не более `sync_backfill_concurrency` окон, а частота запросов
+        страниц ограничена общим `RateLimiter`.
+
+        Результаты окон объединяются по ID: если событие изменилось
+        во время загрузки и попало в два окна, остается более поздняя
+        версия. Контрольные точки не сохраняются. Водяной знак
+        удерживается событиями в карантине, как в `_fetch`.
+
+        """
+        first_day = self.DEFAULT_CHANGED_AT.date()
+        window = timedelta(days=settings.sync_backfill_window_days)
+        windows_count = math.ceil(
+            ((datetime.now(UTC).date() - first_day).days + 1) / window.days
+        )
+        starts = [first_day + i * window for i in range(windows_count)]
+        ends = [*starts[1:], None]
+        logger.info(
+            "Параллельная загрузка: windows=%d, concurrency=%d",
+            windows_count,
+            settings.sync_backfill_concurrency,
+        )
+
+        semaphore = asyncio.Semaphore(settings.sync_backfill_concurrency)
+        rate_limiter = RateLimiter(
+            settings.events_provider_sync_requests_per_second
+        )
+
+        async def fetch(start: date, end: date | None):
+            async with semaphore:
+                return await self._fetch_window(
+                    client, start, end, rate_limiter
+                )
+
+        results = await asyncio.gather(
+            *(
+                fetch(start, end)
+                for start, end in zip(starts, ends, strict=True)
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        event_data_dict = {}
+        place_data_dict = {}
+        quarantined = []
+        for window_events, window_places, quarantined_changed_at in results:
+            if quarantined_changed_at is not None:
+                quarantined.append(quarantined_changed_at)
+            for data_dict, window_dict in (
+                (event_data_dict, window_events),
+                (place_data_dict, window_places),
+            ):
+                for data_id, data in window_dict.items():
+                    current = data_dict.get(data_id)
+                    if (
+                        current is None
+                        or data["changed_at"] > current["changed_at"]
+                    ):
+                        data_dict[data_id] = data
+
+        latest = (self.DEFAULT_CHANGED_AT, None)
+        for event_data in event_data_dict.values():
+            position = (event_data["changed_at"], UUID(event_data["id"]))
+            if self._is_after(position, latest):
+                latest = position
+        latest = self._hold(latest, min(quarantined, default=None))
+
+        logger.info(
+            "Параллельная загрузка завершена: events=%d, places=%d",
+            len(event_data_dict),
+            len(place_data_dict),
+        )
+        event_data_list = list(event_data_dict.values())
+        place_data_list = list(place_data_dict.values())
+        return event_data_list, place_data_list, latest
+
+    async def _fetch_window(
+        self,
+        client: IEventsProviderClient,
+        start: date,
+        end: date | None,
+        rate_limiter: RateLimiter,
+    ) -> tuple[
+        dict[str, dict[str, Any]], dict[str, dict[str, Any]], datetime | None
+    ]:
+        """Загрузить события, измененные с `start` до `end` (не включая).
+
+        API фильтрует события только по нижней границе даты, поэтому
+        загрузка окна прекращается на первой странице, в которой нет
+        событий окна. Последнее окно (`end` = None) загружается целиком.
+
+        Возвращает события, места проведения и самое раннее время
+        изменения событий окна в карантине.
+
+        """
+        event_data_dict = {}
+        place_data_dict = {}
+        page_in_window = False
+
+        paginator = EventsPaginator()(client, start, rate_limiter=rate_limiter)
+        async for event in paginator:
+            event_data, place_data = self._parser.parse_event_dict(event)
+            changed_on = event_data["changed_at"].astimezone(UTC).date()
+            if end is None or changed_on < end:
+                page_in_window = True
+                place_data_dict[place_data["id"]] = place_data
+                event_data_dict[event_data["id"]] = event_data
+            if paginator.page_consumed:
+                if not page_in_window:
+                    break
+                page_in_window = False
+
+        logger.info(
+            "Окно %s - %s загружено: events=%d",
+            start.isoformat(),
+            end.isoformat() if end else "...",
+            len(event_data_dict),
+        )
+        return (
+            event_data_dict,
+            place_data_dict,
+            paginator.quarantined_changed_at,
+        )
+
+    async def _fetch(
+        self,
+        client: IEventsProviderClient,
+        watermark: tuple[datetime, UUID | None],
+        cursor: str | None = None,
+        latest: tuple[datetime, UUID | None] | None = None,
+    ) -> tuple[list[Event], list[Place], tuple[datetime, UUID | None]]:
+        """Загрузить события после водяного знака, начиная с курсора.
+
         Данные собираются в словари, так как одно и то же место проведения
         может присутствовать в разных событиях, а дубликаты не допускаются
-        для on_conflict_do_update. Сбор происходит целиком, так как
-        данных получаем сравнительно мало.
+        для on_conflict_do_update.
+
+        Когда собрано не меньше `sync_checkpoint_size` событий и страница
+        получена целиком, события сохраняются вместе с курсором следующей
+        страницы. Остаток возвращается для сохранения в `_update_db`.
+
+        Если событие попало в карантин, водяной знак не сдвигается дальше
+        его времени изменения, а контрольные точки после него
+        не сохраняются: следующая синхронизация загрузит его снова.
 
         """
-        latest_changed_at = sync_meta.last_changed_at or self.DEFAULT_CHANGED_AT
+        latest = latest or watermark
         logger.info(
-            "Получение данных из API, начиная с %s",
-            latest_changed_at.isoformat(),
+            "Получение данных из API, начиная с %s (event_id=%s)",
+            watermark[0].isoformat(),
+            watermark[1],
         )
 
         event_data_dict = {}
         place_data_dict = {}
+        skipped = saved = 0
 
-        async for event in self._paginator(client, latest_changed_at):
+        paginator = self._paginator(
+            client, watermark[0].astimezone(UTC).date(), cursor
+        )
+        async for event in paginator:
             event_data, place_data = self._parser.parse_event_dict(event)
-            place_data_dict[place_data["id"]] = place_data
-            event_data_dict[event_data["id"]] = event_data
-            latest_changed_at = max(
-                latest_changed_at,
-                event_data["changed_at"].date(),
-            )
+            position = (event_data["changed_at"], UUID(event_data["id"]))
+            if self._is_after(position, watermark):
+                place_data_dict[place_data["id"]] = place_data
+                event_data_dict[event_data["id"]] = event_data
+                if self._is_after(position, latest):
+                    latest = position
+            else:
+                skipped += 1
+
+            if (
+                len(event_data_dict) >= settings.sync_checkpoint_size
+                and paginator.page_consumed
+                and paginator.cursor is not None
+                and paginator.quarantined_changed_at is None
+            ):
+                await self._save_checkpoint(
+                    list(event_data_dict.values()),
+                    list(place_data_dict.values()),
+                    paginator.cursor,
+                    latest,
+                )
+                saved += len(event_data_dict)
+                event_data_dict.clear()
+                place_data_dict.clear()
 
+        latest = self._hold(latest, paginator.quarantined_changed_at)
         logger.info(
-            "Получение завершено: events=%d, places=%d, latest_changed_at=%s",
+            "Получение завершено: events=%d, places=%d, saved=%d, "
+            "skipped=%d, latest_changed_at=%s",
             len(event_data_dict),
             len(place_data_dict),
-            latest_changed_at.isoformat(),
+            saved,
+            skipped,
+            latest[0].isoformat(),
         )
 
         event_data_list = list(event_data_dict.values())
         place_data_list = list(place_data_dict.values())
-        return event_data_list, place_data_list, latest_changed_at
+        return event_data_list, place_data_list, latest
+
+    @classmethod
+    def _hold(
+        cls,
+        latest: tuple[datetime, UUID | None],
+        quarantined_changed_at: datetime | None,
+    ) -> tuple[datetime, UUID | None]:
+        """Ограничить водяной знак временем изменения событий в карантине."""
+        if quarantined_changed_at is None:
+            return latest
+        held = (quarantined_changed_at, None)
+        if not cls._is_after(latest, held):
+            return latest
+        logger.warning(
+            "Водяной знак удержан событиями в карантине: changed_at=%s",
+            quarantined_changed_at.isoformat(),
+        )
+        return held
+
+    @staticmethod
+    def _is_after(
+        position: tuple[datetime, UUID | None],
+        watermark: tuple[datetime, UUID | None],
+    ) -> bool:
+        """Проверить, что позиция события новее водяного знака.
+
+        Пустой ID водяного знака меньше любого ID.
+
+        """
+        if position[0] != watermark[0]:
+            return position[0] > watermark[0]
+        return watermark[1] is None or (
+            position[1] is not None and position[1] > watermark[1]
+        )
+
+    async def _upsert(
+        self,
+        uow: IUnitOfWork,
+        events: list[dict[str, Any]],
+        places: list[dict[str, Any]],
+    ):
+        """Вставить/обновить места проведения и события.
+
+        Затем обновляются векторы поиска вставленных и обновленных
+        событий и событий вставленных и обновленных мест проведения.
+
+        """
+        places_stats = await uow.places.upsert(places)
+        events_stats = await uow.events.upsert(events)
+        search_vectors = await uow.events.update_search_vectors(
+            places_stats.ids, events_stats.ids
+        )
+        self._changes += events_stats.inserted + events_stats.updated
+        logger.info(
+            "Места проведения: inserted=%d, updated=%d, unchanged=%d",
+            places_stats.inserted,
+            places_stats.updated,
+            places_stats.unchanged,
+        )
+        logger.info(
+            "События: inserted=%d, updated=%d, unchanged=%d, search=%d",
+            events_stats.inserted,
+            events_stats.updated,
+            events_stats.unchanged,
+            search_vectors,
+        )
+
+    async def _save_checkpoint(
+        self,
+        events: list[dict[str, Any]],
+        places: list[dict[str, Any]],
+        cursor: str,
+        latest: tuple[datetime, UUID | None],
+    ):
+        """Сохранить порцию данных вместе с контрольной точкой.
+
+        Водяной знак не меняется до конца синхронизации: события,
+        полученные при продолжении, сравниваются с тем же водяным знаком.
+
+        """
+        logger.info(
+            "Сохранение контрольной точки: events=%d, places=%d, cursor=%s",
+            len(events),
+            len(places),
+            cursor,
+        )
+
+        async with self._uow as uow:
+            async with uow.begin():
+                await self._upsert(uow, events, places)
+
+                sync_meta = await self._get_sync_meta(uow)
+                sync_meta.checkpoint_cursor = cursor
+                (
+                    sync_meta.checkpoint_changed_at,
+                    sync_meta.checkpoint_event_id,
+                ) = latest
+
+        await EventsService.invalidate_validation_cache()
+        await EventsService.invalidate_etag()
 
     async def _update_db(
-        self, fetch_result: tuple[list[Event], list[Place], date]
+        self,
+        fetch_result: tuple[
+            list[Event], list[Place], tuple[datetime, UUID | None]
+        ],
     ):
         """Обновить базу данных и метаданные.
 
         Для обновления создается новая сессия, так как держать одну
         сессию открытой на все время синхронизации не практично.
-        Затем через upsert вставляются/обновляются данные о местах
-        проведения и событиях.
+        Затем через upsert вставляются/обновляются оставшиеся данные
+        о местах проведения и событиях, сдвигается водяной знак
+        и удаляется контрольная точка. После фиксации сбрасываются
+        локальный кэш данных событий для проверки регистрации
+        и кэш версии данных событий для ETag.
 
         """
         logger.info(
@@ -205,16 +552,56 @@ class SyncService:
 
         async with self._uow as uow:
             async with uow.begin():
-                await uow.places.upsert(fetch_result[1])
-                await uow.events.upsert(fetch_result[0])
+                await self._upsert(uow, fetch_result[0], fetch_result[1])
 
                 sync_meta = await self._get_sync_meta(uow)
                 sync_meta.sync_status = SyncStatus.SYNCED
                 sync_meta.last_sync_time = datetime.now(UTC)
-                sync_meta.last_changed_at = fetch_result[2]
+                sync_meta.last_changed_at, sync_meta.last_event_id = (
+                    fetch_result[2]
+                )
+                sync_meta.checkpoint_cursor = None
+                sync_meta.checkpoint_changed_at = None
+                sync_meta.checkpoint_event_id = None
 
             logger.info("Метаданные обновлены: %s", str(sync_meta))
-        logger.info("Синхронизация завершена")
+
+        await EventsService.invalidate_validation_cache()
+        await EventsService.invalidate_etag()
+        logger.info("Синхронизация завершена: changes=%d", self._changes)
+        self._adapt_interval()
+
+    def _adapt_interval(self):
+        """Подобрать интервал синхронизации по количеству изменений.
+
+        При включенном `sync_adaptive` интервал сокращается вдвое,
+        если последняя синхронизация вставила или обновила не меньше
+        `sync_adaptive_changes_threshold` событий, и удваивается,
+        если изменений не было. Интервал остается в пределах
+        `sync_min_seconds_interval` и `sync_max_seconds_interval`.
+
+        """
+        if not settings.sync_adaptive:
+            return
+        if self._changes >= settings.sync_adaptive_changes_threshold:
+            seconds_interval = max(
+                self._seconds_interval // 2, settings.sync_min_seconds_interval
+            )
+        elif self._changes == 0:
+            seconds_interval = min(
+                self._seconds_interval * 2, settings.sync_max_seconds_interval
+            )
+        else:
+            return
+        if seconds_interval == self._seconds_interval:
+            return
+
+        self._seconds_interval = seconds_interval
+        self._scheduler.reschedule_job(
+            self.SYNC_JOB_ID,
+            trigger=IntervalTrigger(seconds=seconds_interval),
+        )
+        logger.info("Интервал синхронизации изменен на %d с", seconds_interval)
 
     async def _rollback_sync_meta(
         self, e: Exception, prev_sync_status: SyncStatus
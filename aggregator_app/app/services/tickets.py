@@ -1,15 +1,27 @@
 """Сервис регистрации участников."""
 
+import asyncio
+import logging
 from typing import Any
 from uuid import UUID
 
 from aiohttp import ClientResponseError
 from fastapi import HTTPException, status
 
-from app.orm.models import Member, OutboxType
+from app.config import settings
+from app.orm.models import InboxStatus, Member, OutboxType
 from app.orm.uow import IUnitOfWork
+from app.services.circuit_breaker import (
+    CircuitBreakerOpenError,
+    circuit_breakers,
+)
+from app.services.events import EventsService
 from app.services.events_provider import IEventsProviderClient
-from app.services.utils import with_external_client
+from app.services.inbox_cache import inbox_cache
+from app.services.seats import SeatsIndex
+from app.services.utils import hash_dict, with_external_client
+
+logger = logging.getLogger(__name__)
 
 
 class TicketsService:
@@ -47,6 +59,13 @@ class TicketsService:
     ) -> str:
         """Зарегистрировать участника на событие.
 
+        Если в `idempotency_data` есть `ticket_id`, участник уже
+        зарегистрирован во внешнем API предыдущим запросом с тем же
+        ключом, и сохраняется только локально с этим билетом.
+        Резервирование ключа снимается, только если внешний API
+        отклонил регистрацию: после ошибок с неизвестным исходом
+        оно истекает через `inbox_reservation_seconds_ttl`.
+
         Аргументы:
         - `event_id` - UUID события.
         - `member_data` - Данные участника, готовые к JSON-сериализации.
@@ -57,6 +76,12 @@ class TicketsService:
         - UUID билета участника.
 
         """
+        if idempotency_data and (
+            ticket_id := idempotency_data.get("ticket_id")
+        ):
+            return await self._create_member(
+                ticket_id, event_id, member_data, idempotency_data
+            )
         return await with_external_client(
             self._client,
             self._register_member,
@@ -67,7 +92,11 @@ class TicketsService:
                 "member_data": member_data,
                 "idempotency_data": idempotency_data,
             },
-            on_error=self._raise_external_error,
+            on_error=self._raise_register_error,
+            on_error_kwargs={"idempotency_data": idempotency_data},
+            circuit_breaker=circuit_breakers.get(
+                "events_provider.register_member"
+            ),
         )
 
     async def _register_member(
@@ -88,19 +117,327 @@ class TicketsService:
         idempotency_data: dict[str, Any] | None,
     ) -> str:
         """Создать участника в локальной базе данных."""
-        member_data.update({"ticket_id": ticket_id, "event_id": str(event_id)})
+        await self._create_members(
+            event_id, [(ticket_id, member_data, idempotency_data)]
+        )
+        return ticket_id
+
+    async def _create_members(
+        self,
+        event_id: UUID,
+        registered: list[tuple[str, dict[str, Any], dict[str, Any] | None]],
+    ):
+        """Создать участников, outbox и ответы inbox одной транзакцией.
+
+        Аргументы:
+        - `event_id` - UUID события.
+        - `registered` - Список из UUID билета, данных участника
+            и данных идемпотентности с зарезервированным ключом.
+
+        Перед этим UUID билетов сохраняются в резервированиях ключей
+        отдельной транзакцией: если сохранение участников не удастся,
+        повторный запрос с тем же ключом переиспользует билет.
+        Участники, сохраненные предыдущим запросом с тем же ключом,
+        повторно не создаются.
+
+        После фиксации увеличивается версия состава участников,
+        чтобы сменился ETag ответов API событий.
+
+        """
+        if responses := {
+            idempotency_data["key"]: {"ticket_id": ticket_id}
+            for ticket_id, _, idempotency_data in registered
+            if idempotency_data and "ticket_id" not in idempotency_data
+        }:
+            async with self._uow as uow:
+                await uow.inbox.hold(responses)
+                await uow.commit()
 
+        inboxes = []
         async with self._uow as uow:
             async with uow.begin():
-                uow.members.create(member_data)
-                uow.outbox.create(OutboxType.TICKET_REGISTER, member_data)
+                for ticket_id, member_data, idempotency_data in registered:
+                    member_data.update(
+                        {"ticket_id": ticket_id, "event_id": str(event_id)}
+                    )
+                    if not (
+                        idempotency_data
+                        and "ticket_id" in idempotency_data
+                        and await uow.members.get_by_id(
+                            ticket_id, load_event=False
+                        )
+                    ):
+                        uow.members.create(member_data)
+                        uow.outbox.create(
+                            OutboxType.TICKET_REGISTER, member_data
+                        )
+
+                    if idempotency_data:
+                        inbox = await uow.inbox.complete(
+                            idempotency_data["key"],
+                            response={"ticket_id": ticket_id},
+                        )
+                        if inbox is not None:
+                            inboxes.append(inbox)
+            await self._increment_version(uow)
+        await EventsService.invalidate_etag()
+
+        for inbox in inboxes:
+            inbox_cache.add(inbox)
+
+    async def register_batch(
+        self,
+        event_id: UUID,
+        members_data: list[dict[str, Any]],
+        available_seats: set[str],
+        seats_index: SeatsIndex | None = None,
+    ) -> list[dict[str, Any]]:
+        """Зарегистрировать группу участников на одно событие.
 
-                if idempotency_data:
-                    uow.inbox.create(
-                        **idempotency_data, response={"ticket_id": ticket_id}
+        Событие и свободные места должны быть проверены и получены заранее,
+        один раз на всю группу. Для каждого участника проверяются
+        идемпотентность и место, новые ключи идемпотентности
+        резервируются одним запросом, затем все подходящие участники
+        регистрируются во внешнем API параллельно, не более
+        `tickets_batch_concurrency` запросов одновременно, и сохраняются
+        одной транзакцией. Резервирование снимается только с ключей
+        регистраций, отклоненных внешним API. Ключи, уже обрабатываемые
+        другим запросом, не ожидаются: для них возвращается HTTP 409,
+        а участники с билетом, сохраненным в резервировании предыдущим
+        запросом, сохраняются с этим билетом без повторной регистрации.
+
+        Аргументы:
+        - `event_id` - UUID события.
+        - `members_data` - Данные участников, готовые к JSON-сериализации;
+            могут содержать `idempotency_key`.
+        - `available_seats` - Свободные места на событии.
+        - `seats_index` - Индекс всех мест места проведения;
+            по умолчанию None.
+
+        Возвращает:
+        - Результаты регистрации в порядке участников: словари с ключами
+            `status_code`, `ticket_id` и `detail`.
+
+        """
+        results: list[dict[str, Any] | None] = [None] * len(members_data)
+        pending = await self._prepare_batch(
+            event_id, members_data, available_seats, seats_index, results
+        )
+
+        registered = []
+        new = []
+        for i, member_data, idempotency_data in pending:
+            if idempotency_data and (
+                ticket_id := idempotency_data.get("ticket_id")
+            ):
+                registered.append((ticket_id, member_data, idempotency_data))
+                results[i] = _batch_result(
+                    status.HTTP_201_CREATED, ticket_id=ticket_id
+                )
+            else:
+                new.append((i, member_data, idempotency_data))
+
+        if pending := await self._reserve_batch(new, results):
+            reserved_keys = [
+                idempotency_data["key"]
+                for _, _, idempotency_data in pending
+                if idempotency_data
+            ]
+            try:
+                outcomes = await with_external_client(
+                    self._client,
+                    self._register_members,
+                    func_kwargs={
+                        "event_id": event_id,
+                        "members_data": [data for _, data, _ in pending],
+                    },
+                    on_error=self._raise_external_error,
+                )
+            except HTTPException:
+                await self._release(reserved_keys)
+                raise
+
+            rejected_keys = []
+            for (i, member_data, idempotency_data), outcome in zip(
+                pending, outcomes, strict=True
+            ):
+                if isinstance(outcome, BaseException):
+                    status_code, detail = self._get_external_error(outcome)
+                    results[i] = _batch_result(status_code, detail=detail)
+                    if idempotency_data and _is_rejected(outcome):
+                        rejected_keys.append(idempotency_data["key"])
+                    continue
+                registered.append((outcome, member_data, idempotency_data))
+                results[i] = _batch_result(
+                    status.HTTP_201_CREATED, ticket_id=outcome
+                )
+
+            await self._release(rejected_keys)
+
+        if registered:
+            await self._create_members(event_id, registered)
+
+        return results
+
+    async def _reserve_batch(
+        self,
+        pending: list[tuple[int, dict[str, Any], dict[str, Any] | None]],
+        results: list[dict[str, Any] | None],
+    ) -> list[tuple[int, dict[str, Any], dict[str, Any] | None]]:
+        """Зарезервировать ключи идемпотентности участников группы.
+
+        Заполняет `results` для участников, ключ которых
+        не удалось зарезервировать.
+
+        Возвращает:
+        - Участников, готовых к регистрации.
+
+        """
+        reservations = {
+            idempotency_data["key"]: idempotency_data["request_hash"]
+            for _, _, idempotency_data in pending
+            if idempotency_data
+        }
+        if not reservations:
+            return pending
+
+        async with self._uow as uow:
+            reserved = await uow.inbox.reserve(reservations)
+            await uow.commit()
+        for key in reserved:
+            inbox_cache.add_key(key)
+
+        ready = []
+        for i, member_data, idempotency_data in pending:
+            if idempotency_data and idempotency_data["key"] not in reserved:
+                results[i] = _batch_result(
+                    status.HTTP_409_CONFLICT,
+                    detail="Request with this idempotency key is in progress",
+                )
+                continue
+            ready.append((i, member_data, idempotency_data))
+        return ready
+
+    async def _release(self, keys: list[str]):
+        """Снять резервирование ключей идемпотентности."""
+        if not keys:
+            return
+        async with self._uow as uow:
+            await uow.inbox.release(keys)
+            await uow.commit()
+
+    async def _prepare_batch(
+        self,
+        event_id: UUID,
+        members_data: list[dict[str, Any]],
+        available_seats: set[str],
+        seats_index: SeatsIndex | None,
+        results: list[dict[str, Any] | None],
+    ) -> list[tuple[int, dict[str, Any], dict[str, Any] | None]]:
+        """Проверить участников группы перед регистрацией.
+
+        Заполняет `results` для участников, которые не требуют регистрации:
+        повторные запросы по ключу идемпотентности и ошибки проверки.
+
+        Возвращает:
+        - Список из индекса участника, данных участника и данных
+            идемпотентности для регистрации во внешнем API. Данные
+            идемпотентности участников, уже зарегистрированных предыдущим
+            запросом с тем же ключом, содержат `ticket_id`.
+
+        """
+        keys = [
+            key for data in members_data if (key := data.get("idempotency_key"))
+        ]
+        inboxes = {
+            key: inbox for key in keys if (inbox := inbox_cache.get(key))
+        }
+        if keys := [
+            key
+            for key in keys
+            if key not in inboxes and inbox_cache.might_exist(key)
+        ]:
+            async with self._uow as uow:
+                found = await uow.inbox.get_many(keys)
+            for inbox in found.values():
+                if inbox.status == InboxStatus.COMPLETED:
+                    inbox_cache.add(inbox)
+            inboxes |= found
+
+        pending = []
+        seen_keys = set()
+        taken_seats = set()
+        for i, data in enumerate(members_data):
+            member_data = dict(data)
+            idempotency_data = None
+            if key := member_data.pop("idempotency_key", None):
+                request_hash = hash_dict(
+                    member_data | {"event_id": str(event_id)}
+                )
+                inbox = inboxes.get(key)
+                if key in seen_keys or (
+                    inbox and inbox.request_hash != request_hash
+                ):
+                    results[i] = _batch_result(
+                        status.HTTP_409_CONFLICT,
+                        detail="Idempotency key already exists",
+                    )
+                    continue
+                seen_keys.add(key)
+                if inbox and inbox.status == InboxStatus.COMPLETED:
+                    results[i] = _batch_result(
+                        status.HTTP_201_CREATED, **inbox.response
                     )
+                    continue
+                idempotency_data = {"key": key, "request_hash": request_hash}
+                if inbox and inbox.response:
+                    idempotency_data |= inbox.response
+                    taken_seats.add(member_data["seat"])
+                    pending.append((i, member_data, idempotency_data))
+                    continue
 
-        return ticket_id
+            seat = member_data["seat"]
+            if seats_index is not None and seat not in seats_index:
+                detail = "Seat does not exist"
+            elif seat not in available_seats or seat in taken_seats:
+                detail = "Seat is not available"
+            else:
+                taken_seats.add(seat)
+                pending.append((i, member_data, idempotency_data))
+                continue
+            results[i] = _batch_result(
+                status.HTTP_400_BAD_REQUEST, detail=detail
+            )
+
+        return pending
+
+    async def _register_members(
+        self,
+        client: IEventsProviderClient,
+        event_id: UUID,
+        members_data: list[dict[str, Any]],
+    ) -> list[str | BaseException]:
+        """Зарегистрировать участников с ограничением параллельности.
+
+        Ошибки отдельных регистраций возвращаются на месте UUID билета.
+        Каждая регистрация выполняется под защитой предохранителя, чтобы
+        он учитывал ошибки отдельных участников.
+
+        """
+        semaphore = asyncio.Semaphore(settings.tickets_batch_concurrency)
+        breaker = circuit_breakers.get("events_provider.register_member")
+
+        async def register(member_data: dict[str, Any]) -> str:
+            async with semaphore:
+                with breaker.guard():
+                    return await self._register_member(
+                        client, event_id, member_data
+                    )
+
+        return await asyncio.gather(
+            *(register(member_data) for member_data in members_data),
+            return_exceptions=True,
+        )
 
     async def unregister(self, event_id: UUID, ticket_id: UUID):
         """Отменить регистрацию участника на событие."""
@@ -111,6 +448,9 @@ class TicketsService:
             on_success=self._delete_member,
             on_success_kwargs={"ticket_id": ticket_id},
             on_error=self._raise_external_error,
+            circuit_breaker=circuit_breakers.get(
+                "events_provider.unregister_member"
+            ),
         )
 
     async def _unregister_member(
@@ -120,21 +460,86 @@ class TicketsService:
         await client.unregister_member(event_id, ticket_id)
 
     async def _delete_member(self, _: None, ticket_id: UUID):
-        """Удалить участника."""
+        """Удалить участника и увеличить версию состава участников."""
         async with self._uow as uow:
             await uow.members.delete(ticket_id)
             await uow.commit()
+            await self._increment_version(uow)
+        await EventsService.invalidate_etag()
+
+    @staticmethod
+    async def _increment_version(uow: IUnitOfWork):
+        """Увеличить версию состава участников после фиксации.
+
+        Изменения участников уже зафиксированы, поэтому ошибка
+        не возвращается клиенту, а только логируется: кэш ETag процесса
+        все равно сбрасывается, а версия сменится при следующем изменении.
+
+        """
+        try:
+            await uow.members.increment_version()
+        except Exception:
+            logger.exception("Не удалось увеличить версию состава участников")
+
+    async def _raise_register_error(
+        self, e: Exception, idempotency_data: dict[str, Any] | None
+    ):
+        """Вызвать ошибку на внешнюю регистрацию.
+
+        Если внешний API отклонил регистрацию, снимает резервирование
+        ключа идемпотентности, чтобы запрос можно было повторить.
+
+        """
+        if idempotency_data and _is_rejected(e):
+            await self._release([idempotency_data["key"]])
+        await self._raise_external_error(e)
 
     async def _raise_external_error(self, e: Exception):
         """Вызвать ошибку на внешнюю регистрацию.
 
         При ошибке типа `ClientResponseError` с кодом 400
-        будет выброшена ошибка HTTP 400, в остальных случаях - HTTP 500.
+        будет выброшена ошибка HTTP 400, пока предохранитель внешнего API
+        открыт - HTTP 503, в остальных случаях - HTTP 500.
 
         """
+        status_code, detail = self._get_external_error(e)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    @staticmethod
+    def _get_external_error(e: BaseException) -> tuple[int, str | None]:
+        """Получить HTTP-статус и описание ошибки внешнего API."""
         if (
             isinstance(e, ClientResponseError)
             and e.status == status.HTTP_400_BAD_REQUEST
         ):
-            raise HTTPException(status_code=e.status, detail=e.message)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return e.status, e.message
+        if isinstance(e, CircuitBreakerOpenError):
+            return (
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "External API is unavailable",
+            )
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, None
+
+
+def _is_rejected(e: BaseException) -> bool:
+    """Проверить, что внешний API точно не выполнил запрос.
+
+    Запрос не выполнялся, если предохранитель открыт, или был отклонен
+    с кодом 4xx. После таймаутов, ошибок соединения и ответов 5xx
+    исход запроса неизвестен.
+
+    """
+    if isinstance(e, CircuitBreakerOpenError):
+        return True
+    return isinstance(e, ClientResponseError) and e.status < 500
+
+
+def _batch_result(
+    status_code: int, ticket_id: str | None = None, detail: str | None = None
+) -> dict[str, Any]:
+    """Сформировать результат регистрации участника группы."""
+    return {
+        "status_code": status_code,
+        "ticket_id": ticket_id,
+        "detail": detail,
+    }
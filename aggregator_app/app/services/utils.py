@@ -1,15 +1,25 @@
 """Утилиты и вспомогательные элементы сервисов."""
 
+import asyncio
+import functools
 import hashlib
 import json
+import logging
+import time
 from collections.abc import Awaitable, Callable
-from contextlib import AbstractAsyncContextManager
+from contextlib import AbstractAsyncContextManager, nullcontext
 from datetime import UTC
 from typing import Any, Protocol, Self
 
+import backoff
 from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
 scheduler = AsyncIOScheduler(timezone=UTC)
 
 
@@ -33,6 +43,7 @@ async def with_external_client(
     on_success_kwargs: dict[str, Any] | None = None,
     on_error: Callable[..., Awaitable[Any]] | None = None,
     on_error_kwargs: dict[str, Any] | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> Any:
     """Выполнить запрос с инициализацией сессии и обработкой ошибок.
 
@@ -49,16 +60,26 @@ async def with_external_client(
         первый аргумент - ошибка; по умолчанию None.
     - `on_error_kwargs` - Параметры для функции `on_error`;
         по умолчанию None.
+    - `circuit_breaker` - Предохранитель операции; пока он открыт, `func`
+        не вызывается, а в `on_error` передается `CircuitBreakerOpenError`;
+        по умолчанию None.
 
     Возвращает:
     - Результат выполнения функции `on_success` или `func`
         если первая не задана.
 
     """
+    guard = circuit_breaker.guard() if circuit_breaker else nullcontext()
     try:
-        async with client:
-            result = await func(client, **(func_kwargs or {}))
-    except (TimeoutError, ClientConnectionError, ClientResponseError) as e:
+        with guard:
+            async with client:
+                result = await func(client, **(func_kwargs or {}))
+    except (
+        CircuitBreakerOpenError,
+        TimeoutError,
+        ClientConnectionError,
+        ClientResponseError,
+    ) as e:
         if on_error is None:
             raise
         return await on_error(e, **(on_error_kwargs or {}))
@@ -67,6 +88,87 @@ async def with_external_client(
     return await on_success(result, **(on_success_kwargs or {}))
 
 
+def with_budget(
+    name: str, *, timeout: float, deadline: float, max_tries: int = 3
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Декоратор бюджета времени запроса к внешнему API.
+
+    Каждая попытка ограничена `timeout` секундами, при `TimeoutError` или
+    `ClientConnectionError` запрос повторяется с экспоненциальной задержкой,
+    но не более `max_tries` раз. Весь вызов вместе с повторами и задержками
+    ограничен `deadline` секундами: по его истечении выполняемая попытка
+    отменяется и выбрасывается `TimeoutError`.
+
+    Исчерпание бюджетов учитывается в `metrics` счетчиками
+    `<name>.attempt_timeouts` и `<name>.deadline_exceeded`.
+
+    Аргументы:
+    - `name` - Имя операции для метрик, например `events_provider.get_seats`.
+    - `timeout` - Максимальное время одной попытки в секундах.
+    - `deadline` - Максимальное время всего вызова в секундах.
+    - `max_tries` - Максимальное количество попыток; по умолчанию 3.
+
+    """
+
+    def decorator(
+        func: Callable[..., Awaitable[Any]],
+    ) -> Callable[..., Awaitable[Any]]:
+        @backoff.on_exception(
+            backoff.expo,
+            (TimeoutError, ClientConnectionError),
+            max_tries=max_tries,
+            max_time=deadline,
+        )
+        async def attempt(*args, **kwargs):
+            attempt_timeout = asyncio.timeout(timeout)
+            try:
+                async with attempt_timeout:
+                    return await func(*args, **kwargs)
+            except TimeoutError:
+                if attempt_timeout.expired():
+                    metrics.increment(f"{name}.attempt_timeouts")
+                raise
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            call_deadline = asyncio.timeout(deadline)
+            try:
+                async with call_deadline:
+                    return await attempt(*args, **kwargs)
+            except TimeoutError:
+                if call_deadline.expired():
+                    metrics.increment(f"{name}.deadline_exceeded")
+                    logger.warning(
+                        "Превышен дедлайн %.1f с запроса %s", deadline, name
+                    )
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimiter:
+    """Ограничитель частоты запросов к внешнему API.
+
+    Распределяет запросы равномерно: начала двух запросов разделяет
+    не меньше 1 / `rate` секунд, даже если они выполняются параллельно.
+
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._next_time = 0.0
+
+    async def wait(self):
+        """Дождаться возможности выполнить запрос."""
+        now = time.monotonic()
+        delay = self._next_time - now
+        self._next_time = max(now, self._next_time) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
 def hash_dict(data: dict[str, Any]) -> str:
     """Хэшировать словарь с данными."""
     encoded = json.dumps(data, sort_keys=True).encode()
@@ -0,0 +1,7 @@
+"""Микробенчмарки горячих путей приложения.
+
+Запуск из каталога `aggregator_app`, например:
+`python -m benchmarks.idempotency`. Требуются те же переменные окружения,
+что и для приложения.
+
+"""
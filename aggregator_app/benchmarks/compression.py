@@ -0,0 +1,84 @@
+"""Бенчмарк сжатия полного списка событий `GET /events`.
+
+Для страницы из `events` событий, сериализованной как ответ API,
+выводит размер ответа и время сжатия каждой кодировкой
+и уровнем сжатия.
+
+"""
+
+import argparse
+import gzip
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import brotli
+
+from app.api.schemas.events import EVENT_LIST_ROWS_ADAPTER
+from app.orm.models import EventStatus
+
+
+def make_listing(count: int) -> bytes:
+    now = datetime.now(UTC)
+    places = [
+        {
+            "id": uuid4(),
+            "name": f"Place {i}",
+            "city": "Moscow",
+            "address": f"Tverskaya street, {i}",
+        }
+        for i in range(max(count // 10, 1))
+    ]
+    rows = [
+        {
+            "id": uuid4(),
+            "name": f"Event {i}",
+            "place": places[i % len(places)],
+            "event_time": now + timedelta(hours=i),
+            "registration_deadline": now + timedelta(hours=i - 1),
+            "status": EventStatus.PUBLISHED,
+            "number_of_visitors": i % 300,
+        }
+        for i in range(count)
+    ]
+    return EVENT_LIST_ROWS_ADAPTER.dump_json(
+        {"count": count, "next": None, "previous": None, "results": rows}
+    )
+
+
+def get_compressors() -> dict[str, Callable[[bytes], bytes]]:
+    compressors = {"identity": lambda body: body}
+    for level in (1, 6, 9):
+        compressors[f"gzip-{level}"] = lambda body, level=level: gzip.compress(
+            body, compresslevel=level
+        )
+    for quality in (1, 4, 11):
+        compressors[f"br-{quality}"] = lambda body, quality=quality: (
+            brotli.compress(body, quality=quality)
+        )
+    return compressors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-e", "--events", type=int, default=10_000)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    body = make_listing(args.events)
+    print(f"listing: {args.events} events, {len(body) / 1024:.0f} KiB")
+    for name, compress in get_compressors().items():
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            compressed = compress(body)
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(
+            f"{name:<9} {len(compressed) / 1024:>8.0f} KiB"
+            f" {len(compressed) / len(body):>7.1%}"
+            f" {elapsed * 1e3:>9.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Бенчмарк страницы списка событий `GET /events`.
+
+Сравнивает прежний путь (объекты ORM, модель `EventListOutPaginated`
+и JSON-ответ) с текущим (строки из выбранных столбцов, сериализованные
+`EVENT_LIST_ROWS_ADAPTER`) на странице из `page_size` событий.
+
+Требует базу данных с примененными миграциями; тестовые данные
+создаются в транзакции, которая откатывается по завершении.
+
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import CodecJSONResponse
+from app.api.schemas.events import (
+    EVENT_LIST_ROWS_ADAPTER,
+    EventListOutPaginated,
+)
+from app.orm.db_manager import db_manager
+from app.orm.models import Event, EventStatus, Place
+from app.orm.repositories.event import EventRepository
+
+
+async def seed(session: AsyncSession, count: int):
+    now = datetime.now(UTC)
+    places = [
+        Place(
+            id=uuid4(),
+            name=f"Place {i}",
+            city="City",
+            address=f"Street {i}",
+            seats_pattern="A1-100",
+            changed_at=now,
+            created_at=now,
+        )
+        for i in range(max(count // 10, 1))
+    ]
+    session.add_all(places)
+    await session.flush()
+    session.add_all(
+        Event(
+            id=uuid4(),
+            name=f"Event {i}",
+            place_id=places[i % len(places)].id,
+            event_time=now + timedelta(minutes=i),
+            registration_deadline=now + timedelta(minutes=i),
+            status=EventStatus.PUBLISHED,
+            changed_at=now,
+            created_at=now,
+            status_changed_at=now,
+        )
+        for i in range(count)
+    )
+    await session.flush()
+    session.expunge_all()
+
+
+async def orm_path(repo: EventRepository, page_size: int) -> bytes:
+    """Прежний путь: объекты ORM и модель с `from_attributes`."""
+    events = await repo.get_paginated(1, page_size)
+    page = EventListOutPaginated(
+        count=len(events), next=None, previous=None, results=events
+    )
+    return CodecJSONResponse(page.model_dump(mode="json")).body
+
+
+async def rows_path(repo: EventRepository, page_size: int) -> bytes:
+    """Текущий путь: строки без ORM и прямая сериализация в JSON."""
+    rows = await repo.get_paginated_rows(1, page_size)
+    return EVENT_LIST_ROWS_ADAPTER.dump_json(
+        {"count": len(rows), "next": None, "previous": None, "results": rows}
+    )
+
+
+async def measure(
+    name: str,
+    func: Callable[[EventRepository, int], Awaitable[bytes]],
+    session: AsyncSession,
+    page_size: int,
+    repeat: int,
+):
+    repo = EventRepository(session)
+    elapsed = 0.0
+    for _ in range(repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        await func(repo, page_size)
+        elapsed += time.perf_counter() - started
+    print(f"{name:<8} {elapsed / repeat * 1e3:>8.2f} ms/page")
+
+
+async def run(page_size: int, repeat: int):
+    await db_manager.init()
+    try:
+        async with db_manager.session() as session:
+            await seed(session, page_size)
+            print(f"page: {page_size} events")
+            await measure("orm", orm_path, session, page_size, repeat)
+            await measure("rows", rows_path, session, page_size, repeat)
+    finally:
+        await db_manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-p", "--page-size", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
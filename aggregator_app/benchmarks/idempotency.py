@@ -0,0 +1,144 @@
+"""Бенчмарк проверки идемпотентности регистрации участника.
+
+Сравнивает прежний путь (повторный разбор тела запроса и хэширование
+сырого словаря) с текущим (хэширование провалидированной модели),
+а также измеряет пропускную способность зависимости
+`get_idempotency_data` при конкурентных запросах.
+
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from app.api.dependencies import get_idempotency_data
+from app.api.schemas.members import MemberIn
+from app.orm.models import Inbox, InboxStatus
+from app.services.inbox import InboxService
+from app.services.utils import hash_dict
+
+
+class MemoryInboxRepository:
+    """Репозиторий inbox с хранением записей в памяти."""
+
+    def __init__(self, inbox: dict[str, Inbox]):
+        self._inbox = inbox
+
+    async def get(self, key: str) -> Inbox | None:
+        return self._inbox.get(key)
+
+    async def reserve(self, reservations: dict[str, str]) -> set[str]:
+        reserved = set()
+        for key, request_hash in reservations.items():
+            if key not in self._inbox:
+                self._inbox[key] = Inbox(
+                    key=key,
+                    request_hash=request_hash,
+                    status=InboxStatus.IN_PROGRESS,
+                )
+                reserved.add(key)
+        return reserved
+
+
+class MemoryUnitOfWork:
+    """Unit of Work с репозиторием inbox в памяти."""
+
+    def __init__(self, inbox: dict[str, Inbox]):
+        self.inbox = MemoryInboxRepository(inbox)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def commit(self):
+        pass
+
+
+def make_body(key: str) -> bytes:
+    return json.dumps(
+        {
+            "first_name": "Ivan",
+            "last_name": "Ivanov",
+            "email": "ivan@example.com",
+            "seat": "A1",
+            "event_id": str(uuid4()),
+            "idempotency_key": key,
+        }
+    ).encode()
+
+
+def legacy_path(raw: bytes) -> str:
+    """Прежний путь: модель для эндпоинта и повторный разбор для ключа."""
+    MemberIn.model_validate_json(raw)
+    body = json.loads(raw)
+    body.pop("idempotency_key")
+    return hash_dict(body)
+
+
+def current_path(raw: bytes) -> str:
+    """Текущий путь: одна валидация и хэш канонической модели."""
+    member = MemberIn.model_validate_json(raw)
+    return hash_dict(
+        member.model_dump(mode="json", exclude={"idempotency_key"})
+    )
+
+
+def measure(name: str, func: Callable[[bytes], Any], bodies: list[bytes]):
+    started = time.perf_counter()
+    for raw in bodies:
+        func(raw)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<12} {len(bodies) / elapsed:>12,.0f} req/s"
+        f" {elapsed / len(bodies) * 1e6:>8.2f} us/req"
+    )
+
+
+async def measure_dependency(bodies: list[bytes], concurrency: int):
+    members = [MemberIn.model_validate_json(raw) for raw in bodies]
+    inbox = {
+        member.idempotency_key: Inbox(
+            key=member.idempotency_key,
+            request_hash=hash_dict(
+                member.model_dump(mode="json", exclude={"idempotency_key"})
+            ),
+            response={"ticket_id": str(uuid4())},
+        )
+        for member in members[::2]
+    }
+    service = InboxService(MemoryUnitOfWork(inbox), scheduler=None)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(member: MemberIn):
+        async with semaphore:
+            await get_idempotency_data(member, service)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(member) for member in members))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'dependency':<12} {len(members) / elapsed:>12,.0f} req/s"
+        f" (concurrency {concurrency}, 50% cache hits)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--requests", type=int, default=100_000)
+    parser.add_argument("-c", "--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    bodies = [make_body(f"key-{i}") for i in range(args.requests)]
+    measure("legacy", legacy_path, bodies)
+    measure("current", current_path, bodies)
+    asyncio.run(measure_dependency(bodies, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
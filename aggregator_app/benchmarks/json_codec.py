@@ -0,0 +1,50 @@
+"""Бенчмарк разбора страницы событий EventsProvider API.
+
+Сравнивает время разбора и сериализации страницы из 1000 событий
+всеми реализациями JSON.
+
+"""
+
+import argparse
+import time
+
+from app.services.json_codec import get_json_codecs
+from benchmarks.parser import make_events
+
+
+def make_page(count: int) -> bytes:
+    page = {
+        "next": "http://events-provider/api/events/?cursor=abc",
+        "previous": None,
+        "results": make_events(count, places_count=max(count // 10, 1)),
+    }
+    return get_json_codecs()["stdlib"].dumps(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-e", "--events", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    raw = make_page(args.events)
+    text = raw.decode()
+    print(f"page: {args.events} events, {len(raw) / 1024:.0f} KiB")
+    for name, codec in get_json_codecs().items():
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            page = codec.loads(text)
+        decode = (time.perf_counter() - started) / args.repeat
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            codec.dumps(page)
+        encode = (time.perf_counter() - started) / args.repeat
+        print(
+            f"{name:<8} decode {decode * 1e3:>8.2f} ms/page"
+            f"   encode {encode * 1e3:>8.2f} ms/page"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Бенчмарк разбора страниц событий EventsProvider API.
+
+Сравнивает три пути от ответа API в байтах до словарей для upsert:
+- `legacy` - разбор JSON, проверка типа каждого столбца модели,
+    полный пересчет часового пояса и построение индекса мест
+    для каждого события;
+- `dict` - разбор JSON и изменение словарей по заранее построенному
+    плану столбцов с датами;
+- `typed` - текущий путь: разбор и валидация страницы схемой
+    за один проход (`validate_events_page`) и `EventsProviderParser`.
+
+"""
+
+import argparse
+import functools
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import DateTime
+
+from app.orm.models import Base, Event, EventStatus, Place
+from app.services.events_provider import (
+    EventsProviderParser,
+    build_seats_index,
+    validate_events_page,
+)
+from app.services.seats import SeatsIndex
+
+
+class LegacyParser:
+    """Парсер событий без предварительного плана столбцов."""
+
+    def parse_event_dict(
+        self, data: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        place_data = data.pop("place")
+        self._prepare_place(place_data)
+        self._prepare_event(data)
+        return data | {"place_id": place_data["id"]}, place_data
+
+    def _prepare_event(self, event_data: dict[str, Any]):
+        del event_data["number_of_visitors"]
+        try:
+            event_data["status"] = EventStatus(event_data["status"])
+        except ValueError:
+            event_data["status"] = EventStatus.OTHER
+        self._convert_datetime(event_data, Event)
+
+    def _prepare_place(self, place_data: dict[str, Any]):
+        self._convert_datetime(place_data, Place)
+        try:
+            seats_index = SeatsIndex.from_pattern(place_data["seats_pattern"])
+        except ValueError:
+            place_data["seats_index"] = None
+        else:
+            place_data["seats_index"] = seats_index.to_json()
+
+    def _convert_datetime(self, data: dict[str, Any], cls_: type[Base]):
+        for c in cls_.__table__.c:
+            if isinstance(c.type, DateTime) and c.key in data:
+                data[c.key] = datetime.fromisoformat(data[c.key]).astimezone(
+                    UTC
+                )
+
+
+@functools.cache
+def get_datetime_fields(cls_: type[Base]) -> tuple[str, ...]:
+    return tuple(
+        c.key for c in cls_.__table__.c if isinstance(c.type, DateTime)
+    )
+
+
+def parse_datetime(value: str) -> datetime:
+    result = datetime.fromisoformat(value)
+    if result.tzinfo is UTC:
+        return result
+    return result.astimezone(UTC)
+
+
+class DictParser(LegacyParser):
+    """Парсер событий с планом столбцов и изменением словарей на месте."""
+
+    def parse_event_dict(
+        self, data: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        place_data = data.pop("place")
+        self._prepare_place(place_data)
+        self._prepare_event(data)
+        data["place_id"] = place_data["id"]
+        return data, place_data
+
+    def _prepare_place(self, place_data: dict[str, Any]):
+        self._convert_datetime(place_data, Place)
+        place_data["seats_index"] = build_seats_index(
+            place_data["seats_pattern"]
+        )
+
+    def _convert_datetime(self, data: dict[str, Any], cls_: type[Base]):
+        for key in get_datetime_fields(cls_):
+            if key in data:
+                data[key] = parse_datetime(data[key])
+
+
+def legacy_path(raw: bytes, parser: LegacyParser) -> int:
+    events = json.loads(raw)["results"]
+    for event in events:
+        parser.parse_event_dict(event)
+    return len(events)
+
+
+def typed_path(raw: bytes, parser: EventsProviderParser) -> int:
+    events = validate_events_page(raw)["results"]
+    for event in events:
+        parser.parse_event_dict(event)
+    return len(events)
+
+
+def make_events(count: int, places_count: int) -> list[dict[str, Any]]:
+    now = datetime.now(UTC)
+    places = [
+        {
+            "id": str(uuid4()),
+            "name": f"Hall {i}",
+            "city": "Moscow",
+            "address": f"Street {i}",
+            "seats_pattern": f"A1-{100 + i},B1-B50",
+            "changed_at": now.isoformat(),
+            "created_at": now.isoformat(),
+        }
+        for i in range(places_count)
+    ]
+    events = []
+    for i in range(count):
+        changed_at = (now - timedelta(seconds=i)).isoformat()
+        events.append(
+            {
+                "id": str(uuid4()),
+                "name": f"Event {i}",
+                "place": dict(places[i % places_count]),
+                "status": EventStatus.PUBLISHED.value,
+                "event_time": changed_at,
+                "registration_deadline": changed_at,
+                "changed_at": changed_at,
+                "created_at": changed_at,
+                "status_changed_at": changed_at,
+                "number_of_visitors": 10,
+            }
+        )
+    return events
+
+
+def measure(
+    name: str,
+    parse_page: Callable[[bytes], int],
+    raw: bytes,
+    pages: int,
+):
+    started = time.perf_counter()
+    count = sum(parse_page(raw) for _ in range(pages))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<8} {count / elapsed:>12,.0f} events/s"
+        f" {elapsed / count * 1e6:>8.2f} us/event"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--events", type=int, default=1_000_000)
+    parser.add_argument("-s", "--page-size", type=int, default=1000)
+    parser.add_argument("-p", "--places", type=int, default=100)
+    args = parser.parse_args()
+
+    raw = json.dumps(
+        {"next": None, "results": make_events(args.page_size, args.places)}
+    ).encode()
+    pages = max(args.events // args.page_size, 1)
+    print(f"{pages * args.page_size:,} events in pages of {args.page_size}")
+
+    legacy, dict_parser = LegacyParser(), DictParser()
+    typed = EventsProviderParser()
+    measure("legacy", lambda raw: legacy_path(raw, legacy), raw, pages)
+    measure("dict", lambda raw: legacy_path(raw, dict_parser), raw, pages)
+    measure("typed", lambda raw: typed_path(raw, typed), raw, pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Бенчмарк полнотекстового поиска событий `GET /events?q=...`.
+
+Измеряет время страницы найденных событий, отсортированных
+по релевантности, и подсчета их количества среди `count` событий.
+Вектор поиска заполняется `update_search_vectors` по всем местам
+проведения, как при синхронизации новых мест.
+
+Требует базу данных с примененными миграциями; тестовые данные
+создаются в транзакции, которая откатывается по завершении.
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.filters import EventFilter
+from app.orm.db_manager import db_manager
+from app.orm.models import Place
+from app.orm.repositories.event import EventRepository
+
+WORDS = ("jazz", "rock", "opera", "ballet", "folk", "stand-up", "quiz")
+QUERIES = ("jazz", "rock festival", '"opera night"', "folk -club", "quiz 42")
+
+
+async def seed(session: AsyncSession, count: int):
+    words = "ARRAY[" + ", ".join(f"'{word}'" for word in WORDS) + "]"
+    places = max(count // 100, 1)
+    await session.execute(
+        text(
+            "INSERT INTO places"
+            " (id, name, city, address, seats_pattern, changed_at, created_at)"
+            f" SELECT gen_random_uuid(), ({words})[i % {len(WORDS)} + 1]"
+            " || ' club ' || i, 'City ' || i % 50, 'Street ' || i,"
+            " 'A1-100', NOW(), NOW()"
+            f" FROM generate_series(1, {places}) AS i"
+        )
+    )
+    await session.execute(
+        text(
+            "INSERT INTO events (id, name, place_id, event_time,"
+            " registration_deadline, status, changed_at, created_at,"
+            " status_changed_at)"
+            f" SELECT gen_random_uuid(), ({words})[i % {len(WORDS)} + 1]"
+            f" || CASE WHEN i % 3 = 0 THEN ' festival' ELSE ' night' END"
+            f" || ' ' || i % 1000, p.ids[i % {places} + 1],"
+            " NOW() + i * INTERVAL '1 minute', NOW(), 'PUBLISHED',"
+            " NOW(), NOW(), NOW()"
+            f" FROM generate_series(1, {count}) AS i,"
+            " (SELECT array_agg(id) AS ids FROM places) AS p"
+        )
+    )
+    place_ids = (await session.scalars(select(Place.id))).all()
+    await EventRepository(session).update_search_vectors(place_ids)
+    await session.execute(text("ANALYZE places, events"))
+
+
+async def measure(repo: EventRepository, q: str, page_size: int, repeat: int):
+    filter_ = EventFilter(q=q)
+    page = count = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await repo.get_paginated_rows(1, page_size, filter_)
+        page += time.perf_counter() - started
+        started = time.perf_counter()
+        found = await repo.get_count(filter_)
+        count += time.perf_counter() - started
+    print(
+        f"{q:<16} {found:>9} found"
+        f" {page / repeat * 1e3:>8.2f} ms/page"
+        f" {count / repeat * 1e3:>8.2f} ms/count"
+    )
+
+
+async def run(count: int, page_size: int, repeat: int):
+    await db_manager.init()
+    try:
+        async with db_manager.session() as session:
+            await seed(session, count)
+            print(f"events: {count}, page: {page_size}")
+            repo = EventRepository(session)
+            for q in QUERIES:
+                await measure(repo, q, page_size, repeat)
+    finally:
+        await db_manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-c", "--count", type=int, default=1_000_000)
+    parser.add_argument("-p", "--page-size", type=int, default=50)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
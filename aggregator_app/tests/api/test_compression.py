@@ -0,0 +1,131 @@
+"""Тесты сжатия ответов API."""
+
+import gzip
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from app.api.compression import (
+    Compression,
+    CompressionMiddleware,
+    get_accepted_encodings,
+    get_encodings,
+)
+from app.config import settings
+from tests.helpers import FakeUnitOfWork, create_event
+
+
+def _add_events(uow: FakeUnitOfWork, count: int):
+    events = [create_event() for _ in range(count)]
+    uow.events.events = {event.id: event for event in events}
+
+
+@pytest.mark.asyncio
+async def test_events_gzip(client: AsyncClient, uow: FakeUnitOfWork):
+    _add_events(uow, 20)
+
+    response = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["results"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_small_response_not_compressed(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    response = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.content) < settings.response_compression_minimum_size
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_identity_when_gzip_refused(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    _add_events(uow, 20)
+
+    response = await client.get(
+        "/events", headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "content-encoding" not in response.headers
+    with pytest.raises(gzip.BadGzipFile):
+        gzip.decompress(response.content)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("", set()),
+        ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+        ("br;q=0, GZIP;q=0.5", {"gzip"}),
+        ("gzip; q=0.0", set()),
+    ],
+)
+def test_get_accepted_encodings(header: str, expected: set[str]):
+    assert get_accepted_encodings(header) == expected
+
+
+@pytest.mark.asyncio
+async def test_events_brotli(client: AsyncClient, uow: FakeUnitOfWork):
+    _add_events(uow, 20)
+
+    response = await client.get(
+        "/events", headers={"Accept-Encoding": "gzip, br"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()["results"]) == 20
+
+
+@pytest.mark.parametrize(
+    ("compression", "expected"),
+    [
+        ("off", ()),
+        ("gzip", ("gzip",)),
+        ("br", ("br", "gzip")),
+        ("auto", ("br", "gzip")),
+    ],
+)
+def test_get_encodings(compression: Compression, expected: tuple[str, ...]):
+    assert get_encodings(compression) == expected
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_gzip():
+    chunks = [b"x" * 600, b"y" * 600, b""]
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    middleware = CompressionMiddleware(app, encodings=("gzip",))
+    async with AsyncClient(
+        transport=ASGITransport(app=middleware), base_url="http://test"
+    ) as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"".join(chunks)
@@ -0,0 +1,59 @@
+"""Тесты API диагностики."""
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.services.circuit_breaker import circuit_breakers
+from app.services.events_provider import validate_events_page
+from app.services.metrics import metrics
+from tests.helpers import get_raw_event
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(client: AsyncClient):
+    metrics.reset()
+    metrics.increment("events_provider.get_seats.deadline_exceeded")
+
+    response = await client.get("/diagnostics/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"events_provider.get_seats.deadline_exceeded": 1}
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_get_circuit_breakers(client: AsyncClient):
+    circuit_breakers.reset()
+    circuit_breakers.get("notification.notify")
+
+    response = await client.get("/diagnostics/circuit-breakers")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {
+            "name": "notification.notify",
+            "state": "closed",
+            "failures": 0,
+            "failure_threshold": 5,
+            "retry_in_seconds": None,
+        }
+    ]
+    circuit_breakers.reset()
+
+
+@pytest.mark.asyncio
+async def test_get_quarantine(client: AsyncClient):
+    raw_event = get_raw_event()
+    raw_event["status_changed_at"] = None
+    validate_events_page({"next": None, "results": [raw_event]})
+
+    response = await client.get("/diagnostics/quarantine")
+
+    assert response.status_code == status.HTTP_200_OK
+    [quarantined] = response.json()
+    assert quarantined["event_id"] == raw_event["id"]
+    assert quarantined["reasons"] == [
+        "status_changed_at: Input should be a valid datetime"
+    ]
+    assert quarantined["data"] == raw_event
@@ -1,12 +1,17 @@
 """Тесты API событий."""
 
+import json
+from datetime import timedelta
 from uuid import uuid4
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from app.api.schemas.events import EventListOutPaginated
+from app.config import settings
 from app.orm.models import EventStatus
+from app.services.events import EventsService
 from tests.helpers import (
     FakeEventsProviderClient,
     FakeUnitOfWork,
@@ -32,6 +37,23 @@ async def test_get_events(client: AsyncClient, uow: FakeUnitOfWork):
     assert str(event2.id) in ids
 
 
+@pytest.mark.asyncio
+async def test_get_events_matches_schema(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event()
+    uow.events.events = {event.id: event}
+
+    response = await client.get("/events")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    expected = EventListOutPaginated(
+        count=1, next=None, previous=None, results=[event]
+    )
+    assert response.json() == expected.model_dump(mode="json")
+
+
 @pytest.mark.asyncio
 async def test_get_events_with_pagination(
     client: AsyncClient, uow: FakeUnitOfWork
@@ -61,6 +83,16 @@ async def test_get_events_with_pagination(
     assert data["previous"] is not None
 
 
+@pytest.mark.asyncio
+async def test_get_events_page_size_limit(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    response = await client.get(
+        "/events", params={"page_size": settings.events_max_page_size + 1}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.asyncio
 async def test_get_events_with_filter(client: AsyncClient, uow: FakeUnitOfWork):
     event = create_event()
@@ -75,6 +107,89 @@ async def test_get_events_with_filter(client: AsyncClient, uow: FakeUnitOfWork):
     assert response.json()["count"] == 0
 
 
+@pytest.mark.asyncio
+async def test_get_events_with_place_and_status_filters(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event(status=EventStatus.PUBLISHED)
+    other = create_event(status=EventStatus.NEW)
+    uow.events.events = {event.id: event, other.id: other}
+
+    response = await client.get(
+        "/events",
+        params={
+            "status": "published,other",
+            "city": event.place.city,
+            "place_id": str(event.place_id),
+            "date_to": event.event_time.date().isoformat(),
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [result["id"] for result in data["results"]] == [str(event.id)]
+
+    response = await client.get("/events", params={"status": "unknown"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_events_search(client: AsyncClient, uow: FakeUnitOfWork):
+    event = create_event()
+    event.name = "Jazz concert"
+    other = create_event()
+    uow.events.events = {event.id: event, other.id: other}
+
+    response = await client.get("/events", params={"q": "jazz"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == 1
+    assert data["results"][0]["id"] == str(event.id)
+
+    response = await client.get("/events", params={"q": ""})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_export_events(
+    client: AsyncClient, uow: FakeUnitOfWork, monkeypatch: pytest.MonkeyPatch
+):
+    events = [create_event(timedelta=timedelta(hours=i)) for i in range(3)]
+    uow.events.events = {event.id: event for event in events}
+    monkeypatch.setattr(settings, "events_export_batch_size", 2)
+
+    response = await client.get("/events/export")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        str(event.id) for event in events
+    ]
+    expected = EventListOutPaginated(
+        count=1, next=None, previous=None, results=[events[0]]
+    )
+    assert (
+        json.loads(lines[0]) == expected.model_dump(mode="json")["results"][0]
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_events_with_filter(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event()
+    uow.events.events = {event.id: event}
+
+    response = await client.get(
+        "/events/export", params={"date_from": "3000-01-01"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b""
+
+
 @pytest.mark.asyncio
 async def test_get_event_by_id(client: AsyncClient, uow: FakeUnitOfWork):
     event = create_event()
@@ -89,8 +204,59 @@ async def test_get_event_by_id(client: AsyncClient, uow: FakeUnitOfWork):
 
 
 @pytest.mark.asyncio
-async def test_get_event_by_id_not_found(client: AsyncClient):
-    response = await client.get(f"/events/{uuid4()}")
+async def test_get_events_not_modified(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event()
+    uow.events.events = {event.id: event}
+    await EventsService.invalidate_etag()
+
+    response = await client.get("/events")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == settings.events_cache_control
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}'):
+        response = await client.get(
+            "/events", headers={"If-None-Match": if_none_match}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    uow.events.data_version = "1"
+    await EventsService.invalidate_etag()
+    response = await client.get("/events", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_event_by_id_not_modified(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event()
+    uow.events.events = {event.id: event}
+    await EventsService.invalidate_etag()
+
+    response = await client.get(f"/events/{event.id}")
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == settings.events_cache_control
+
+    response = await client.get(
+        f"/events/{event.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.parametrize("headers", [{}, {"If-None-Match": "*"}])
+@pytest.mark.asyncio
+async def test_get_event_by_id_not_found(
+    client: AsyncClient, headers: dict[str, str]
+):
+    response = await client.get(f"/events/{uuid4()}", headers=headers)
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json()["detail"] == "Event not found"
 
@@ -113,6 +279,27 @@ async def test_get_event_seats(
     assert data["available_seats"] == ["A1", "A2", "A3"]
 
 
+@pytest.mark.asyncio
+async def test_get_event_seats_diff(
+    client: AsyncClient,
+    uow: FakeUnitOfWork,
+    provider_client: FakeEventsProviderClient,
+):
+    event = create_event(status=EventStatus.PUBLISHED)
+    event.place.seats_pattern = "A1-3"
+    uow.events.events = {event.id: event}
+    provider_client.kwargs["seats"] = {"seats": ["A1", "A3"]}
+
+    response = await client.get(
+        f"/events/{event.id}/seats", params={"diff": True}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["seats_pattern"] == "A1-3"
+    assert data["unavailable_seats"] == ["A2"]
+
+
 @pytest.mark.asyncio
 async def test_get_event_seats_event_not_found(client: AsyncClient):
     response = await client.get(f"/events/{uuid4()}/seats")
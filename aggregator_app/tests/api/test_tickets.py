@@ -1,18 +1,22 @@
 """Тесты API регистрации участников."""
 
+import asyncio
 from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 
-from app.orm.models import EventStatus, Inbox, Member
+from app.config import settings
+from app.orm.models import EventStatus, InboxStatus, Member
 from app.services.utils import hash_dict
 from tests.helpers import (
     FakeEventsProviderClient,
     FakeUnitOfWork,
     create_event,
+    create_inbox,
     get_raw_member,
 )
 
@@ -79,6 +83,25 @@ async def test_register_seat_not_available(
     assert response.json()["detail"] == "Seat is not available"
 
 
+@pytest.mark.asyncio
+async def test_register_seat_not_exists(
+    client: AsyncClient,
+    uow: FakeUnitOfWork,
+    provider_client: FakeEventsProviderClient,
+):
+    event = create_event(
+        status=EventStatus.PUBLISHED, timedelta=timedelta(hours=1)
+    )
+    uow.events.events = {event.id: event}
+    provider_client.get_seats = AsyncMock()
+
+    member_data = get_raw_member() | {"event_id": str(event.id), "seat": "C1"}
+    response = await client.post("/tickets", json=member_data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Seat does not exist"
+    assert not provider_client.get_seats.called
+
+
 @pytest.mark.asyncio
 async def test_register_deadline_expired(
     client: AsyncClient, uow: FakeUnitOfWork
@@ -146,8 +169,8 @@ async def test_register_idempotency_key_already_exists(
 ):
     member_data = get_raw_member() | {"event_id": str(uuid4())}
     saved_response = {"ticket_id": "123"}
-    inbox = Inbox(
-        key="123", request_hash=hash_dict(member_data), response=saved_response
+    inbox = create_inbox(
+        "123", request_hash=hash_dict(member_data), response=saved_response
     )
     uow.inbox.inbox = {inbox.key: inbox}
 
@@ -157,12 +180,49 @@ async def test_register_idempotency_key_already_exists(
     assert response.json() == saved_response
 
 
+@pytest.mark.asyncio
+async def test_register_idempotency_key_hashes_validated_body(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    member_data = get_raw_member() | {"event_id": str(uuid4())}
+    saved_response = {"ticket_id": "123"}
+    inbox = create_inbox(
+        "123", request_hash=hash_dict(member_data), response=saved_response
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    body = dict(reversed(member_data.items()))
+    body |= {"idempotency_key": inbox.key, "unknown": "ignored"}
+    response = await client.post("/tickets", json=body)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == saved_response
+
+
+@pytest.mark.asyncio
+async def test_register_idempotency_key_raw_body_hash_conflict(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    member_data = get_raw_member() | {
+        "email": "first.last@EXAMPLE.com",
+        "event_id": str(uuid4()),
+    }
+    inbox = create_inbox(
+        "123", request_hash=hash_dict(member_data), response={}
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    member_data["idempotency_key"] = inbox.key
+    response = await client.post("/tickets", json=member_data)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"] == "Idempotency key already exists"
+
+
 @pytest.mark.asyncio
 async def test_register_idempotency_key_conflict(
     client: AsyncClient, uow: FakeUnitOfWork
 ):
     member_data = get_raw_member() | {"event_id": "123"}
-    inbox = Inbox(key="123", request_hash=hash_dict(member_data))
+    inbox = create_inbox("123", request_hash=hash_dict(member_data))
     uow.inbox.inbox = {inbox.key: inbox}
 
     member_data["idempotency_key"] = inbox.key
@@ -173,6 +233,114 @@ async def test_register_idempotency_key_conflict(
     assert response.json()["detail"] == "Idempotency key already exists"
 
 
+@pytest.mark.asyncio
+async def test_register_idempotency_key_in_progress(
+    client: AsyncClient, uow: FakeUnitOfWork, monkeypatch
+):
+    monkeypatch.setattr(settings, "inbox_wait_seconds_timeout", 0)
+    member_data = get_raw_member() | {"event_id": str(uuid4())}
+    inbox = create_inbox(
+        "123",
+        request_hash=hash_dict(member_data),
+        status=InboxStatus.IN_PROGRESS,
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    member_data["idempotency_key"] = inbox.key
+    response = await client.post("/tickets", json=member_data)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert (
+        response.json()["detail"]
+        == "Request with this idempotency key is in progress"
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_idempotency_key_waits_for_first_request(
+    client: AsyncClient, uow: FakeUnitOfWork, monkeypatch
+):
+    monkeypatch.setattr(settings, "inbox_wait_seconds_interval", 0.01)
+    member_data = get_raw_member() | {"event_id": str(uuid4())}
+    inbox = create_inbox(
+        "123",
+        request_hash=hash_dict(member_data),
+        status=InboxStatus.IN_PROGRESS,
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    async def complete():
+        await asyncio.sleep(0.05)
+        await uow.inbox.complete(inbox.key, {"ticket_id": "123"})
+
+    member_data["idempotency_key"] = inbox.key
+    response, _ = await asyncio.gather(
+        client.post("/tickets", json=member_data), complete()
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {"ticket_id": "123"}
+
+
+@pytest.mark.asyncio
+async def test_register_releases_idempotency_key_on_error(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    member_data = get_raw_member() | {"event_id": str(uuid4())}
+    member_data["idempotency_key"] = "123"
+
+    response = await client.post("/tickets", json=member_data)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert uow.inbox.inbox == {}
+
+
+@pytest.mark.asyncio
+async def test_register_keeps_idempotency_key_after_registration(
+    client: AsyncClient,
+    uow: FakeUnitOfWork,
+    provider_client: FakeEventsProviderClient,
+    monkeypatch,
+):
+    event = create_event(
+        status=EventStatus.PUBLISHED, timedelta=timedelta(hours=1)
+    )
+    uow.events.events = {event.id: event}
+    provider_client.kwargs["seats"] = {"seats": ["A1"]}
+    ticket_id = str(uuid4())
+    provider_client.kwargs["ticket_id"] = {"ticket_id": ticket_id}
+    monkeypatch.setattr(
+        uow.members, "create", MagicMock(side_effect=RuntimeError)
+    )
+
+    member_data = get_raw_member() | {"event_id": str(event.id)}
+    member_data["idempotency_key"] = "123"
+    with pytest.raises(RuntimeError):
+        await client.post("/tickets", json=member_data)
+
+    assert uow.inbox.inbox["123"].status == InboxStatus.IN_PROGRESS
+    assert uow.inbox.inbox["123"].response == {"ticket_id": ticket_id}
+
+
+@pytest.mark.asyncio
+async def test_register_idempotency_key_reuses_held_ticket(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    member_data = get_raw_member() | {"event_id": str(uuid4())}
+    ticket_id = str(uuid4())
+    inbox = create_inbox(
+        "123",
+        request_hash=hash_dict(member_data),
+        response={"ticket_id": ticket_id},
+        status=InboxStatus.IN_PROGRESS,
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    member_data["idempotency_key"] = inbox.key
+    response = await client.post("/tickets", json=member_data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {"ticket_id": ticket_id}
+    assert uow.inbox.inbox["123"].status == InboxStatus.COMPLETED
+
+
 @pytest.mark.asyncio
 async def test_unregister(
     client: AsyncClient,
@@ -214,3 +382,90 @@ async def test_unregister_event_already_passed(
     response = await client.delete(f"/tickets/{ticket_id}")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json()["detail"] == "The event has already passed"
+
+
+def _get_raw_batch(event_id, *seats, **item_kwargs):
+    return {
+        "event_id": str(event_id),
+        "members": [
+            get_raw_member() | {"seat": seat} | item_kwargs for seat in seats
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_register_batch(
+    client: AsyncClient,
+    uow: FakeUnitOfWork,
+    provider_client: FakeEventsProviderClient,
+):
+    event = create_event(
+        status=EventStatus.PUBLISHED, timedelta=timedelta(hours=1)
+    )
+    uow.events.events = {event.id: event}
+    provider_client.kwargs["seats"] = {"seats": ["A1", "A2", "A3"]}
+    provider_client.register_member = AsyncMock(
+        side_effect=lambda *_: {"ticket_id": str(uuid4())}
+    )
+
+    response = await client.post(
+        "/tickets/batch", json=_get_raw_batch(event.id, "A1", "A2", "A1", "C1")
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [r["status_code"] for r in results] == [201, 201, 400, 400]
+    assert results[2]["detail"] == "Seat is not available"
+    assert results[3]["detail"] == "Seat does not exist"
+    assert set(uow.members.members) == {
+        results[0]["ticket_id"],
+        results[1]["ticket_id"],
+    }
+    assert len(uow.outbox.outbox) == 2
+    assert provider_client.register_member.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_register_batch_idempotency(
+    client: AsyncClient,
+    uow: FakeUnitOfWork,
+    provider_client: FakeEventsProviderClient,
+):
+    event = create_event(
+        status=EventStatus.PUBLISHED, timedelta=timedelta(hours=1)
+    )
+    uow.events.events = {event.id: event}
+    provider_client.kwargs["seats"] = {"seats": ["A1"]}
+    ticket_id = str(uuid4())
+    provider_client.kwargs["ticket_id"] = {"ticket_id": ticket_id}
+
+    batch = _get_raw_batch(event.id, "A1", "A1", idempotency_key="123")
+    response = await client.post("/tickets/batch", json=batch)
+
+    results = response.json()["results"]
+    assert [r["status_code"] for r in results] == [201, 409]
+    assert uow.inbox.inbox["123"].response == {"ticket_id": ticket_id}
+
+    batch["members"] = batch["members"][:1]
+    response = await client.post("/tickets/batch", json=batch)
+    assert response.json()["results"][0]["ticket_id"] == ticket_id
+    assert len(uow.members.members) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_batch_event_not_published(
+    client: AsyncClient, uow: FakeUnitOfWork
+):
+    event = create_event(timedelta=timedelta(hours=1))
+    uow.events.events = {event.id: event}
+    response = await client.post(
+        "/tickets/batch", json=_get_raw_batch(event.id, "A1")
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Event is not published"
+
+
+@pytest.mark.asyncio
+async def test_register_batch_validation_empty(client: AsyncClient):
+    response = await client.post("/tickets/batch", json=_get_raw_batch(uuid4()))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
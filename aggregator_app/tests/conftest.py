@@ -5,6 +5,10 @@ import pytest_asyncio
 from cashews import cache
 
 from app.orm.db_manager import db_manager
+from app.services.circuit_breaker import circuit_breakers
+from app.services.events_provider import event_quarantine
+from app.services.inbox_cache import inbox_cache
+from app.services.metrics import metrics
 
 
 @pytest_asyncio.fixture(scope="session", autouse=True)
@@ -17,3 +21,16 @@ async def init_db_manager():
 @pytest.fixture(scope="session", autouse=True)
 def init_cache():
     cache.setup("mem://")
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    circuit_breakers.reset()
+    inbox_cache.reset()
+    event_quarantine.reset()
+    metrics.reset()
+    yield
+    circuit_breakers.reset()
+    inbox_cache.reset()
+    event_quarantine.reset()
+    metrics.reset()
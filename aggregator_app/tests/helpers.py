@@ -1,5 +1,6 @@
 """Вспомогательные функции для тестов."""
 
+import json
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock
@@ -13,6 +14,7 @@ from app.orm.models import (
     Event,
     EventStatus,
     Inbox,
+    InboxStatus,
     Member,
     Outbox,
     OutboxStatus,
@@ -20,14 +22,19 @@ from app.orm.models import (
     SyncMeta,
     SyncStatus,
 )
-from app.orm.repositories.event import IEventRepository
+from app.orm.repositories.base import UpsertStats
+from app.orm.repositories.event import EventLoad, IEventRepository
 from app.orm.repositories.inbox import IInboxRepository
 from app.orm.repositories.member import IMemberRepository
 from app.orm.repositories.outbox import IOutboxRepository
+from app.orm.repositories.partition import IPartitionRepository
 from app.orm.repositories.place import IPlaceRepository
 from app.orm.repositories.sync_meta import ISyncMetaRepository
 from app.orm.uow import IUnitOfWork
-from app.services.events_provider import IEventsProviderClient
+from app.services.events_provider import (
+    IEventsProviderClient,
+    validate_events_page,
+)
 
 
 def get_alembic_cfg():
@@ -78,6 +85,22 @@ def create_event(
     return event
 
 
+def create_inbox(
+    key: str,
+    request_hash: str = "hash",
+    response: dict | None = None,
+    status: InboxStatus = InboxStatus.COMPLETED,
+    expires_in: timedelta = timedelta(hours=1),
+):
+    return Inbox(
+        key=key,
+        request_hash=request_hash,
+        response=response,
+        status=status,
+        expires_at=get_datetime_now() + expires_in,
+    )
+
+
 def model_to_dict(model: Base):
     return {c.key: getattr(model, c.key) for c in model.__table__.c}
 
@@ -127,6 +150,9 @@ def get_external_client_mock_response(expected_result):
     mock_response.__aenter__.return_value = mock_response
     mock_response.__aexit__.return_value = None
     mock_response.json = AsyncMock(return_value=expected_result)
+    mock_response.read = AsyncMock(
+        return_value=json.dumps(expected_result).encode()
+    )
     return mock_response
 
 
@@ -135,7 +161,11 @@ class FakeEventsProviderClient(IEventsProviderClient):
         self.kwargs = kwargs
 
     async def get_events(self, changed_at, cursor=None):
-        return self.kwargs["pages"][cursor]
+        pages = self.kwargs["pages"]
+        page = pages.get((changed_at, cursor)) or pages[cursor]
+        if isinstance(page, Exception):
+            raise page
+        return validate_events_page(page)
 
     async def get_seats(self, event_id):
         return self.kwargs["seats"]
@@ -160,10 +190,13 @@ class FakeEventsProviderClient(IEventsProviderClient):
 class FakeEventRepository(IEventRepository):
     def __init__(self, events=None):
         self.events = events or {}
+        self.data_version = "0"
 
     def _get_events(self, filter_):
         events = list(self.events.values())
-        if filter_ and filter_.event_time__gte:
+        if filter_ is None:
+            return events
+        if filter_.event_time__gte:
             event_time = filter_.event_time__gte
             event_time = datetime(
                 event_time.year, event_time.month, event_time.day, tzinfo=UTC
@@ -171,28 +204,95 @@ class FakeEventRepository(IEventRepository):
             events = [
                 event for event in events if event.event_time >= event_time
             ]
+        if filter_.date_to:
+            event_time = filter_.date_to + timedelta(days=1)
+            event_time = datetime(
+                event_time.year, event_time.month, event_time.day, tzinfo=UTC
+            )
+            events = [
+                event for event in events if event.event_time < event_time
+            ]
+        if filter_.status__in:
+            events = [
+                event for event in events if event.status in filter_.status__in
+            ]
+        if filter_.place_id:
+            events = [
+                event for event in events if event.place_id == filter_.place_id
+            ]
+        if filter_.city:
+            events = [
+                event for event in events if event.place.city == filter_.city
+            ]
+        if filter_.q:
+            words = filter_.q.lower().split()
+            events = [
+                event
+                for event in events
+                if all(word in self._search_text(event) for word in words)
+            ]
         return events
 
+    @staticmethod
+    def _search_text(event):
+        place = event.place
+        return f"{event.name} {place.name} {place.city} {place.address}".lower()
+
     async def get_paginated(self, page, page_size, filter_=None):
         events = self._get_events(filter_)
         if page_size:
             events = events[page_size * (page - 1) : page_size * page]
         return events
 
-    async def get_by_id(self, event_id):
+    async def get_paginated_rows(self, page, page_size, filter_=None):
+        return [
+            {
+                "id": event.id,
+                "name": event.name,
+                "place": {
+                    "id": event.place.id,
+                    "name": event.place.name,
+                    "city": event.place.city,
+                    "address": event.place.address,
+                },
+                "event_time": event.event_time,
+                "registration_deadline": event.registration_deadline,
+                "status": event.status,
+                "number_of_visitors": event.number_of_visitors,
+            }
+            for event in await self.get_paginated(page, page_size, filter_)
+        ]
+
+    async def stream_rows(self, batch_size, filter_=None):
+        rows = await self.get_paginated_rows(1, None, filter_)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start : start + batch_size]
+
+    async def get_by_id(self, event_id, *, load=EventLoad.DETAIL):
         return self.events.get(event_id)
 
     async def get_count(self, filter_=None):
         return len(self._get_events(filter_))
 
+    async def get_data_version(self):
+        return self.data_version
+
     async def upsert(self, json_data_list):
         for data in json_data_list:
             self.events[data["id"]] = Event(**data)
+        return UpsertStats(
+            inserted=len(json_data_list),
+            ids=tuple(data["id"] for data in json_data_list),
+        )
+
+    async def update_search_vectors(self, place_ids, event_ids=()):
+        return 0
 
 
 class FakeMemberRepository(IMemberRepository):
     def __init__(self, members=None):
         self.members = members or {}
+        self.version = 0
 
     def create(self, json_data):
         member = Member(**json_data)
@@ -205,6 +305,9 @@ class FakeMemberRepository(IMemberRepository):
     async def delete(self, ticket_id):
         return self.members.pop(ticket_id, None) is not None
 
+    async def increment_version(self):
+        self.version += 1
+
 
 class FakePlaceRepository(IPlaceRepository):
     places = {}
@@ -212,6 +315,10 @@ class FakePlaceRepository(IPlaceRepository):
     async def upsert(self, json_data_list):
         for data in json_data_list:
             self.places[data["id"]] = Place(**data)
+        return UpsertStats(
+            inserted=len(json_data_list),
+            ids=tuple(data["id"] for data in json_data_list),
+        )
 
 
 class FakeSyncMetaRepository(ISyncMetaRepository):
@@ -257,20 +364,101 @@ class FakeInboxRepository(IInboxRepository):
         self.inbox = inbox or {}
 
     async def get(self, key):
-        return self.inbox.get(key)
+        inbox = self.inbox.get(key)
+        if inbox is None or inbox.expires_at <= datetime.now(UTC):
+            return None
+        return inbox
+
+    async def get_many(self, keys):
+        return {key: inbox for key in keys if (inbox := await self.get(key))}
+
+    async def get_keys(self):
+        return list(self.inbox)
 
     def create(self, key, request_hash, response):
-        inbox = Inbox(key=key, request_hash=request_hash, response=response)
+        inbox = create_inbox(key, request_hash, response)
         self.inbox[inbox.key] = inbox
         return inbox
 
-    async def delete_expired(self):
-        deleted = 0
-        for inbox in self.inbox.values():
-            if inbox.expires_at <= datetime.now(UTC):
-                self.inbox.pop(inbox.key)
-                deleted += 1
-        return deleted
+    async def reserve(self, reservations):
+        reserved = set()
+        for key, request_hash in reservations.items():
+            inbox = self.inbox.get(key)
+            if inbox is None or inbox.expires_at <= datetime.now(UTC):
+                self.inbox[key] = create_inbox(
+                    key,
+                    request_hash,
+                    status=InboxStatus.IN_PROGRESS,
+                    expires_in=timedelta(
+                        seconds=settings.inbox_reservation_seconds_ttl
+                    ),
+                )
+                reserved.add(key)
+        return reserved
+
+    async def complete(self, key, response):
+        if (inbox := self.inbox.get(key)) is None:
+            return None
+        inbox.response = response
+        inbox.status = InboxStatus.COMPLETED
+        inbox.expires_at = datetime.now(UTC) + timedelta(
+            seconds=settings.inbox_seconds_ttl
+        )
+        return inbox
+
+    async def hold(self, responses):
+        held = 0
+        for key, response in responses.items():
+            inbox = self.inbox.get(key)
+            if inbox and inbox.status == InboxStatus.IN_PROGRESS:
+                inbox.response = response
+                inbox.expires_at = datetime.now(UTC) + timedelta(
+                    seconds=settings.inbox_seconds_ttl
+                )
+                held += 1
+        return held
+
+    async def release(self, keys):
+        released = 0
+        for key in keys:
+            inbox = self.inbox.get(key)
+            if (
+                inbox
+                and inbox.status == InboxStatus.IN_PROGRESS
+                and inbox.response is None
+            ):
+                del self.inbox[key]
+                released += 1
+        return released
+
+    async def delete_expired(self, limit=None):
+        expired = [
+            inbox.key
+            for inbox in self.inbox.values()
+            if inbox.expires_at <= datetime.now(UTC)
+        ][:limit]
+        for key in expired:
+            self.inbox.pop(key)
+        return len(expired)
+
+
+class FakePartitionRepository(IPartitionRepository):
+    def __init__(self, partitions=None):
+        self.partitions = partitions or {}
+        self.non_empty = set()
+
+    async def get_partitions(self, table):
+        return sorted(self.partitions.get(table, ()))
+
+    async def create_partition(self, table, column, name, start, end):
+        self.partitions.setdefault(table, set()).add(name)
+
+    async def is_empty(self, name, where=None):
+        return name not in self.non_empty
+
+    async def drop_partition(self, name):
+        for partitions in self.partitions.values():
+            partitions.discard(name)
 
 
 class FakeUnitOfWork(IUnitOfWork):
@@ -281,6 +469,7 @@ class FakeUnitOfWork(IUnitOfWork):
         self.sync_meta = FakeSyncMetaRepository()
         self.outbox = FakeOutboxRepository()
         self.inbox = FakeInboxRepository()
+        self.partitions = FakePartitionRepository()
 
         self._began = False
         self.committed = False
@@ -1,11 +1,32 @@
 """Тесты репозитория событий."""
 
+import itertools
+from datetime import date, timedelta
+from uuid import uuid4
+
 import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.orm.models import EventStatus
-from app.orm.repositories.event import EventRepository, IEventRepository
-from tests.helpers import create_event, create_place, model_to_dict
+from app.api.filters import EventFilter
+from app.orm.models import Event, EventStatus, Member
+from app.orm.repositories.base import UpsertStats
+from app.orm.repositories.event import (
+    EventLoad,
+    EventRepository,
+    IEventRepository,
+)
+from app.orm.repositories.member import MemberRepository
+from app.orm.repositories.place import PlaceRepository
+from app.orm.repositories.sync_meta import SyncMetaRepository
+from tests.helpers import (
+    create_event,
+    create_place,
+    get_datetime_now,
+    model_to_dict,
+)
 
 
 def _get_event_repository(session: AsyncSession) -> IEventRepository:
@@ -48,6 +69,312 @@ async def test_get_paginated_without_page_size(session: AsyncSession):
     assert len(result) == 3
 
 
+@pytest.mark.asyncio
+async def test_get_paginated_rows_matches_events(session: AsyncSession):
+    place = create_place()
+    session.add(place)
+    await session.flush()
+
+    events = [
+        create_event(place, timedelta=timedelta(hours=i)) for i in range(3)
+    ]
+    session.add_all(events)
+    await session.flush()
+    session.add(
+        Member(
+            ticket_id=uuid4(),
+            first_name="Иван",
+            last_name="Иванов",
+            seat="A1",
+            email="ivan@example.com",
+            event_id=events[1].id,
+        )
+    )
+    await session.flush()
+
+    repo = _get_event_repository(session)
+    rows = await repo.get_paginated_rows(page=1, page_size=2)
+    assert [row["id"] for row in rows] == [events[0].id, events[1].id]
+    assert rows[1] == {
+        "id": events[1].id,
+        "name": events[1].name,
+        "place": {
+            "id": place.id,
+            "name": place.name,
+            "city": place.city,
+            "address": place.address,
+        },
+        "event_time": events[1].event_time,
+        "registration_deadline": events[1].registration_deadline,
+        "status": events[1].status,
+        "number_of_visitors": 1,
+    }
+
+    rows = await repo.get_paginated_rows(page=2, page_size=2)
+    assert [row["id"] for row in rows] == [events[2].id]
+
+    filter_ = EventFilter(date_from=date.fromisoformat("3000-01-01"))
+    assert await repo.get_paginated_rows(1, None, filter_) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_rows(session: AsyncSession):
+    place = create_place()
+    session.add(place)
+    await session.flush()
+
+    events = [
+        create_event(place, timedelta=timedelta(hours=i)) for i in range(5)
+    ]
+    session.add_all(events)
+    await session.flush()
+
+    repo = _get_event_repository(session)
+    batches = [batch async for batch in repo.stream_rows(batch_size=2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    rows = [row for batch in batches for row in batch]
+    assert rows == await repo.get_paginated_rows(1, None)
+    assert [row["id"] for row in rows] == [event.id for event in events]
+
+    filter_ = EventFilter(date_from=date.fromisoformat("3000-01-01"))
+    assert [batch async for batch in repo.stream_rows(2, filter_)] == []
+
+
+@pytest.mark.asyncio
+async def test_filters(session: AsyncSession):
+    place = create_place()
+    other_place = create_place()
+    other_place.city = "Other city"
+    session.add_all([place, other_place])
+    await session.flush()
+
+    event = create_event(place, status=EventStatus.PUBLISHED)
+    session.add_all(
+        [
+            event,
+            create_event(place, timedelta=timedelta(days=2)),
+            create_event(other_place, status=EventStatus.PUBLISHED),
+        ]
+    )
+    await session.flush()
+
+    repo = _get_event_repository(session)
+    filter_ = EventFilter(
+        date_from=event.event_time.date(),
+        date_to=event.event_time.date(),
+        status="published,new",
+        place_id=place.id,
+        city=place.city,
+    )
+    rows = await repo.get_paginated_rows(1, None, filter_)
+    assert [row["id"] for row in rows] == [event.id]
+    assert await repo.get_count(filter_) == 1
+
+    assert await repo.get_count(EventFilter(city="Other city")) == 1
+    assert await repo.get_count(EventFilter(status="new")) == 1
+    assert await repo.get_count(EventFilter(place_id=place.id)) == 2
+
+
+FILTERS = {
+    "date_from": date(2000, 1, 1),
+    "date_to": date(3000, 1, 1),
+    "status": "published",
+    "place_id": uuid4(),
+    "city": "Test city",
+    "q": "concert",
+}
+FILTER_CONDS = {
+    "date_from": "(event_time >= '2000-01-01",
+    "date_to": "(event_time < '3000-01-02",
+    "status": "(status = 'PUBLISHED'",
+    "place_id": f"(place_id = '{FILTERS['place_id']}'",
+    "city": "((city)::text = 'Test city'",
+    "q": "(search_vector @@ '''concert'''",
+}
+FILTER_INDEXES = {
+    "date_from": {"ix_events_event_time_id", "ix_events_status_event_time"},
+    "date_to": {"ix_events_event_time_id", "ix_events_status_event_time"},
+    "status": {"ix_events_status_event_time"},
+    "place_id": {"ix_events_place_id_event_time"},
+    "city": {"ix_places_city"},
+    "q": {"ix_events_search_vector"},
+}
+
+
+async def _seed_filter_events(session: AsyncSession, count: int = 5000):
+    """Создать события, среди которых каждый фильтр выбирает немногие."""
+    await session.execute(
+        text(
+            "INSERT INTO places"
+            " (id, name, city, address, seats_pattern, changed_at, created_at)"
+            " SELECT CASE WHEN i = 0 THEN CAST(:place_id AS uuid)"
+            " ELSE gen_random_uuid() END, 'Place ' || i,"
+            " CASE WHEN i = 0 THEN :city ELSE 'City ' || i END,"
+            " 'Street ' || i, 'A1-100', NOW(), NOW()"
+            " FROM generate_series(0, 99) AS i"
+        ),
+        {"place_id": str(FILTERS["place_id"]), "city": FILTERS["city"]},
+    )
+    await session.execute(
+        text(
+            "INSERT INTO events (id, name, place_id, event_time,"
+            " registration_deadline, status, changed_at, created_at,"
+            " status_changed_at, search_vector)"
+            " SELECT gen_random_uuid(), e.name, p.ids[i % 100 + 1],"
+            " NOW() + i * INTERVAL '1 hour', NOW(),"
+            " CAST(CASE WHEN i % 100 = 1 THEN 'PUBLISHED' ELSE 'NEW' END"
+            " AS eventstatus),"
+            " NOW(), NOW(), NOW(), to_tsvector('simple', e.name)"
+            " FROM generate_series(1, :count) AS i,"
+            " LATERAL (SELECT CASE WHEN i % 200 = 0 THEN 'Concert '"
+            " ELSE 'Event ' END || i AS name) AS e,"
+            " (SELECT array_agg(id ORDER BY name) AS ids FROM places) AS p"
+        ),
+        {"count": count},
+    )
+    await session.execute(text("ANALYZE places, events"))
+
+
+def _get_index_conds(plan: dict) -> list[tuple[str | None, str]]:
+    """Получить индексы и условия индексного поиска узлов плана.
+
+    Для `Recheck Cond` индекс не указывается: он в дочернем узле.
+
+    """
+    conds = [
+        (plan.get("Index Name"), plan[key])
+        for key in ("Index Cond", "Recheck Cond")
+        if key in plan
+    ]
+    for subplan in plan.get("Plans", []):
+        conds.extend(_get_index_conds(subplan))
+    return conds
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "names",
+    [
+        names
+        for size in range(1, len(FILTERS) + 1)
+        for names in itertools.combinations(FILTERS, size)
+    ],
+    ids="+".join,
+)
+async def test_filters_use_indexes(session: AsyncSession, names: tuple[str]):
+    await _seed_filter_events(session)
+    filter_ = EventFilter(**{name: FILTERS[name] for name in names})
+    statements = (
+        EventRepository._select_rows(filter_).limit(10),
+        filter_.filter(select(func.count()).select_from(Event)),
+    )
+
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    for stmt in statements:
+        sql = stmt.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+        [[explain]] = (
+            await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        ).all()
+        plan = explain[0]["Plan"]
+        assert "Seq Scan" not in str(plan), plan
+        # Планировщик ведет запрос по самому избирательному индексу,
+        # поэтому проверяется, что им служит индекс одного из фильтров.
+        assert any(
+            FILTER_CONDS[name] in cond
+            and (index is None or index in FILTER_INDEXES[name])
+            for index, cond in _get_index_conds(plan)
+            for name in names
+        ), plan
+
+
+@pytest.mark.asyncio
+async def test_search(session: AsyncSession):
+    repo = _get_event_repository(session)
+    place = create_place()
+    place.name = "Jazz Club"
+    other_place = create_place()
+    await PlaceRepository(session).upsert(
+        [model_to_dict(place), model_to_dict(other_place)]
+    )
+    by_name = create_event(other_place, timedelta=timedelta(hours=1))
+    by_name.name = "Jazz concert"
+    by_place = create_event(place)
+    by_place.name = "Evening concert"
+    other = create_event(other_place)
+    await repo.upsert([model_to_dict(e) for e in (by_name, by_place, other)])
+
+    assert await repo.update_search_vectors([place.id, other_place.id]) == 3
+    assert await repo.update_search_vectors([place.id, other_place.id]) == 0
+
+    rows = await repo.get_paginated_rows(1, None, EventFilter(q="jazz"))
+    assert [row["id"] for row in rows] == [by_name.id, by_place.id]
+    assert await repo.get_count(EventFilter(q="jazz concert")) == 2
+    assert await repo.get_count(EventFilter(q="jazz -club")) == 1
+    assert await repo.get_count(EventFilter(q="test city")) == 3
+
+    place.name = "Rock Club"
+    place.changed_at += timedelta(seconds=1)
+    await PlaceRepository(session).upsert([model_to_dict(place)])
+    assert await repo.update_search_vectors([place.id]) == 1
+    assert await repo.get_count(EventFilter(q="rock")) == 1
+
+    other.name = "Blues concert"
+    other.changed_at += timedelta(seconds=1)
+    await repo.upsert([model_to_dict(other)])
+    assert await repo.update_search_vectors([], [by_name.id]) == 0
+    assert await repo.update_search_vectors([], [other.id]) == 1
+    assert await repo.get_count(EventFilter(q="blues")) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_load_options(session: AsyncSession):
+    place = create_place()
+    event = create_event(place)
+    session.add(place)
+    await session.flush()
+    session.add(event)
+    await session.flush()
+    session.expunge_all()
+
+    repo = _get_event_repository(session)
+    detail = await repo.get_by_id(event.id)
+    assert detail.number_of_visitors == 0
+    assert detail.place.seats_pattern == place.seats_pattern
+    with pytest.raises(InvalidRequestError):
+        _ = detail.place.seats_index
+    session.expunge_all()
+
+    validation = await repo.get_by_id(event.id, load=EventLoad.VALIDATION)
+    assert validation.status == event.status
+    assert validation.place.seats_pattern == place.seats_pattern
+    with pytest.raises(InvalidRequestError):
+        _ = validation.number_of_visitors
+    with pytest.raises(InvalidRequestError):
+        _ = validation.place.name
+
+
+@pytest.mark.asyncio
+async def test_get_data_version(session: AsyncSession):
+    repo = _get_event_repository(session)
+    members_repo = MemberRepository(session)
+    sync_meta_repo = SyncMetaRepository(session)
+
+    version = await repo.get_data_version()
+    assert await repo.get_data_version() == version
+
+    await members_repo.increment_version()
+    members_version = await repo.get_data_version()
+    assert members_version != version
+
+    sync_meta, _ = await sync_meta_repo.get_or_add()
+    sync_meta.last_changed_at = get_datetime_now()
+    await session.flush()
+    assert await repo.get_data_version() != members_version
+
+
 @pytest.mark.asyncio
 async def test_upsert_create_new(session: AsyncSession):
     repo = _get_event_repository(session)
@@ -56,9 +383,10 @@ async def test_upsert_create_new(session: AsyncSession):
     await session.flush()
 
     event = create_event(place)
-    await repo.upsert([model_to_dict(event)])
+    stats = await repo.upsert([model_to_dict(event)])
     await session.flush()
 
+    assert stats == UpsertStats(inserted=1, ids=(event.id,))
     event_got = await repo.get_by_id(event.id)
     assert event_got is not None
     assert event_got.id == event.id
@@ -78,10 +406,34 @@ async def test_upsert_update_existing(session: AsyncSession):
     data = model_to_dict(event)
     data["name"] = "Updated event name"
     data["status"] = EventStatus.PUBLISHED
+    data["changed_at"] += timedelta(minutes=1)
 
-    await repo.upsert([data])
+    stats = await repo.upsert([data])
     await session.flush()
     await session.refresh(event)
 
+    assert stats == UpsertStats(updated=1, ids=(event.id,))
     assert event.name == "Updated event name"
     assert event.status == EventStatus.PUBLISHED
+
+
+@pytest.mark.asyncio
+async def test_upsert_skips_unchanged(session: AsyncSession):
+    repo = _get_event_repository(session)
+    place = create_place()
+    session.add(place)
+    await session.flush()
+
+    event = create_event(place)
+    session.add(event)
+    await session.flush()
+
+    data = model_to_dict(event)
+    data["name"] = "Updated event name"
+
+    stats = await repo.upsert([data])
+    await session.flush()
+    await session.refresh(event)
+
+    assert stats == UpsertStats(unchanged=1)
+    assert event.name != "Updated event name"
@@ -1,11 +1,18 @@
 """Тесты репозитория идемпотентности."""
 
+import asyncio
 from datetime import timedelta
 
 import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.orm.db_manager import db_manager
+from app.orm.models import Inbox, InboxStatus
 from app.orm.repositories.inbox import IInboxRepository, InboxRepository
+from app.orm.repositories.partition import PartitionRepository
 from tests.helpers import get_datetime_now
 
 
@@ -45,6 +52,30 @@ async def test_get_none(session: AsyncSession):
     assert inbox_got is None
 
 
+@pytest.mark.asyncio
+async def test_get_expired(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    inbox = repo.create("key", "hash", {"response": "response"})
+    inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    await session.flush()
+
+    assert await repo.get("key") is None
+    assert await repo.get_many(["key"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_create_duplicate(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    inbox = repo.create("key", "hash", {"response": "response"})
+    inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    repo.create("key", "hash", {"response": "response"})
+    await session.flush()
+
+    repo.create("key", "hash", {"response": "response"})
+    with pytest.raises(IntegrityError):
+        await session.flush()
+
+
 @pytest.mark.asyncio
 async def test_delete_expired(session: AsyncSession):
     repo = _get_inbox_repository(session)
@@ -65,8 +96,180 @@ async def test_delete_expired(session: AsyncSession):
     assert inbox_got is not None
 
 
+@pytest.mark.asyncio
+async def test_delete_expired_default_partition_only(session: AsyncSession):
+    start = (get_datetime_now() - timedelta(days=3)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    await PartitionRepository(session).create_partition(
+        "inbox", "expires_at", "inbox_ptest", start, start + timedelta(days=1)
+    )
+    repo = _get_inbox_repository(session)
+    inbox = repo.create("partitioned", "hash", {"response": "response"})
+    inbox.expires_at = start + timedelta(hours=1)
+    inbox = repo.create("default", "hash", {"response": "response"})
+    inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    await session.flush()
+
+    assert await repo.delete_expired() == 1
+    keys = await session.scalars(select(Inbox.key))
+    assert list(keys) == ["partitioned"]
+
+
 @pytest.mark.asyncio
 async def test_delete_expired_none(session: AsyncSession):
     repo = _get_inbox_repository(session)
     deleted = await repo.delete_expired()
     assert deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_get_keys(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    inbox = repo.create("key1", "hash", {"response": "response"})
+    inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    repo.create("key2", "hash", {"response": "response"})
+    await session.flush()
+
+    assert await repo.get_keys() == ["key2"]
+
+
+@pytest.mark.asyncio
+async def test_reserve(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    inbox = repo.create("expired", "hash", {"response": "response"})
+    inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    repo.create("completed", "hash", {"response": "response"})
+    await session.flush()
+
+    reserved = await repo.reserve(
+        {"new": "hash1", "expired": "hash2", "completed": "hash3"}
+    )
+    assert reserved == {"new", "expired"}
+
+    session.expunge_all()
+    inbox_got = await repo.get("expired")
+    assert inbox_got.status == InboxStatus.IN_PROGRESS
+    assert inbox_got.request_hash == "hash2"
+    assert inbox_got.response is None
+    assert inbox_got.expires_at > get_datetime_now()
+    inbox_got = await repo.get("completed")
+    assert inbox_got.status == InboxStatus.COMPLETED
+    assert inbox_got.request_hash == "hash"
+
+    assert await repo.reserve({"new": "hash1"}) == set()
+
+
+@pytest.mark.asyncio
+async def test_complete(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    await repo.reserve({"key": "hash"})
+
+    inbox = await repo.complete("key", {"ticket_id": "123"})
+
+    assert inbox.status == InboxStatus.COMPLETED
+    assert inbox.response == {"ticket_id": "123"}
+    assert await repo.complete("other", {}) is None
+
+
+@pytest.mark.asyncio
+async def test_release(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    await repo.reserve({"key": "hash"})
+    repo.create("completed", "hash", {"response": "response"})
+    await session.flush()
+
+    assert await repo.release(["key", "completed"]) == 1
+    assert await repo.get("key") is None
+    assert await repo.get("completed") is not None
+
+
+@pytest.mark.asyncio
+async def test_hold(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    await repo.reserve({"key": "hash"})
+    repo.create("completed", "hash", {"response": "response"})
+    await session.flush()
+
+    held = await repo.hold(
+        {"key": {"ticket_id": "123"}, "completed": {"ticket_id": "456"}}
+    )
+
+    assert held == 1
+    session.expunge_all()
+    inbox = await repo.get("key")
+    assert inbox.status == InboxStatus.IN_PROGRESS
+    assert inbox.response == {"ticket_id": "123"}
+    assert inbox.expires_at > get_datetime_now() + timedelta(
+        seconds=settings.inbox_reservation_seconds_ttl
+    )
+    assert (await repo.get("completed")).response == {"response": "response"}
+    assert await repo.release(["key"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_limit(session: AsyncSession):
+    repo = _get_inbox_repository(session)
+    for i in range(3):
+        inbox = repo.create(f"key{i}", "hash", {"response": "response"})
+        inbox.expires_at = get_datetime_now() - timedelta(hours=1)
+    await session.flush()
+
+    assert await repo.delete_expired(limit=2) == 2
+    assert await repo.delete_expired(limit=2) == 1
+    assert await repo.delete_expired(limit=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_reserve_concurrent():
+
+    async def reserve_in_new_session():
+        async with db_manager.session() as session:
+            reserved = await _get_inbox_repository(session).reserve(
+                {"concurrent": "hash"}
+            )
+            await session.commit()
+            return reserved
+
+    try:
+        results = await asyncio.gather(
+            *[reserve_in_new_session() for _ in range(5)]
+        )
+        assert sum(len(reserved) for reserved in results) == 1
+
+        async with db_manager.session() as session:
+            count = await session.scalar(
+                select(func.count()).where(Inbox.key == "concurrent")
+            )
+            assert count == 1
+    finally:
+        async with db_manager.session() as session:
+            await session.execute(
+                delete(Inbox).where(Inbox.key == "concurrent")
+            )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_create_concurrent():
+
+    async def create_in_new_session():
+        async with db_manager.session() as session:
+            _get_inbox_repository(session).create("concurrent", "hash", {})
+            try:
+                await session.commit()
+            except IntegrityError:
+                return False
+            return True
+
+    try:
+        results = await asyncio.gather(
+            *[create_in_new_session() for _ in range(5)]
+        )
+        assert sum(results) == 1
+    finally:
+        async with db_manager.session() as session:
+            await session.execute(
+                delete(Inbox).where(Inbox.key == "concurrent")
+            )
+            await session.commit()
@@ -52,11 +52,13 @@ async def test_get_by_id_with_load_event(session: AsyncSession, event: Event):
     ticket_id = uuid4()
     _create_member(repo, ticket_id, event)
     await session.flush()
+    session.expunge_all()
 
     member = await repo.get_by_id(ticket_id, load_event=True)
     assert member is not None
     assert member.event is not None
     assert member.event.id == event.id
+    assert member.event.event_time == event.event_time
 
 
 @pytest.mark.asyncio
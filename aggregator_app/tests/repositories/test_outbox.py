@@ -56,7 +56,7 @@ async def test_update_status(session: AsyncSession):
     await session.flush()
 
     assert updated
-    result_got = await session.get(Outbox, result.id)
+    result_got = await session.get(Outbox, (result.id, result.created_at))
     assert result_got.id == result.id
     assert result_got.type == result.type
     assert result_got.payload == result.payload
@@ -0,0 +1,66 @@
+"""Тесты репозитория секций таблиц."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.orm.models import Inbox, InboxStatus
+from app.orm.repositories.partition import (
+    IPartitionRepository,
+    PartitionRepository,
+)
+from tests.helpers import create_inbox
+
+
+def _get_partition_repository(session: AsyncSession) -> IPartitionRepository:
+    return PartitionRepository(session)
+
+
+def _get_day_start(days: int) -> datetime:
+    day = datetime.now(UTC) + timedelta(days=days)
+    return day.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@pytest.mark.asyncio
+async def test_create_partition_moves_default_rows(session: AsyncSession):
+    repo = _get_partition_repository(session)
+    inbox = create_inbox("key", expires_in=timedelta(days=10))
+    session.add(inbox)
+    await session.flush()
+
+    start = _get_day_start(10)
+    await repo.create_partition(
+        "inbox", "expires_at", "inbox_ptest", start, start + timedelta(days=1)
+    )
+
+    assert await repo.get_partitions("inbox") == ["inbox_ptest"]
+    assert not await repo.is_empty("inbox_ptest")
+    assert await repo.is_empty("inbox_default")
+    assert await repo.is_empty(
+        "inbox_ptest", f"status = '{InboxStatus.IN_PROGRESS.name}'"
+    )
+    session.expunge_all()
+    inbox_got = await session.scalar(select(Inbox).where(Inbox.key == "key"))
+    assert inbox_got.request_hash == inbox.request_hash
+
+
+@pytest.mark.asyncio
+async def test_drop_partition(session: AsyncSession):
+    repo = _get_partition_repository(session)
+    start = _get_day_start(-2)
+    await repo.create_partition(
+        "outbox", "created_at", "outbox_ptest", start, start + timedelta(1)
+    )
+
+    await repo.drop_partition("outbox_ptest")
+
+    assert await repo.get_partitions("outbox") == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_identifier(session: AsyncSession):
+    repo = _get_partition_repository(session)
+    with pytest.raises(ValueError):
+        await repo.drop_partition("outbox; DROP TABLE events")
@@ -1,9 +1,12 @@
 """Тесты репозитория мест проведения."""
 
+from datetime import timedelta
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.orm.models import Place
+from app.orm.repositories.base import UpsertStats
 from app.orm.repositories.place import IPlaceRepository, PlaceRepository
 from tests.helpers import create_place, model_to_dict
 
@@ -17,9 +20,10 @@ async def test_upsert_create_new(session: AsyncSession):
     repo = _get_place_repository(session)
     place = create_place()
 
-    await repo.upsert([model_to_dict(place)])
+    stats = await repo.upsert([model_to_dict(place)])
     await session.flush()
 
+    assert stats == UpsertStats(inserted=1, ids=(place.id,))
     place_got = await session.get(Place, place.id)
     assert place_got is not None
     assert place_got.id == place.id
@@ -34,9 +38,55 @@ async def test_upsert_update_existing(session: AsyncSession):
 
     data = model_to_dict(place)
     data["name"] = "Updated place name"
+    data["changed_at"] += timedelta(minutes=1)
 
-    await repo.upsert([data])
+    stats = await repo.upsert([data])
     await session.flush()
     await session.refresh(place)
 
+    assert stats == UpsertStats(updated=1, ids=(place.id,))
     assert place.name == "Updated place name"
+
+
+@pytest.mark.asyncio
+async def test_upsert_skips_unchanged(session: AsyncSession):
+    repo = _get_place_repository(session)
+    place = create_place()
+    session.add(place)
+    await session.flush()
+
+    data = model_to_dict(place)
+    data["name"] = "Updated place name"
+
+    new_place = create_place()
+    stats = await repo.upsert([data, model_to_dict(new_place)])
+    await session.flush()
+    await session.refresh(place)
+
+    assert stats == UpsertStats(inserted=1, unchanged=1, ids=(new_place.id,))
+    assert place.name != "Updated place name"
+
+
+@pytest.mark.asyncio
+async def test_upsert_fills_missing_seats_index(session: AsyncSession):
+    repo = _get_place_repository(session)
+    place = create_place()
+    place.seats_index = None
+    session.add(place)
+    await session.flush()
+
+    data = model_to_dict(place)
+    data["seats_index"] = {"A": [[1, 10]]}
+
+    stats = await repo.upsert([data])
+    await session.flush()
+    await session.refresh(place)
+
+    assert stats == UpsertStats(updated=1, ids=(place.id,))
+    assert place.seats_index == {"A": [[1, 10]]}
+
+
+@pytest.mark.asyncio
+async def test_upsert_empty(session: AsyncSession):
+    repo = _get_place_repository(session)
+    assert await repo.upsert([]) == UpsertStats()
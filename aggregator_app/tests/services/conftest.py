@@ -8,6 +8,7 @@ from app.services.events import EventsService
 from app.services.events_provider import EventsPaginator, EventsProviderParser
 from app.services.inbox import InboxService
 from app.services.outbox import OutboxService
+from app.services.partitions import PartitionService
 from app.services.sync import SyncService
 from app.services.tickets import TicketsService
 from tests.helpers import FakeEventsProviderClient, FakeUnitOfWork
@@ -60,3 +61,8 @@ def inbox_service(uow, scheduler):
 @pytest.fixture
 def outbox_service(uow, scheduler):
     return OutboxService(uow, scheduler, MagicMock())
+
+
+@pytest.fixture
+def partition_service(uow, scheduler):
+    return PartitionService(uow, scheduler)
@@ -0,0 +1,159 @@
+"""Тесты предохранителя запросов к внешним API."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
+
+from app.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitState,
+    circuit_breakers,
+)
+from app.services.metrics import metrics
+from app.services.utils import with_external_client
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    metrics.reset()
+    circuit_breakers.reset()
+    yield
+    metrics.reset()
+    circuit_breakers.reset()
+
+
+def fail(breaker: CircuitBreaker, exc: BaseException):
+    with pytest.raises(type(exc)), breaker.guard():
+        raise exc
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=2, recovery_seconds=60
+    )
+
+    fail(breaker, ClientConnectionError())
+    assert breaker.state == CircuitState.CLOSED
+    fail(breaker, TimeoutError())
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitBreakerOpenError), breaker.guard():
+        pass
+    assert metrics.get("test.op.circuit_opened") == 1
+    assert metrics.get("test.op.circuit_rejected") == 1
+
+
+def test_client_errors_are_not_failures():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=1, recovery_seconds=60
+    )
+    error = ClientResponseError(None, (), status=400)
+
+    fail(breaker, error)
+    fail(breaker, ValueError())
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_success_resets_failures():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=2, recovery_seconds=60
+    )
+
+    fail(breaker, TimeoutError())
+    with breaker.guard():
+        pass
+    fail(breaker, TimeoutError())
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_probe():
+    breaker = CircuitBreaker("test.op", failure_threshold=1, recovery_seconds=0)
+
+    fail(breaker, ClientResponseError(None, (), status=503))
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    with breaker.guard():
+        with pytest.raises(CircuitBreakerOpenError), breaker.guard():
+            pass
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_probe_failure_reopens():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=3, recovery_seconds=60
+    )
+    for _ in range(3):
+        fail(breaker, TimeoutError())
+    breaker._recovery_seconds = 0
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker._recovery_seconds = 60
+    fail(breaker, TimeoutError())
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.to_dict()["retry_in_seconds"] > 0
+
+
+@pytest.mark.parametrize(
+    "exc", [asyncio.CancelledError(), KeyError("id"), ValueError()]
+)
+def test_half_open_probe_unrelated_error(exc: BaseException):
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=2, recovery_seconds=60
+    )
+    for _ in range(2):
+        fail(breaker, TimeoutError())
+    breaker._recovery_seconds = 0
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    fail(breaker, exc)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.to_dict()["failures"] == 2
+
+    with breaker.guard():
+        pass
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_unrelated_error_keeps_failures():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=2, recovery_seconds=60
+    )
+
+    fail(breaker, TimeoutError())
+    fail(breaker, KeyError("id"))
+    fail(breaker, TimeoutError())
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_registry():
+    breaker = circuit_breakers.get("b.op")
+    assert circuit_breakers.get("b.op") is breaker
+    circuit_breakers.get("a.op")
+
+    assert [s["name"] for s in circuit_breakers.snapshot()] == ["a.op", "b.op"]
+    assert circuit_breakers.snapshot()[0]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_with_external_client_rejected():
+    breaker = CircuitBreaker(
+        "test.op", failure_threshold=1, recovery_seconds=60
+    )
+    fail(breaker, TimeoutError())
+    client = AsyncMock()
+    func = AsyncMock()
+    on_error = AsyncMock()
+
+    await with_external_client(
+        client, func, on_error=on_error, circuit_breaker=breaker
+    )
+
+    client.__aenter__.assert_not_awaited()
+    func.assert_not_awaited()
+    assert isinstance(on_error.await_args.args[0], CircuitBreakerOpenError)
@@ -67,6 +67,38 @@ async def test_get_by_id_not_found(events_service: EventsService):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_get_validation_data_cached(
+    events_service: EventsService, uow: FakeUnitOfWork
+):
+    event = create_event()
+    uow.events = FakeEventRepository({event.id: event})
+
+    data = await events_service.get_validation_data(event.id)
+    assert data.status == event.status
+    assert data.registration_deadline == event.registration_deadline
+    assert "B250" in data.seats_index
+
+    uow.events.get_by_id = AsyncMock(return_value=event)
+    assert await events_service.get_validation_data(event.id) == data
+    assert not uow.events.get_by_id.called
+
+    await EventsService.invalidate_validation_cache()
+    await events_service.get_validation_data(event.id)
+    assert uow.events.get_by_id.called
+
+
+@pytest.mark.asyncio
+async def test_get_validation_data_not_found_not_cached(
+    events_service: EventsService, uow: FakeUnitOfWork
+):
+    event = create_event()
+    assert await events_service.get_validation_data(event.id) is None
+
+    uow.events = FakeEventRepository({event.id: event})
+    assert await events_service.get_validation_data(event.id) is not None
+
+
 @pytest.mark.asyncio
 async def test_get_seats(
     events_service: EventsService,
@@ -1,6 +1,7 @@
 """Тесты модуля EventsProvider."""
 
-from datetime import UTC, date, datetime
+import json
+from datetime import UTC, date, datetime, timedelta
 from unittest.mock import MagicMock
 from uuid import uuid4
 
@@ -12,7 +13,10 @@ from app.services.events_provider import (
     EventsProviderClient,
     EventsProviderParser,
     IEventsProviderClient,
+    event_quarantine,
+    validate_events_page,
 )
+from app.services.metrics import metrics
 from tests.helpers import (
     FakeEventsProviderClient,
     get_external_client_mock_response,
@@ -47,7 +51,7 @@ async def test_get_events():
     mock_session.get.assert_called_once_with(
         f"/api/events/?changed_at={changed_at.isoformat()}"
     )
-    assert result == expected_result
+    assert result == {"next": None, "results": []}
 
     cursor = "abc123"
     await client.get_events(changed_at, cursor)
@@ -149,26 +153,52 @@ async def test_events_paginator_empty():
 
 @pytest.mark.asyncio
 async def test_events_paginator_non_empty():
+    raw_events = [get_raw_event() for _ in range(3)]
     client = FakeEventsProviderClient(
         pages={
             None: {
                 "next": "abc123",
-                "results": ["event1", "event2"],
+                "results": raw_events[:2],
             },
             "abc123": {
                 "next": None,
-                "results": ["event3"],
+                "results": raw_events[2:],
             },
         }
     )
     paginator = EventsPaginator()(client, date(2000, 1, 1))
     events = [event async for event in paginator]
-    assert events == ["event1", "event2", "event3"]
+    assert [event["id"] for event in events] == [
+        event["id"] for event in raw_events
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_paginator_from_cursor():
+    raw_events = [get_raw_event() for _ in range(2)]
+    client = FakeEventsProviderClient(
+        pages={
+            "abc123": {"next": "def456", "results": raw_events[:1]},
+            "def456": {"next": None, "results": raw_events[1:]},
+        }
+    )
+    paginator = EventsPaginator()(client, date(2000, 1, 1), "abc123")
+
+    event = await anext(paginator)
+    assert event["id"] == raw_events[0]["id"]
+    assert paginator.page_consumed
+    assert paginator.cursor == "def456"
+    assert [event["id"] async for event in paginator] == [raw_events[1]["id"]]
+    assert paginator.cursor is None
+
+
+def _parse_raw_event(raw_event):
+    page = validate_events_page({"next": None, "results": [raw_event]})
+    return EventsProviderParser().parse_event_dict(page["results"][0])
 
 
 def test_events_provider_parser():
-    parser = EventsProviderParser()
-    event_dict, place_dict = parser.parse_event_dict(get_raw_event())
+    event_dict, place_dict = _parse_raw_event(get_raw_event())
 
     assert "place" not in event_dict
     assert "place_id" in event_dict
@@ -194,11 +224,86 @@ def test_events_provider_parser():
     ):
         for key in keys:
             assert isinstance(data_dict[key], datetime)
-            assert data_dict[key].tzinfo is UTC
+            assert data_dict[key].utcoffset() == timedelta(0)
+
+
+def test_events_provider_parser_seats_index():
+    _, place_dict = _parse_raw_event(get_raw_event())
+    assert place_dict["seats_index"] == {"A": [[1, 10]]}
+
+    raw_event = get_raw_event()
+    raw_event["place"]["seats_pattern"] = "invalid"
+    _, place_dict = _parse_raw_event(raw_event)
+    assert place_dict["seats_index"] is None
 
 
 def test_events_provider_parser_invalid_status():
     raw_event = get_raw_event()
     raw_event["status"] = "invalid"
-    event_dict, _ = EventsProviderParser().parse_event_dict(raw_event)
+    event_dict, _ = _parse_raw_event(raw_event)
     assert event_dict["status"] == EventStatus.OTHER
+
+
+@pytest.mark.parametrize("as_bytes", [True, False])
+def test_validate_events_page(as_bytes: bool):
+    raw_events = [get_raw_event() for _ in range(2)]
+    raw_events[0]["changed_at"] = "2026-03-06T15:30:00+03:00"
+    page = {"count": 2, "next": None, "results": raw_events}
+    if as_bytes:
+        page = json.dumps(page).encode()
+
+    result = validate_events_page(page)
+
+    assert result["next"] is None
+    assert len(result["results"]) == 2
+    event = result["results"][0]
+    assert event["changed_at"] == datetime(2026, 3, 6, 12, 30, tzinfo=UTC)
+    assert "number_of_visitors" not in event
+    assert event_quarantine.snapshot() == []
+
+
+@pytest.mark.parametrize("as_bytes", [True, False])
+def test_validate_events_page_quarantines_invalid(as_bytes: bool):
+    valid, invalid = get_raw_event(), get_raw_event()
+    invalid["changed_at"] = "yesterday"
+    invalid["place"]["name"] = "x" * 129
+    del invalid["event_time"]
+    page = {"next": "abc", "results": [invalid, valid, "garbage"]}
+    if as_bytes:
+        page = json.dumps(page).encode()
+
+    result = validate_events_page(page)
+
+    assert [event["id"] for event in result["results"]] == [valid["id"]]
+    assert metrics.get("events_provider.get_events.quarantined") == 2
+    quarantined = event_quarantine.snapshot()
+    assert [event["event_id"] for event in quarantined] == [None, invalid["id"]]
+    reasons = quarantined[1]["reasons"]
+    assert len(reasons) == 3
+    assert any(reason.startswith("changed_at:") for reason in reasons)
+    assert any(reason.startswith("place.name:") for reason in reasons)
+    assert any(reason.startswith("event_time:") for reason in reasons)
+    assert result["quarantined_changed_at"] is None
+
+
+@pytest.mark.parametrize(
+    ("changed_at", "expected"),
+    [
+        ("2026-03-06T15:30:00+03:00", datetime(2026, 3, 6, 12, 30, tzinfo=UTC)),
+        ("2026-03-06T12:30:00", datetime(2026, 3, 6, 12, 30, tzinfo=UTC)),
+    ],
+)
+def test_validate_events_page_quarantined_changed_at(
+    changed_at: str, expected: datetime
+):
+    invalid, later = get_raw_event(), get_raw_event()
+    invalid["changed_at"] = changed_at
+    del invalid["event_time"]
+    later["changed_at"] = "2026-03-07T00:00:00+00:00"
+    later["place"]["name"] = "x" * 129
+    page = {"next": None, "results": [later, invalid, get_raw_event()]}
+
+    result = validate_events_page(page)
+
+    assert len(result["results"]) == 1
+    assert result["quarantined_changed_at"] == expected
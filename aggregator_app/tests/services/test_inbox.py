@@ -1,11 +1,16 @@
 """Тесты сервиса inbox."""
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import HTTPException
 
+from app.config import settings
+from app.orm.models import InboxStatus
 from app.services.inbox import InboxService
-from tests.helpers import FakeUnitOfWork
+from app.services.inbox_cache import InboxCache
+from tests.helpers import FakeUnitOfWork, create_inbox
 
 
 @pytest.mark.asyncio
@@ -18,15 +23,131 @@ async def test_init_job(inbox_service: InboxService, scheduler: MagicMock):
 async def test_process_expired(
     inbox_service: InboxService, uow: FakeUnitOfWork
 ):
-    uow.inbox.delete_expired = AsyncMock()
+    uow.inbox.delete_expired = AsyncMock(return_value=0)
     await inbox_service.process_expired()
     assert uow.inbox.delete_expired.called
     assert uow.committed
 
 
+@pytest.mark.asyncio
+async def test_process_expired_in_batches(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    monkeypatch.setattr(settings, "inbox_expire_batch_size", 2)
+    monkeypatch.setattr(settings, "inbox_expire_batch_seconds_pause", 0)
+    uow.inbox.inbox = {
+        key: create_inbox(key, expires_in=timedelta(hours=-1))
+        for key in ("a", "b", "c", "d", "e")
+    } | {"f": create_inbox("f")}
+    delete_expired = AsyncMock(wraps=uow.inbox.delete_expired)
+    uow.inbox.delete_expired = delete_expired
+
+    await inbox_service.process_expired()
+
+    assert list(uow.inbox.inbox) == ["f"]
+    assert delete_expired.await_count == 3
+    assert all(
+        call.kwargs == {"limit": 2} for call in delete_expired.await_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_expired_rebuilds_bloom_filter(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    rebuild_bloom_filter = AsyncMock()
+    monkeypatch.setattr(
+        inbox_service, "rebuild_bloom_filter", rebuild_bloom_filter
+    )
+
+    await inbox_service.process_expired()
+    assert not rebuild_bloom_filter.called
+
+    uow.inbox.inbox = {"a": create_inbox("a", expires_in=timedelta(hours=-1))}
+    await inbox_service.process_expired()
+    rebuild_bloom_filter.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_get_inbox(inbox_service: InboxService, uow: FakeUnitOfWork):
     uow.inbox.get = AsyncMock()
     await inbox_service.get_inbox("key")
     assert uow.inbox.get.called
     assert uow.inbox.get.call_args[0][0] == "key"
+
+
+@pytest.mark.asyncio
+async def test_get_inbox_cached(
+    inbox_service: InboxService, uow: FakeUnitOfWork
+):
+    inbox = create_inbox("key")
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    assert await inbox_service.get_inbox("key") is inbox
+    uow.inbox.inbox = {}
+    assert await inbox_service.get_inbox("key") is inbox
+
+
+@pytest.mark.asyncio
+async def test_get_inbox_bloom_filter(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    cache = InboxCache(size=10, bloom_filter_capacity=100)
+    monkeypatch.setattr("app.services.inbox.inbox_cache", cache)
+    uow.inbox.inbox = {"key": create_inbox("key")}
+
+    await inbox_service.init_jobs()
+    uow.inbox.get = AsyncMock(return_value=None)
+
+    assert await inbox_service.get_inbox("new") is None
+    assert not uow.inbox.get.called
+    await inbox_service.get_inbox("key")
+    assert uow.inbox.get.called
+
+
+@pytest.mark.asyncio
+async def test_acquire_returns_held_reservation(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    sleep = AsyncMock()
+    monkeypatch.setattr("app.services.inbox.asyncio.sleep", sleep)
+    inbox = create_inbox(
+        "key",
+        "hash",
+        response={"ticket_id": "123"},
+        status=InboxStatus.IN_PROGRESS,
+    )
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    assert await inbox_service.acquire("key", "hash") is inbox
+    assert not sleep.called
+
+
+@pytest.mark.asyncio
+async def test_acquire_bypasses_bloom_filter(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    cache = InboxCache(size=10, bloom_filter_capacity=100)
+    monkeypatch.setattr("app.services.inbox.inbox_cache", cache)
+    await inbox_service.init_jobs()
+    inbox = create_inbox("key", "hash", response={"ticket_id": "123"})
+    uow.inbox.inbox = {inbox.key: inbox}
+
+    assert not cache.might_exist("key")
+    assert await inbox_service.acquire("key", "hash") is inbox
+
+
+@pytest.mark.asyncio
+async def test_acquire_stops_at_deadline(
+    inbox_service: InboxService, uow: FakeUnitOfWork, monkeypatch
+):
+    monkeypatch.setattr(settings, "inbox_wait_seconds_timeout", 0.05)
+    monkeypatch.setattr(settings, "inbox_wait_seconds_interval", 0.01)
+    uow.inbox.reserve = AsyncMock(return_value=set())
+    uow.inbox.get = AsyncMock(return_value=None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await inbox_service.acquire("key", "hash")
+
+    assert exc_info.value.status_code == 409
+    assert 1 < uow.inbox.get.await_count < 10
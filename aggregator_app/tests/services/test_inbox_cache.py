@@ -0,0 +1,66 @@
+"""Тесты кэша ключей идемпотентности."""
+
+from datetime import timedelta
+
+from app.services.inbox_cache import BloomFilter, InboxCache
+from app.services.metrics import metrics
+from tests.helpers import create_inbox
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"key-{i}" for i in range(1000)]
+    for key in keys:
+        bloom_filter.add(key)
+
+    assert all(key in bloom_filter for key in keys)
+    false_positives = sum(f"other-{i}" in bloom_filter for i in range(10000))
+    assert false_positives < 300
+
+
+def test_get_lru_eviction():
+    cache = InboxCache(size=2)
+    for key in ("a", "b"):
+        cache.add(create_inbox(key))
+    assert cache.get("a") is not None
+
+    cache.add(create_inbox("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").key == "a"
+    assert cache.get("c").key == "c"
+
+
+def test_get_expired():
+    cache = InboxCache(size=2)
+    cache.add(create_inbox("a", expires_in=timedelta(seconds=-1)))
+    assert cache.get("a") is None
+
+
+def test_might_exist_without_bloom_filter():
+    cache = InboxCache(size=2)
+    cache.start_rebuild()
+    cache.finish_rebuild(["a"])
+    assert cache.might_exist("b")
+
+
+def test_might_exist_with_bloom_filter():
+    metrics.reset()
+    cache = InboxCache(size=2, bloom_filter_capacity=100)
+    assert cache.might_exist("b")
+
+    cache.start_rebuild()
+    cache.add(create_inbox("c"))
+    cache.finish_rebuild(["a"])
+
+    assert cache.might_exist("a")
+    assert cache.might_exist("c")
+    assert not cache.might_exist("b")
+    assert metrics.get("inbox.get.bloom_filter_miss") == 1
+
+    cache.add(create_inbox("b"))
+    assert cache.might_exist("b")
+
+    cache.reset()
+    assert cache.might_exist("d")
+    metrics.reset()
@@ -0,0 +1,36 @@
+"""Тесты JSON-кодека."""
+
+import json
+
+import pytest
+
+from app.api.responses import CodecJSONResponse
+from app.services.json_codec import get_json_codec, get_json_codecs
+
+DATA = {"name": "Концерт", "ids": [1, 2], "nested": {"ok": True, "v": None}}
+
+
+@pytest.mark.parametrize("name", list(get_json_codecs()))
+def test_codec_roundtrip(name: str):
+    codec = get_json_codec(name)
+    encoded = codec.dumps(DATA)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == DATA
+    assert codec.loads(encoded) == DATA
+    assert codec.loads(encoded.decode()) == DATA
+    assert codec.dumps_str(DATA) == encoded.decode()
+
+
+def test_stdlib_codec_matches_json_response():
+    codec = get_json_codec("stdlib")
+    assert codec.dumps(DATA) == CodecJSONResponse(DATA).body
+
+
+def test_auto_codec_prefers_orjson():
+    assert get_json_codec("auto").name == "orjson"
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_json_codec("unknown")
@@ -0,0 +1,84 @@
+"""Тесты сервиса обслуживания секций."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import settings
+from app.services.partitions import PartitionService, get_partitioned_tables
+from tests.helpers import FakeUnitOfWork, get_datetime_now
+
+
+def _partition(table: str, days: int) -> str:
+    return f"{table}_p{get_datetime_now() + timedelta(days=days):%Y%m%d}"
+
+
+@pytest.mark.asyncio
+async def test_init_job(
+    partition_service: PartitionService, scheduler: MagicMock
+):
+    await partition_service.init_jobs()
+    assert scheduler.add_job.called
+
+
+@pytest.mark.asyncio
+async def test_maintain_creates_partitions(
+    partition_service: PartitionService, uow: FakeUnitOfWork
+):
+    await partition_service.maintain()
+
+    outbox = await uow.partitions.get_partitions("outbox")
+    assert outbox == [
+        _partition("outbox", day)
+        for day in range(settings.partition_premake_days + 1)
+    ]
+    inbox_table = get_partitioned_tables()[0]
+    inbox = await uow.partitions.get_partitions("inbox")
+    assert len(inbox) == inbox_table.premake_days + 1
+    assert inbox[0] == _partition("inbox", 0)
+    assert uow.committed
+
+
+@pytest.mark.asyncio
+async def test_maintain_drops_expired_partitions(
+    partition_service: PartitionService, uow: FakeUnitOfWork
+):
+    retention = settings.outbox_retention_days
+    uow.partitions.partitions = {
+        "inbox": {_partition("inbox", -2), _partition("inbox", -1)},
+        "outbox": {
+            _partition("outbox", -retention - 2),
+            _partition("outbox", -retention - 3),
+            _partition("outbox", -retention),
+            "outbox_legacy",
+        },
+    }
+    uow.partitions.non_empty = {_partition("outbox", -retention - 3)}
+
+    await partition_service.maintain()
+
+    partitions = uow.partitions.partitions
+    assert _partition("inbox", -1) not in partitions["inbox"]
+    assert _partition("inbox", -2) not in partitions["inbox"]
+    assert _partition("outbox", -retention - 2) not in partitions["outbox"]
+    assert _partition("outbox", -retention - 3) in partitions["outbox"]
+    assert _partition("outbox", -retention) in partitions["outbox"]
+    assert "outbox_legacy" in partitions["outbox"]
+
+
+@pytest.mark.asyncio
+async def test_maintain_calls_on_drop(
+    uow: FakeUnitOfWork, scheduler: MagicMock
+):
+    on_drop = AsyncMock()
+    partition_service = PartitionService(
+        uow, scheduler, on_drop={"inbox": on_drop}
+    )
+
+    await partition_service.maintain()
+    assert not on_drop.called
+
+    uow.partitions.partitions["inbox"].add(_partition("inbox", -1))
+    await partition_service.maintain()
+    on_drop.assert_awaited_once()
@@ -0,0 +1,72 @@
+"""Тесты индекса посадочных мест."""
+
+import pytest
+
+from app.services.seats import SeatsIndex
+from tests.helpers import create_place
+
+
+def test_from_pattern_numeric_ranges():
+    index = SeatsIndex.from_pattern("A1-1000,B1-250")
+
+    assert len(index) == 1250
+    assert "A1" in index
+    assert "A1000" in index
+    assert "B250" in index
+    assert "A1001" not in index
+    assert "B251" not in index
+    assert "C1" not in index
+
+
+def test_from_pattern_row_ranges_and_single_seats():
+    index = SeatsIndex.from_pattern("A1-A10, C5")
+
+    assert len(index) == 11
+    assert "A10" in index
+    assert "A11" not in index
+    assert "C5" in index
+    assert "C4" not in index
+
+
+def test_from_pattern_merges_ranges():
+    index = SeatsIndex.from_pattern("A1-10,A5-20,A21-30,A40")
+    assert index.to_json() == {"A": [[1, 30], [40, 40]]}
+
+
+@pytest.mark.parametrize(
+    "pattern", ["", "A", "A1-B10", "A10-1", "a1-10", "A0-10", "1-10"]
+)
+def test_from_pattern_invalid(pattern: str):
+    with pytest.raises(ValueError):
+        SeatsIndex.from_pattern(pattern)
+
+
+def test_contains_invalid_seat():
+    index = SeatsIndex.from_pattern("A1-10")
+    assert "A01" not in index
+    assert "invalid" not in index
+    assert None not in index
+
+
+def test_json_roundtrip():
+    index = SeatsIndex.from_pattern("A1-1000,B1-250")
+    restored = SeatsIndex.from_json(index.to_json())
+    assert restored.to_json() == index.to_json()
+    assert "B250" in restored
+
+
+def test_from_place():
+    place = create_place()
+    assert "B250" in SeatsIndex.from_place(place)
+
+    place.seats_index = {"A": [[1, 2]]}
+    assert "B250" not in SeatsIndex.from_place(place)
+
+    place.seats_index = None
+    place.seats_pattern = "invalid"
+    assert SeatsIndex.from_place(place) is None
+
+
+def test_difference():
+    index = SeatsIndex.from_pattern("A1-3,B1-2")
+    assert index.difference(["A1", "A3", "B2"]) == ["A2", "B1"]
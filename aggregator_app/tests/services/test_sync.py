@@ -1,16 +1,22 @@
 """Тесты сервиса синхронизации."""
 
-from datetime import date, datetime
+from datetime import UTC, datetime, time, timedelta
 from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
 
 import pytest
+from aiohttp import ClientResponseError
 
-from app.orm.models import SyncMeta, SyncStatus
+from app.config import settings
+from app.orm.models import EventStatus, SyncMeta, SyncStatus
+from app.services.events import EventsService
+from app.services.events_provider import event_quarantine
 from app.services.sync import SyncService
 from tests.helpers import (
     FakeEventsProviderClient,
     FakeSyncMetaRepository,
     FakeUnitOfWork,
+    create_event,
     get_datetime_now,
     get_raw_event,
 )
@@ -67,17 +73,19 @@ async def test_sync_update_db(
     events = []
     events_ids = set()
     places_ids = set()
-    latest_changed_at = date.fromisoformat("2000-01-01")
+    latest = (SyncService.DEFAULT_CHANGED_AT, None)
 
     for _ in range(3):
         event = get_raw_event()
         events.append(event)
         events_ids.add(event["id"])
         places_ids.add(event["place"]["id"])
-        latest_changed_at = max(
-            latest_changed_at,
-            datetime.fromisoformat(event["changed_at"]).date(),
+        position = (
+            datetime.fromisoformat(event["changed_at"]),
+            UUID(event["id"]),
         )
+        if SyncService._is_after(position, latest):
+            latest = position
 
     events_provider_client.kwargs["pages"] = {
         None: {"next": "abc123", "results": events[:2]},
@@ -90,13 +98,373 @@ async def test_sync_update_db(
     await sync_service.sync()
 
     assert uow.sync_meta.meta.sync_status == SyncStatus.SYNCED
-    assert uow.sync_meta.meta.last_changed_at == latest_changed_at
+    assert uow.sync_meta.meta.last_changed_at == latest[0]
+    assert uow.sync_meta.meta.last_event_id == latest[1]
     assert uow.sync_meta.meta.last_sync_time <= get_datetime_now()
     assert set(uow.places.places.keys()) == places_ids
     assert set(uow.events.events.keys()) == events_ids
     assert uow.committed
 
 
+@pytest.mark.asyncio
+async def test_sync_updates_search_vectors_of_changed_rows(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    event = get_raw_event()
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": [event]}
+    }
+    uow.events.update_search_vectors = AsyncMock(return_value=1)
+
+    await sync_service.sync()
+
+    uow.events.update_search_vectors.assert_awaited_once_with(
+        (event["place"]["id"],), (event["id"],)
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_events_up_to_watermark(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    changed_at = get_datetime_now()
+    events = [get_raw_event() for _ in range(4)]
+    events.sort(key=lambda event: UUID(event["id"]))
+    for event in events[:3]:
+        event["changed_at"] = changed_at.isoformat()
+    events[3]["changed_at"] = (changed_at - timedelta(hours=1)).isoformat()
+
+    meta = SyncMeta(
+        id=1,
+        sync_status=SyncStatus.SYNCED,
+        last_changed_at=changed_at,
+        last_event_id=UUID(events[1]["id"]),
+    )
+    uow.sync_meta = FakeSyncMetaRepository(meta=meta)
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": events}
+    }
+
+    await sync_service.sync()
+
+    assert set(uow.events.events.keys()) == {events[2]["id"]}
+    assert uow.sync_meta.meta.last_changed_at == changed_at
+    assert uow.sync_meta.meta.last_event_id == UUID(events[2]["id"])
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_watermark_without_new_events(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    changed_at = get_datetime_now()
+    event = get_raw_event()
+    event["changed_at"] = changed_at.isoformat()
+    meta = SyncMeta(
+        id=1,
+        sync_status=SyncStatus.SYNCED,
+        last_changed_at=changed_at,
+        last_event_id=UUID(event["id"]),
+    )
+    uow.sync_meta = FakeSyncMetaRepository(meta=meta)
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": [event]}
+    }
+
+    await sync_service.sync()
+
+    assert not uow.events.events
+    assert uow.sync_meta.meta.last_changed_at == changed_at
+    assert uow.sync_meta.meta.last_event_id == UUID(event["id"])
+
+
+@pytest.mark.asyncio
+async def test_sync_saves_checkpoint_before_error(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "sync_checkpoint_size", 2)
+    events = [get_raw_event() for _ in range(3)]
+    events_ids = {event["id"] for event in events}
+    latest_changed_at = max(
+        datetime.fromisoformat(event["changed_at"]) for event in events
+    )
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": "page2", "results": events[:1]},
+        "page2": {"next": "page3", "results": events[1:]},
+        "page3": TimeoutError(),
+    }
+
+    await sync_service.sync()
+
+    meta = uow.sync_meta.meta
+    assert set(uow.events.events.keys()) == events_ids
+    assert meta.sync_status == SyncStatus.NEVER
+    assert meta.last_changed_at is None
+    assert meta.checkpoint_cursor == "page3"
+    assert meta.checkpoint_changed_at == latest_changed_at
+
+
+@pytest.mark.asyncio
+async def test_sync_resumes_from_checkpoint(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    checkpoint_changed_at = get_datetime_now() - timedelta(hours=1)
+    checkpoint_event_id = uuid4()
+    meta = SyncMeta(
+        id=1,
+        sync_status=SyncStatus.NEVER,
+        checkpoint_cursor="page3",
+        checkpoint_changed_at=checkpoint_changed_at,
+        checkpoint_event_id=checkpoint_event_id,
+    )
+    uow.sync_meta = FakeSyncMetaRepository(meta=meta)
+    event = get_raw_event()
+    changed_at = datetime.fromisoformat(event["changed_at"])
+    events_provider_client.kwargs["pages"] = {
+        "page3": {"next": None, "results": [event]},
+    }
+
+    await sync_service.sync()
+
+    assert set(uow.events.events.keys()) == {event["id"]}
+    assert meta.sync_status == SyncStatus.SYNCED
+    assert meta.last_changed_at == changed_at
+    assert meta.last_event_id == UUID(event["id"])
+    assert meta.checkpoint_cursor is None
+    assert meta.checkpoint_changed_at is None
+    assert meta.checkpoint_event_id is None
+
+
+@pytest.mark.asyncio
+async def test_sync_restarts_on_rejected_checkpoint(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    meta = SyncMeta(
+        id=1,
+        sync_status=SyncStatus.NEVER,
+        checkpoint_cursor="expired",
+        checkpoint_changed_at=get_datetime_now(),
+    )
+    uow.sync_meta = FakeSyncMetaRepository(meta=meta)
+    event = get_raw_event()
+    events_provider_client.kwargs["pages"] = {
+        "expired": ClientResponseError(None, (), status=400),
+        None: {"next": None, "results": [event]},
+    }
+
+    await sync_service.sync()
+
+    assert set(uow.events.events.keys()) == {event["id"]}
+    assert meta.sync_status == SyncStatus.SYNCED
+    assert meta.last_event_id == UUID(event["id"])
+    assert meta.checkpoint_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_sync_backfill_windows(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+    monkeypatch,
+):
+    today = get_datetime_now().date()
+    days = [today - timedelta(days=2 - i) for i in range(3)]
+    monkeypatch.setattr(
+        SyncService,
+        "DEFAULT_CHANGED_AT",
+        datetime.combine(days[0], time(), tzinfo=UTC),
+    )
+    monkeypatch.setattr(settings, "sync_backfill_concurrency", 2)
+    monkeypatch.setattr(settings, "sync_backfill_window_days", 1)
+
+    def raw_event(day, event_id=None):
+        event = get_raw_event()
+        event["id"] = event_id or event["id"]
+        event["changed_at"] = datetime.combine(
+            day, time(12), tzinfo=UTC
+        ).isoformat()
+        return event
+
+    first = raw_event(days[0])
+    second = raw_event(days[1])
+    second_changed = raw_event(days[2], second["id"])
+    third = raw_event(days[2])
+    events_provider_client.kwargs["pages"] = {
+        (days[0], None): {"next": "day0-2", "results": [first]},
+        (days[0], "day0-2"): {
+            "next": "day0-3",
+            "results": [raw_event(days[1], second["id"])],
+        },
+        (days[1], None): {"next": None, "results": [second]},
+        (days[2], None): {"next": None, "results": [second_changed, third]},
+    }
+
+    await sync_service.sync()
+
+    meta = uow.sync_meta.meta
+    assert meta.sync_status == SyncStatus.SYNCED
+    assert set(uow.events.events.keys()) == {
+        first["id"],
+        second["id"],
+        third["id"],
+    }
+    assert uow.events.events[second["id"]].changed_at.date() == days[2]
+    assert meta.last_changed_at.date() == days[2]
+    assert meta.last_event_id == max(UUID(second["id"]), UUID(third["id"]))
+
+
+@pytest.mark.parametrize(
+    ("events_count", "expected_interval"), [(2, 1800), (0, 7200), (1, None)]
+)
+@pytest.mark.asyncio
+async def test_sync_adapts_interval(
+    events_count: int,
+    expected_interval: int | None,
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    scheduler: MagicMock,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "sync_adaptive", True)
+    monkeypatch.setattr(settings, "sync_adaptive_changes_threshold", 2)
+    monkeypatch.setattr(settings, "sync_min_seconds_interval", 1800)
+    sync_service._seconds_interval = 3600
+    events_provider_client.kwargs["pages"] = {
+        None: {
+            "next": None,
+            "results": [get_raw_event() for _ in range(events_count)],
+        }
+    }
+
+    await sync_service.sync()
+
+    if expected_interval is None:
+        scheduler.reschedule_job.assert_not_called()
+        return
+    call_args = scheduler.reschedule_job.call_args
+    assert call_args[0][0] == SyncService.SYNC_JOB_ID
+    assert call_args[1]["trigger"].interval == timedelta(
+        seconds=expected_interval
+    )
+    assert sync_service._seconds_interval == expected_interval
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_interval_at_min(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    scheduler: MagicMock,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "sync_adaptive", True)
+    monkeypatch.setattr(settings, "sync_adaptive_changes_threshold", 1)
+    sync_service._seconds_interval = settings.sync_min_seconds_interval
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": [get_raw_event()]}
+    }
+
+    await sync_service.sync()
+
+    scheduler.reschedule_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_interval_not_adapted_by_default(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    scheduler: MagicMock,
+):
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": []}
+    }
+
+    await sync_service.sync()
+
+    scheduler.reschedule_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_invalid_events(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    valid, invalid = get_raw_event(), get_raw_event()
+    invalid["id"] = "not-a-uuid"
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": [invalid, valid]}
+    }
+
+    await sync_service.sync()
+
+    assert uow.sync_meta.meta.sync_status == SyncStatus.SYNCED
+    assert set(uow.events.events.keys()) == {valid["id"]}
+    assert event_quarantine.snapshot()[0]["event_id"] == "not-a-uuid"
+
+
+@pytest.mark.asyncio
+async def test_sync_holds_watermark_before_quarantined_events(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "sync_checkpoint_size", 1)
+    save_checkpoint = AsyncMock()
+    monkeypatch.setattr(sync_service, "_save_checkpoint", save_checkpoint)
+    changed_at = get_datetime_now() - timedelta(hours=1)
+    invalid, valid, later = get_raw_event(), get_raw_event(), get_raw_event()
+    invalid["changed_at"] = changed_at.isoformat()
+    del invalid["event_time"]
+    later["changed_at"] = get_datetime_now().isoformat()
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": "page2", "results": [invalid, valid]},
+        "page2": {"next": None, "results": [later]},
+    }
+
+    await sync_service.sync()
+
+    meta = uow.sync_meta.meta
+    assert set(uow.events.events.keys()) == {valid["id"], later["id"]}
+    assert meta.sync_status == SyncStatus.SYNCED
+    assert meta.last_changed_at == changed_at
+    assert meta.last_event_id is None
+    save_checkpoint.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sync_invalidates_validation_cache(
+    sync_service: SyncService,
+    events_provider_client: FakeEventsProviderClient,
+    uow: FakeUnitOfWork,
+):
+    event = create_event()
+    uow.events.events = {event.id: event}
+    events_service = EventsService(uow, events_provider_client)
+    await events_service.get_validation_data(event.id)
+
+    event.status = EventStatus.PUBLISHED
+    events_provider_client.kwargs["pages"] = {
+        None: {"next": None, "results": []}
+    }
+    await sync_service.sync()
+
+    data = await events_service.get_validation_data(event.id)
+    assert data.status == EventStatus.PUBLISHED
+
+
 @pytest.mark.parametrize("prev_status", [SyncStatus.NEVER, SyncStatus.SYNCED])
 @pytest.mark.asyncio
 async def test_sync_rollback_on_error(
@@ -1,5 +1,6 @@
 """Тесты сервиса регистрации участников."""
 
+import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
@@ -8,11 +9,16 @@ import pytest
 from aiohttp import ClientResponseError
 from fastapi import HTTPException, status
 
-from app.orm.models import OutboxStatus, OutboxType
+from app.config import settings
+from app.orm.models import InboxStatus, OutboxStatus, OutboxType
+from app.services.circuit_breaker import circuit_breakers
+from app.services.inbox_cache import inbox_cache
 from app.services.tickets import TicketsService
+from app.services.utils import hash_dict
 from tests.helpers import (
     FakeEventsProviderClient,
     FakeUnitOfWork,
+    create_inbox,
     get_datetime_now,
     get_raw_member,
 )
@@ -37,6 +43,23 @@ async def test_register_member(
     member = uow.members.members[ticket_id]
     assert member.event_id == str(event_id)
     assert uow.committed
+    assert uow.members.version == 1
+
+
+@pytest.mark.asyncio
+async def test_register_member_ignores_version_error(
+    uow: FakeUnitOfWork,
+    events_provider_client: FakeEventsProviderClient,
+):
+    ticket_id = str(uuid4())
+    events_provider_client.kwargs["ticket_id"] = {"ticket_id": ticket_id}
+    uow.members.increment_version = AsyncMock(side_effect=RuntimeError)
+    service = TicketsService(uow, events_provider_client)
+
+    assert await service.register(uuid4(), get_raw_member()) == ticket_id
+
+    assert ticket_id in uow.members.members
+    uow.members.increment_version.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -79,6 +102,7 @@ async def test_register_member_with_idempotency_data(
 ):
     key = str(uuid4())
     idempotency_data = {"key": key, "request_hash": str(uuid4())}
+    await uow.inbox.reserve({key: idempotency_data["request_hash"]})
 
     ticket_id = str(uuid4())
     events_provider_client.kwargs["ticket_id"] = {"ticket_id": ticket_id}
@@ -90,9 +114,236 @@ async def test_register_member_with_idempotency_data(
     assert uow.inbox.inbox[key].key == key
     assert uow.inbox.inbox[key].request_hash == idempotency_data["request_hash"]
     assert uow.inbox.inbox[key].response == {"ticket_id": ticket_id}
+    assert uow.inbox.inbox[key].status == InboxStatus.COMPLETED
+    assert inbox_cache.get(key) is uow.inbox.inbox[key]
+    assert uow.committed
+
+
+@pytest.mark.asyncio
+async def test_register_member_holds_ticket_id(
+    uow: FakeUnitOfWork, events_provider_client: FakeEventsProviderClient
+):
+    key = str(uuid4())
+    idempotency_data = {"key": key, "request_hash": str(uuid4())}
+    await uow.inbox.reserve({key: idempotency_data["request_hash"]})
+
+    ticket_id = str(uuid4())
+    events_provider_client.kwargs["ticket_id"] = {"ticket_id": ticket_id}
+    uow.members.create = MagicMock(side_effect=RuntimeError)
+
+    service = TicketsService(uow, events_provider_client)
+    with pytest.raises(RuntimeError):
+        await service.register(uuid4(), get_raw_member(), idempotency_data)
+
+    assert uow.inbox.inbox[key].status == InboxStatus.IN_PROGRESS
+    assert uow.inbox.inbox[key].response == {"ticket_id": ticket_id}
+
+
+@pytest.mark.asyncio
+async def test_register_member_reuses_held_ticket_id(uow: FakeUnitOfWork):
+    key = str(uuid4())
+    ticket_id = str(uuid4())
+    idempotency_data = {"key": key, "request_hash": str(uuid4())}
+    await uow.inbox.reserve({key: idempotency_data["request_hash"]})
+    await uow.inbox.hold({key: {"ticket_id": ticket_id}})
+    client = MagicMock()
+    client.register_member = AsyncMock()
+
+    service = TicketsService(uow, client)
+    result = await service.register(
+        uuid4(), get_raw_member(), idempotency_data | {"ticket_id": ticket_id}
+    )
+
+    assert result == ticket_id
+    client.register_member.assert_not_awaited()
+    assert list(uow.members.members) == [ticket_id]
+    assert uow.inbox.inbox[key].status == InboxStatus.COMPLETED
+
+
+@pytest.mark.parametrize(
+    ("error", "released"),
+    [
+        (
+            ClientResponseError(
+                request_info=None,
+                history=None,
+                status=status.HTTP_400_BAD_REQUEST,
+            ),
+            True,
+        ),
+        (TimeoutError(), False),
+    ],
+)
+@pytest.mark.asyncio
+async def test_register_member_releases_key_on_rejection(
+    error: Exception, released: bool, uow: FakeUnitOfWork
+):
+    key = str(uuid4())
+    idempotency_data = {"key": key, "request_hash": str(uuid4())}
+    await uow.inbox.reserve({key: idempotency_data["request_hash"]})
+    client = MagicMock()
+    client.register_member = AsyncMock(side_effect=error)
+
+    service = TicketsService(uow, client)
+    with pytest.raises(HTTPException):
+        await service.register(uuid4(), get_raw_member(), idempotency_data)
+
+    assert (key not in uow.inbox.inbox) is released
+
+
+@pytest.mark.asyncio
+async def test_register_batch_partial_external_errors(uow: FakeUnitOfWork):
+    ticket_id = str(uuid4())
+    client = MagicMock()
+    client.register_member = AsyncMock(
+        side_effect=[
+            {"ticket_id": ticket_id},
+            ClientResponseError(
+                request_info=None,
+                history=None,
+                status=status.HTTP_400_BAD_REQUEST,
+                message="Seat is taken",
+            ),
+            TimeoutError,
+        ]
+    )
+    service = TicketsService(uow, client)
+
+    members = [get_raw_member() | {"seat": seat} for seat in ("A1", "A2", "A3")]
+    results = await service.register_batch(uuid4(), members, {"A1", "A2", "A3"})
+
+    assert results == [
+        {"status_code": 201, "ticket_id": ticket_id, "detail": None},
+        {"status_code": 400, "ticket_id": None, "detail": "Seat is taken"},
+        {"status_code": 500, "ticket_id": None, "detail": None},
+    ]
+    assert list(uow.members.members) == [ticket_id]
     assert uow.committed
 
 
+@pytest.mark.asyncio
+async def test_register_batch_reserves_idempotency_keys(uow: FakeUnitOfWork):
+    ticket_id = str(uuid4())
+    client = MagicMock()
+    client.register_member = AsyncMock(
+        side_effect=[
+            {"ticket_id": ticket_id},
+            ClientResponseError(
+                request_info=None,
+                history=None,
+                status=status.HTTP_400_BAD_REQUEST,
+            ),
+            TimeoutError,
+        ]
+    )
+    service = TicketsService(uow, client)
+    busy = create_inbox("busy", status=InboxStatus.IN_PROGRESS)
+    uow.inbox.inbox = {busy.key: busy}
+
+    members = [
+        get_raw_member() | {"seat": seat, "idempotency_key": key}
+        for seat, key in (
+            ("A1", "ok"),
+            ("A2", "rejected"),
+            ("A3", "timeout"),
+            ("A4", "busy"),
+        )
+    ]
+    results = await service.register_batch(
+        uuid4(), members, {"A1", "A2", "A3", "A4"}
+    )
+
+    assert [result["status_code"] for result in results] == [
+        201,
+        400,
+        500,
+        409,
+    ]
+    assert uow.inbox.inbox["ok"].status == InboxStatus.COMPLETED
+    assert uow.inbox.inbox["ok"].response == {"ticket_id": ticket_id}
+    assert "rejected" not in uow.inbox.inbox
+    assert uow.inbox.inbox["timeout"].status == InboxStatus.IN_PROGRESS
+    assert uow.inbox.inbox["busy"] is busy
+
+
+@pytest.mark.asyncio
+async def test_register_batch_reuses_held_ticket(uow: FakeUnitOfWork):
+    event_id = uuid4()
+    ticket_id = str(uuid4())
+    client = MagicMock()
+    client.register_member = AsyncMock()
+    service = TicketsService(uow, client)
+    member_data = get_raw_member() | {"seat": "A1"}
+    request_hash = hash_dict(member_data | {"event_id": str(event_id)})
+    held = create_inbox(
+        "held",
+        request_hash=request_hash,
+        response={"ticket_id": ticket_id},
+        status=InboxStatus.IN_PROGRESS,
+    )
+    uow.inbox.inbox = {held.key: held}
+
+    results = await service.register_batch(
+        event_id, [member_data | {"idempotency_key": "held"}], set()
+    )
+
+    assert results[0]["status_code"] == status.HTTP_201_CREATED
+    assert results[0]["ticket_id"] == ticket_id
+    client.register_member.assert_not_awaited()
+    assert list(uow.members.members) == [ticket_id]
+    assert uow.inbox.inbox["held"].status == InboxStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_register_batch_bounded_concurrency(
+    uow: FakeUnitOfWork, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "tickets_batch_concurrency", 2)
+    in_flight = max_in_flight = 0
+
+    async def register_member(event_id, member_data):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"ticket_id": str(uuid4())}
+
+    client = MagicMock()
+    client.register_member = register_member
+    service = TicketsService(uow, client)
+
+    seats = [f"A{i}" for i in range(1, 7)]
+    members = [get_raw_member() | {"seat": seat} for seat in seats]
+    results = await service.register_batch(uuid4(), members, set(seats))
+
+    assert all(r["status_code"] == 201 for r in results)
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_register_batch_counts_failures_per_member(
+    uow: FakeUnitOfWork, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "tickets_batch_concurrency", 1)
+    threshold = settings.circuit_breaker_failure_threshold
+    client = MagicMock()
+    client.register_member = AsyncMock(side_effect=TimeoutError)
+    service = TicketsService(uow, client)
+    breaker = circuit_breakers.get("events_provider.register_member")
+
+    seats = [f"A{i}" for i in range(threshold + 1)]
+    members = [get_raw_member() | {"seat": seat} for seat in seats]
+    results = await service.register_batch(uuid4(), members, set(seats))
+
+    assert [result["status_code"] for result in results] == [
+        *[status.HTTP_500_INTERNAL_SERVER_ERROR] * threshold,
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+    ]
+    assert breaker.to_dict()["state"] == "open"
+    assert client.register_member.await_count == threshold
+
+
 @pytest.mark.asyncio
 async def test_unregister_member(
     uow: FakeUnitOfWork, events_provider_client: FakeEventsProviderClient
@@ -109,6 +360,7 @@ async def test_unregister_member(
 
     assert ticket_id not in uow.members.members
     assert uow.committed
+    assert uow.members.version == 1
 
 
 @pytest.mark.asyncio
@@ -171,3 +423,30 @@ async def test_raises_500_on_client_other_errors(
 
     assert exc.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert not uow.committed
+
+
+@pytest.mark.parametrize(
+    ("method", "arg"), [("register", get_raw_member()), ("unregister", uuid4())]
+)
+@pytest.mark.asyncio
+async def test_raises_503_on_open_circuit_breaker(
+    method: str, arg, uow: FakeUnitOfWork
+):
+    mock_response = AsyncMock(side_effect=TimeoutError)
+    client = MagicMock()
+    setattr(client, method + "_member", mock_response)
+    service = TicketsService(uow, client)
+    breaker = circuit_breakers.get(f"events_provider.{method}_member")
+
+    for _ in range(settings.circuit_breaker_failure_threshold):
+        with pytest.raises(HTTPException):
+            await getattr(service, method)(uuid4(), arg)
+
+    with pytest.raises(HTTPException) as exc:
+        await getattr(service, method)(uuid4(), arg)
+
+    assert exc.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert breaker.to_dict()["state"] == "open"
+    assert (
+        mock_response.await_count == settings.circuit_breaker_failure_threshold
+    )
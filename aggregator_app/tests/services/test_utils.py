@@ -0,0 +1,81 @@
+"""Тесты утилит сервисов."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp.client_exceptions import ClientConnectionError
+
+from app.services.metrics import metrics
+from app.services.utils import RateLimiter, with_budget
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_with_budget_success():
+    func = AsyncMock(return_value="ok")
+    result = await with_budget("test.op", timeout=1, deadline=1)(func)(1, a=2)
+
+    assert result == "ok"
+    func.assert_awaited_once_with(1, a=2)
+    assert metrics.snapshot() == {}
+
+
+@pytest.mark.asyncio
+async def test_with_budget_retries_connection_errors():
+    func = AsyncMock(side_effect=[ClientConnectionError, "ok"])
+    result = await with_budget("test.op", timeout=1, deadline=5)(func)()
+
+    assert result == "ok"
+    assert func.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_with_budget_attempt_timeout():
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1)
+
+    decorated = with_budget("test.op", timeout=0.01, deadline=5, max_tries=2)
+    with pytest.raises(TimeoutError):
+        await decorated(slow)()
+
+    assert calls == 2
+    assert metrics.get("test.op.attempt_timeouts") == 2
+    assert metrics.get("test.op.deadline_exceeded") == 0
+
+
+@pytest.mark.asyncio
+async def test_with_budget_deadline_exceeded():
+    async def slow():
+        await asyncio.sleep(1)
+
+    decorated = with_budget("test.op", timeout=0.5, deadline=0.05)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with pytest.raises(TimeoutError):
+        await decorated(slow)()
+
+    assert loop.time() - started < 0.5
+    assert metrics.get("test.op.deadline_exceeded") == 1
+    assert metrics.get("test.op.attempt_timeouts") == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests():
+    rate_limiter = RateLimiter(rate=50)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    await asyncio.gather(*(rate_limiter.wait() for _ in range(5)))
+
+    assert loop.time() - started >= 4 / 50